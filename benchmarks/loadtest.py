@@ -0,0 +1,409 @@
+"""HTTP load test of the ride and circle API.
+
+Creates an isolated fixture (a circle, its members, rides and invitations)
+through the ORM and then replays the main client flows against a running
+server, reporting throughput and latency percentiles per endpoint.
+
+Usage:
+    python -m benchmarks.loadtest --base-url http://localhost:8000
+    python -m benchmarks.loadtest --concurrency 50 --compare benchmarks/results/loadtest-<commit>.json
+
+The database given by DATABASE_URL must be the one the server uses,
+e.g. the postgres service of local.yml or a bare local PostgreSQL.
+"""
+
+# Utilities
+import argparse
+import http.client
+import json
+import threading
+import time
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+# Benchmarks
+from benchmarks.utils import (
+    change,
+    load_results,
+    save_results,
+    setup_django,
+    summarize,
+)
+
+
+PASSWORD = 'cride12345678'
+
+
+class Fixture:
+    """Load test fixture
+
+    Data the scenarios work on, created directly in the database
+    so every run starts from the same state.
+    """
+
+    def __init__(self, members, outsiders, rides, finished_rides):
+        """Stores the amounts of each kind of object."""
+
+        self.members_amount = members
+        self.outsiders_amount = outsiders
+        self.rides_amount = rides
+        self.finished_rides_amount = finished_rides
+
+    def create(self):
+        """Creates the circle and every object related to it."""
+
+        # Django
+        from django.contrib.auth.hashers import make_password
+        from django.utils import timezone
+
+        # Models
+        from cride.users.models import User, Profile
+        from cride.circles.models import Circle, Membership, Invitation
+        from cride.rides.models import Ride, Qualification
+        from rest_framework.authtoken.models import Token
+
+        run = timezone.now().strftime('%Y%m%d%H%M%S')
+        now = timezone.now()
+        password = make_password(PASSWORD)
+
+        users = User.objects.bulk_create([
+            User(
+                username=f'lt{run}{index}',
+                email=f'lt{run}{index}@example.com',
+                first_name='Load',
+                last_name='Test',
+                password=password,
+                is_verified=True
+            )
+            for index in range(self.members_amount + self.outsiders_amount)
+        ])
+        Profile.objects.bulk_create([Profile(user=user) for user in users])
+        tokens = Token.objects.bulk_create([Token(user=user, key=Token().generate_key()) for user in users])
+
+        self.members = users[:self.members_amount]
+        self.outsiders = users[self.members_amount:]
+        self.tokens = {token.user_id: token.key for token in tokens}
+
+        self.circle = Circle.objects.create(
+            name=f'Load test {run}',
+            slug_name=f'load-test-{run}',
+            about='Circle created by the load test.'
+        )
+        driver = self.members[0]
+        Membership.objects.bulk_create([
+            Membership(user=user, circle=self.circle, is_admin=user == driver)
+            for user in self.members
+        ])
+
+        self.rides = Ride.objects.bulk_create([
+            Ride(
+                offered_by=driver,
+                offered_in=self.circle,
+                available_seats=5,
+                departure_location='Ciudad Universitaria',
+                departure_date=now + timedelta(days=1, minutes=index),
+                arrival_location='Polanco',
+                arrival_date=now + timedelta(days=1, hours=1, minutes=index),
+            )
+            for index in range(self.rides_amount)
+        ])
+        self.hot_ride = Ride.objects.create(
+            offered_by=driver,
+            offered_in=self.circle,
+            available_seats=10,
+            departure_location='Ciudad Universitaria',
+            departure_date=now + timedelta(hours=2),
+            arrival_location='Santa Fe',
+            arrival_date=now + timedelta(hours=3),
+        )
+
+        # Finished rides with a pending qualification for every passenger.
+        passengers = self.members[1:]
+        self.pending_qualifications = []
+        for index in range(self.finished_rides_amount):
+            ride = Ride.objects.create(
+                offered_by=driver,
+                offered_in=self.circle,
+                available_seats=1,
+                departure_location='Coyoacan',
+                departure_date=now - timedelta(days=1, minutes=index),
+                arrival_location='Roma Norte',
+                arrival_date=now - timedelta(hours=23, minutes=index),
+                is_active=False
+            )
+            ride.passengers.add(*passengers)
+            qualifications = Qualification.objects.bulk_create([
+                Qualification(user=user) for user in passengers
+            ])
+            ride.rating.add(*qualifications)
+            self.pending_qualifications.extend((ride, user) for user in passengers)
+
+        self.invitations = [
+            Invitation.objects.create(issued_by=driver, circle=self.circle).code
+            for outsider in self.outsiders
+        ]
+
+    def token(self, user):
+        """Returns the authorization header of a user."""
+
+        return f'Token {self.tokens[user.pk]}'
+
+
+class Client:
+    """Load test HTTP client
+
+    Keeps one persistent connection per thread and
+    records the latency of every request by label.
+    """
+
+    def __init__(self, base_url):
+        """Stores the server location."""
+
+        url = urlsplit(base_url)
+        self.host = url.hostname
+        self.port = url.port or 80
+        self.local = threading.local()
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.statuses = defaultdict(Counter)
+
+    def connection(self):
+        """Returns the connection of the current thread."""
+
+        if not hasattr(self.local, 'connection'):
+            self.local.connection = http.client.HTTPConnection(self.host, self.port, timeout=60)
+
+        return self.local.connection
+
+    def request(self, label, method, path, token=None, data=None):
+        """Sends a request and records its latency and status."""
+
+        headers = {'Accept': 'application/json'}
+        body = None
+
+        if token:
+            headers['Authorization'] = token
+
+        if data is not None:
+            body = json.dumps(data)
+            headers['Content-Type'] = 'application/json'
+
+        # A kept alive connection may have been closed by the server,
+        # in that case the request is retried once on a new connection.
+        for attempt in range(2):
+            start = time.perf_counter()
+
+            try:
+                connection = self.connection()
+                connection.request(method, path, body=body, headers=headers)
+                response = connection.getresponse()
+                response.read()
+                status = response.status
+            except (OSError, http.client.HTTPException):
+                self.local.connection.close()
+                del self.local.connection
+                status = 'error'
+            else:
+                break
+
+        latency = time.perf_counter() - start
+
+        with self.lock:
+            self.latencies[label].append(latency)
+            self.statuses[label][str(status)] += 1
+
+        return status
+
+
+class LoadTest:
+    """Load test
+
+    Runs every scenario against the server and
+    builds the report of the run.
+    """
+
+    def __init__(self, client, fixture, concurrency, repeat):
+        """Stores the client, the fixture and the load shape."""
+
+        self.client = client
+        self.fixture = fixture
+        self.concurrency = concurrency
+        self.repeat = repeat
+        self.durations = {}
+
+    def run(self, label, requests):
+        """Sends the requests with the configured concurrency and times the run."""
+
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=self.concurrency) as executor:
+            list(executor.map(lambda request: self.client.request(label, *request), requests))
+
+        self.durations[label] = time.perf_counter() - start
+
+    def login(self):
+        """Users log in with their credentials."""
+
+        users = self.fixture.members * self.repeat
+
+        self.run('login', [
+            ('POST', '/users/login/', None, {'email': user.email, 'password': PASSWORD})
+            for user in users
+        ])
+
+    def list_circles(self):
+        """Members browse the public circles."""
+
+        users = self.fixture.members * self.repeat
+
+        self.run('circles:list', [
+            ('GET', '/circles/', self.fixture.token(user)) for user in users
+        ])
+
+    def list_rides(self):
+        """Members browse the rides of their circle."""
+
+        path = f'/circles/{self.fixture.circle.slug_name}/rides/'
+        users = self.fixture.members * self.repeat
+
+        self.run('rides:list', [
+            ('GET', path, self.fixture.token(user)) for user in users
+        ])
+
+    def join_storm(self):
+        """Every member tries to join the same ride at once."""
+
+        ride = self.fixture.hot_ride
+        path = f'/circles/{self.fixture.circle.slug_name}/rides/{ride.pk}/join/'
+
+        self.run('rides:join', [
+            ('POST', path, self.fixture.token(user)) for user in self.fixture.members[1:]
+        ])
+
+    def redeem_invitations(self):
+        """Outsiders join the circle with an invitation code each."""
+
+        path = f'/circles/{self.fixture.circle.slug_name}/members/'
+
+        self.run('members:create', [
+            ('POST', path, self.fixture.token(user), {'invitation_code': code})
+            for user, code in zip(self.fixture.outsiders, self.fixture.invitations)
+        ])
+
+    def qualify(self):
+        """Passengers rate the rides they took."""
+
+        slug_name = self.fixture.circle.slug_name
+
+        self.run('rides:qualify', [
+            (
+                'POST', f'/circles/{slug_name}/rides/{ride.pk}/qualify/',
+                self.fixture.token(user), {'qualification': 4.5}
+            )
+            for ride, user in self.fixture.pending_qualifications
+        ])
+
+    def report(self):
+        """Returns throughput, percentiles and statuses per endpoint."""
+
+        endpoints = {}
+
+        for label, latencies in self.client.latencies.items():
+            duration = self.durations[label]
+            endpoints[label] = dict(
+                summarize(latencies),
+                throughput=round(len(latencies) / duration, 2) if duration else 0.0,
+                statuses=dict(self.client.statuses[label]),
+            )
+
+        if 'rides:join' in endpoints:
+            self.fixture.hot_ride.refresh_from_db()
+            endpoints['rides:join']['available_seats_left'] = self.fixture.hot_ride.available_seats
+
+        return endpoints
+
+
+def print_report(endpoints, previous=None):
+    """Prints the results, and the change against a previous run if given."""
+
+    header = f"{'endpoint':<16}{'req':>7}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}  statuses"
+    print(header)
+    print('-' * len(header))
+
+    for label, result in endpoints.items():
+        print(
+            f"{label:<16}{result['count']:>7}{result['throughput']:>10.1f}"
+            f"{result['p50']:>10.1f}{result['p95']:>10.1f}{result['p99']:>10.1f}  {result['statuses']}"
+        )
+
+        if previous and label in previous:
+            before = previous[label]
+            print(
+                f"{'':<16}{'':>7}{change(result['throughput'], before['throughput']):>+9.1f}%"
+                f"{change(result['p50'], before['p50']):>+9.1f}%"
+                f"{change(result['p95'], before['p95']):>+9.1f}%"
+                f"{change(result['p99'], before['p99']):>+9.1f}%"
+            )
+
+
+def main():
+    """Parses the arguments, runs the scenarios and stores the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--base-url', default='http://localhost:8000')
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--concurrency', type=int, default=20)
+    parser.add_argument('--members', type=int, default=100, help='Circle members, also the join storm size.')
+    parser.add_argument('--outsiders', type=int, default=50, help='Users redeeming an invitation.')
+    parser.add_argument('--rides', type=int, default=50, help='Rides listed in the circle.')
+    parser.add_argument('--finished-rides', type=int, default=2, help='Rides every member qualifies.')
+    parser.add_argument('--repeat', type=int, default=5, help='Times each member repeats the read scenarios.')
+    parser.add_argument(
+        '--scenarios', default='login,circles,rides,join,invitations,qualify',
+        help='Comma separated scenarios to run, in order.'
+    )
+    parser.add_argument('--output', default=None, help='Where to store the JSON results.')
+    parser.add_argument('--compare', default=None, help='JSON results of a previous run.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    fixture = Fixture(args.members, args.outsiders, args.rides, args.finished_rides)
+    fixture.create()
+
+    load_test = LoadTest(Client(args.base_url), fixture, args.concurrency, args.repeat)
+    scenarios = {
+        'login': load_test.login,
+        'circles': load_test.list_circles,
+        'rides': load_test.list_rides,
+        'join': load_test.join_storm,
+        'invitations': load_test.redeem_invitations,
+        'qualify': load_test.qualify,
+    }
+
+    for name in args.scenarios.split(','):
+        scenarios[name]()
+
+    endpoints = load_test.report()
+    previous = load_results(args.compare)['endpoints'] if args.compare else None
+    print_report(endpoints, previous)
+
+    path = save_results('loadtest', {
+        'base_url': args.base_url,
+        'concurrency': args.concurrency,
+        'fixture': {
+            'members': args.members,
+            'outsiders': args.outsiders,
+            'rides': args.rides,
+            'finished_rides': args.finished_rides,
+            'repeat': args.repeat,
+        },
+        'endpoints': endpoints,
+    }, args.output)
+    print(f'\nResults stored in {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,144 @@
+"""Picture uploads benchmark.
+
+Compares the latency of PUT /users/<username>/profile/ with a large
+picture when its variants are built and written to the media storage
+while the request waits (PICTURES_DEFERRED off) against the deferred
+upload, which only keeps it in the pending storage and enqueues the
+task that builds them. The time the worker spends on every deferred
+upload is reported apart.
+
+Tasks are sent to an in-memory broker and processed by the benchmark
+right after every request, the media and pending storages are
+temporary directories.
+
+Usage:
+    python -m benchmarks.pictures --requests 30 --width 4000 --height 3000
+"""
+
+# Utilities
+import argparse
+import tempfile
+import time
+from io import BytesIO
+
+# Benchmarks
+from benchmarks.loadtest import Fixture
+from benchmarks.utils import change, save_results, setup_django, summarize
+
+
+def picture(width, height):
+    """Returns a noisy JPEG, which compresses like a photo."""
+
+    # Pillow
+    from PIL import Image
+
+    content = BytesIO()
+    Image.effect_noise((width, height), 64).convert('RGB').save(content, 'JPEG', quality=90)
+
+    return content.getvalue()
+
+
+def measure(client, user, content, amount, deferred):
+    """Uploads the picture, returns the request latencies and the worker timings."""
+
+    # Django
+    from django.conf import settings
+    from django.core.files.uploadedfile import SimpleUploadedFile
+
+    # Models
+    from cride.users.models import Profile
+
+    # Images
+    from cride.utils.images import process_picture
+
+    settings.PICTURES_DEFERRED = deferred
+    path = f'/users/{user.username}/profile/'
+
+    latencies = []
+    processing = []
+
+    for index in range(amount):
+        upload = SimpleUploadedFile('picture.jpg', content, content_type='image/jpeg')
+
+        start = time.perf_counter()
+        response = client.put(path, {'picture': upload}, format='multipart')
+        latencies.append(time.perf_counter() - start)
+
+        if response.status_code != 200:
+            raise AssertionError(f'{path} answered {response.status_code}.')
+
+        pending = Profile.objects.values_list('picture_upload', flat=True).get(user=user)
+        if pending:
+            start = time.perf_counter()
+            process_picture(Profile, user.profile.pk, pending)
+            processing.append(time.perf_counter() - start)
+
+    return summarize(latencies), summarize(processing)
+
+
+def main():
+    """Parses the arguments, runs both uploads and stores the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--requests', type=int, default=30, help='Uploads per mode.')
+    parser.add_argument('--width', type=int, default=4000, help='Width of the uploaded picture.')
+    parser.add_argument('--height', type=int, default=3000, help='Height of the uploaded picture.')
+    parser.add_argument('--output', default=None, help='Where to store the JSON results.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    # Django
+    from django.conf import settings
+
+    # Django REST Framework
+    from rest_framework.test import APIClient
+
+    settings.SQL_INSTRUMENTATION_SAMPLE_RATE = 0
+    settings.MEDIA_ROOT = tempfile.mkdtemp(prefix='media-')
+    settings.PICTURES_PENDING_ROOT = tempfile.mkdtemp(prefix='pending-')
+
+    # Tasks wait in memory instead of running inside the request, Celery
+    # reads its configuration on the first task sent.
+    settings.CELERY_TASK_ALWAYS_EAGER = False
+    settings.CELERY_BROKER_URL = 'memory://'
+    settings.CELERY_RESULT_BACKEND = 'cache+memory://'
+
+    fixture = Fixture(1, 0, 0, 0)
+    fixture.create()
+    user = fixture.members[0]
+
+    client = APIClient(SERVER_NAME='localhost')
+    client.credentials(HTTP_AUTHORIZATION=fixture.token(user))
+
+    content = picture(args.width, args.height)
+
+    inline, _ = measure(client, user, content, args.requests, deferred=False)
+    deferred, processing = measure(client, user, content, args.requests, deferred=True)
+
+    header = f"{'upload':<12}{'p50 ms':>10}{'p95 ms':>10}{'mean ms':>10}"
+    print(f'{len(content) / 2 ** 20:.1f} MB picture of {args.width}x{args.height}\n')
+    print(header)
+    print('-' * len(header))
+
+    for name, result in (('inline', inline), ('deferred', deferred), ('worker', processing)):
+        print(f"{name:<12}{result['p50']:>10.2f}{result['p95']:>10.2f}{result['mean']:>10.2f}")
+
+    print(
+        f"{'change':<12}{change(deferred['p50'], inline['p50']):>+9.1f}%"
+        f"{change(deferred['p95'], inline['p95']):>+9.1f}%{change(deferred['mean'], inline['mean']):>+9.1f}%"
+    )
+
+    path = save_results('pictures', {
+        'requests': args.requests,
+        'picture': {'width': args.width, 'height': args.height, 'bytes': len(content)},
+        'inline': inline,
+        'deferred': deferred,
+        'worker': processing,
+    }, args.output)
+    print(f'\nResults stored in {path}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""Compact list projections benchmark.
+
+Compares the list endpoints rendered by their nested model serializers
+against the compact ?view=compact representation of CompactListMixin,
+which is built from a .values() projection without model instances.
+
+Requests are sent in-process with the DRF test client, reporting the
+latency, the queries run and the size of the payload of every view.
+
+Usage:
+    python -m benchmarks.projections --requests 300
+"""
+
+# Utilities
+import argparse
+import time
+
+# Benchmarks
+from benchmarks.loadtest import Fixture
+from benchmarks.utils import change, save_results, setup_django, summarize
+
+
+def endpoints(fixture):
+    """Returns the list endpoints as (label, path)."""
+
+    slug_name = fixture.circle.slug_name
+
+    return [
+        ('circles:list', '/circles/'),
+        ('rides:list', f'/circles/{slug_name}/rides/'),
+        ('members:list', f'/circles/{slug_name}/members/'),
+    ]
+
+
+class QueryCounter:
+    """Counts the statements sent through the connection."""
+
+    def __init__(self):
+        """Starts the counter at zero."""
+
+        self.queries = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Counts the statement."""
+
+        self.queries += 1
+
+        return execute(sql, params, many, context)
+
+
+def measure(client, path, amount, view):
+    """Sends the requests for the given view, returns the latencies, queries and payload size."""
+
+    # Django
+    from django.db import connection
+
+    params = {'view': view, 'limit': 100}
+    client.get(path, params)
+
+    latencies = []
+    counter = QueryCounter()
+
+    with connection.execute_wrapper(counter):
+        for index in range(amount):
+            start = time.perf_counter()
+            response = client.get(path, params)
+            latencies.append(time.perf_counter() - start)
+
+            if response.status_code != 200:
+                raise AssertionError(f'{path} answered {response.status_code}.')
+
+    return dict(
+        summarize(latencies),
+        queries=round(counter.queries / amount, 2),
+        bytes=len(response.content),
+    )
+
+
+def main():
+    """Parses the arguments, runs both views and stores the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--requests', type=int, default=300, help='Requests per endpoint and view.')
+    parser.add_argument('--members', type=int, default=100, help='Members listed in the circle.')
+    parser.add_argument('--rides', type=int, default=100, help='Rides listed in the circle.')
+    parser.add_argument('--output', default=None, help='Where to store the JSON results.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    # Django
+    from django.conf import settings
+
+    # Django REST Framework
+    from rest_framework.test import APIClient
+
+    # The SQL log of every request would dominate the timings.
+    settings.SQL_INSTRUMENTATION_SAMPLE_RATE = 0
+
+    fixture = Fixture(args.members, 0, args.rides, 0)
+    fixture.create()
+
+    client = APIClient(SERVER_NAME='localhost')
+    client.credentials(HTTP_AUTHORIZATION=fixture.token(fixture.members[0]))
+
+    header = f"{'endpoint':<16}{'view':<10}{'queries':>10}{'bytes':>10}{'p50 ms':>10}{'p95 ms':>10}"
+    print(header)
+    print('-' * len(header))
+
+    results = {}
+    for label, path in endpoints(fixture):
+        results[label] = {
+            'full': measure(client, path, args.requests, view='full'),
+            'compact': measure(client, path, args.requests, view='compact'),
+        }
+
+        for view, result in results[label].items():
+            print(
+                f"{label:<16}{view:<10}{result['queries']:>10}{result['bytes']:>10}"
+                f"{result['p50']:>10.2f}{result['p95']:>10.2f}"
+            )
+
+        before, after = results[label]['full'], results[label]['compact']
+        print(
+            f"{'':<16}{'change':<10}{after['queries'] - before['queries']:>10}"
+            f"{change(after['bytes'], before['bytes']):>+9.1f}%"
+            f"{change(after['p50'], before['p50']):>+9.1f}%{change(after['p95'], before['p95']):>+9.1f}%"
+        )
+
+    path = save_results('projections', {
+        'requests': args.requests,
+        'fixture': {'members': args.members, 'rides': args.rides},
+        'endpoints': results,
+    }, args.output)
+    print(f'\nResults stored in {path}')
+
+
+if __name__ == '__main__':
+    main()
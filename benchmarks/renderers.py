@@ -0,0 +1,112 @@
+"""Renderers micro-benchmark.
+
+Times the rendering of ride and membership list payloads, built by
+the API serializers from in-memory instances, with DRF's JSON renderer
+against the orjson and MessagePack renderers, and reports the size of
+every payload.
+
+Usage:
+    python -m benchmarks.renderers --instances 100 --passengers 3
+"""
+
+# Utilities
+import argparse
+
+# Benchmarks
+from benchmarks.serializers import Instances, measure
+from benchmarks.utils import save_results, setup_django
+
+
+def payloads(amount, passengers):
+    """Returns the serialized lists as (name, data)."""
+
+    # Serializers
+    from cride.circles.serializers import MembershipModelSerializer
+    from cride.rides.serializers import RideModelSerializer
+
+    instances = Instances(passengers)
+    objects = range(1, amount + 1)
+
+    return [
+        ('rides', RideModelSerializer([instances.ride(pk) for pk in objects], many=True).data),
+        ('memberships', MembershipModelSerializer([instances.membership(pk) for pk in objects], many=True).data),
+    ]
+
+
+def renderers():
+    """Returns the benchmarked renderers as (name, renderer)."""
+
+    # Django REST Framework
+    from rest_framework.renderers import JSONRenderer
+
+    # Renderers
+    from cride.utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+    return [
+        ('json', JSONRenderer()),
+        ('orjson', ORJSONRenderer()),
+        ('msgpack', MessagePackRenderer()),
+    ]
+
+
+def run(amount, repeat, passengers):
+    """Renders every payload with every renderer, returns the timings and sizes."""
+
+    results = {}
+
+    for name, data in payloads(amount, passengers):
+        # Paginated like the list endpoints.
+        page = {'count': amount, 'next': None, 'previous': None, 'results': data}
+        results[name] = {}
+
+        for renderer_name, renderer in renderers():
+            median, best = measure(lambda: renderer.render(page), repeat)
+
+            results[name][renderer_name] = {
+                'render_ms': round(median * 1000, 3),
+                'render_best_ms': round(best * 1000, 3),
+                'bytes': len(renderer.render(page)),
+            }
+
+    return results
+
+
+def main():
+    """Parses the arguments, runs the renderers and stores the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--instances', type=int, default=100, help='Objects in every list payload.')
+    parser.add_argument('--repeat', type=int, default=50, help='Renders per case, the median is reported.')
+    parser.add_argument('--passengers', type=int, default=3, help='Passengers and ratings of every ride.')
+    parser.add_argument('--output', default=None, help='Where to store the JSON results.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    results = run(args.instances, args.repeat, args.passengers)
+
+    header = f"{'payload':<14}{'renderer':<10}{'render ms':>12}{'bytes':>10}{'speedup':>10}{'size':>8}"
+    print(header)
+    print('-' * len(header))
+
+    for name, result in results.items():
+        baseline = result['json']
+
+        for renderer_name, measures in result.items():
+            print(
+                f"{name:<14}{renderer_name:<10}{measures['render_ms']:>12.3f}{measures['bytes']:>10}"
+                f"{baseline['render_ms'] / measures['render_ms']:>9.1f}x"
+                f"{measures['bytes'] / baseline['bytes'] * 100:>7.0f}%"
+            )
+
+    path = save_results('renderers', {
+        'instances': args.instances,
+        'passengers': args.passengers,
+        'results': results,
+    }, args.output)
+    print(f'\nResults stored in {path}')
+
+
+if __name__ == '__main__':
+    main()
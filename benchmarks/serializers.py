@@ -0,0 +1,336 @@
+"""Serializers micro-benchmark.
+
+Times the serialization of in-memory instances, no database involved,
+with the same nesting the API produces: rides embed their driver,
+passengers and ratings, memberships embed their user and every user
+embeds its profile. Each serializer is compared against a read-only
+fast path that builds the same representation with plain attribute
+access.
+
+Every run is appended to benchmarks/results/serializers-history.jsonl
+and compared against the previous one, a slowdown over --threshold
+percent exits with an error.
+
+Usage:
+    python -m benchmarks.serializers --instances 1000 --passengers 3
+"""
+
+# Utilities
+import argparse
+import statistics
+import sys
+import time
+from datetime import timedelta
+
+# Benchmarks
+from benchmarks.utils import append_history, change, setup_django
+
+
+def prefetch(instance, name, objects):
+    """Stores objects as the prefetched content of a many to many relation."""
+
+    queryset = getattr(type(instance), name).rel.model.objects.all()
+
+    # Same cache the ORM fills on prefetch_related().
+    queryset._result_cache = list(objects)
+    queryset._prefetch_done = True
+
+    if not hasattr(instance, '_prefetched_objects_cache'):
+        instance._prefetched_objects_cache = {}
+    instance._prefetched_objects_cache[name] = queryset
+
+
+class Instances:
+    """Benchmark instances
+
+    Builds unsaved model instances with primary keys, so relations
+    can be read from the prefetch cache without touching the database.
+    """
+
+    def __init__(self, passengers):
+        """Stores the nesting width of the rides."""
+
+        # Models
+        from django.utils import timezone
+
+        self.passengers = passengers
+        self.now = timezone.now()
+
+    def user(self, pk):
+        """Returns a user with its profile."""
+
+        # Models
+        from cride.users.models import User, Profile
+
+        user = User(
+            pk=pk,
+            username=f'user{pk}',
+            first_name='Francisco',
+            last_name='Ramirez',
+            email=f'user{pk}@example.com',
+            phone_number='+525512345678',
+        )
+        user.profile = Profile(pk=pk, biography='Carpooling every day.', rides_taken=12, rides_offered=3)
+
+        return user
+
+    def circle(self, pk):
+        """Returns a circle."""
+
+        # Models
+        from cride.circles.models import Circle
+
+        return Circle(
+            pk=pk,
+            name='Facultad de Ciencias',
+            slug_name=f'circle-{pk}',
+            about='Grupo oficial de la Facultad de Ciencias.',
+            rides_offered=120,
+            rides_taken=340,
+            is_verified=True,
+        )
+
+    def membership(self, pk):
+        """Returns a membership with its user and inviter."""
+
+        # Models
+        from cride.circles.models import Membership
+
+        return Membership(
+            pk=pk,
+            user=self.user(pk),
+            circle=self.circle(1),
+            invited_by=self.user(pk + 1),
+            used_invitations=2,
+            remaining_invitations=3,
+            rides_taken=10,
+            rides_offered=4,
+            created=self.now,
+        )
+
+    def ride(self, pk):
+        """Returns a ride with its driver, passengers and ratings."""
+
+        # Models
+        from cride.rides.models import Ride, Qualification
+
+        ride = Ride(
+            pk=pk,
+            offered_by=self.user(pk),
+            offered_in=self.circle(1),
+            available_seats=2,
+            comments='Leaving from the main entrance.',
+            departure_location='Ciudad Universitaria',
+            departure_date=self.now + timedelta(hours=1),
+            arrival_location='Polanco',
+            arrival_date=self.now + timedelta(hours=2),
+            created=self.now,
+            modified=self.now,
+        )
+        passengers = [self.user(pk * 100 + index) for index in range(self.passengers)]
+        prefetch(ride, 'passengers', passengers)
+        prefetch(ride, 'rating', [
+            Qualification(pk=passenger.pk, user=passenger, score=4.5) for passenger in passengers
+        ])
+
+        return ride
+
+
+def datetime_representation(value):
+    """Returns a datetime the same way DRF's DateTimeField does."""
+
+    # Django
+    from django.utils import timezone
+
+    value = timezone.localtime(value).isoformat()
+
+    if value.endswith('+00:00'):
+        value = value[:-6] + 'Z'
+
+    return value
+
+
+def fast_profile(profile):
+    """Read-only representation of a profile."""
+
+    return {
+        'picture': profile.picture.url if profile.picture else None,
+        'biography': profile.biography,
+        'rides_taken': profile.rides_taken,
+        'rides_offered': profile.rides_offered,
+        'reputation': profile.reputation,
+    }
+
+
+def fast_user(user):
+    """Read-only representation of a user."""
+
+    return {
+        'username': user.username,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'email': user.email,
+        'phone_number': user.phone_number,
+        'profile': fast_profile(user.profile),
+    }
+
+
+def fast_circle(circle):
+    """Read-only representation of a circle."""
+
+    return {
+        'name': circle.name,
+        'slug_name': circle.slug_name,
+        'about': circle.about,
+        'picture': circle.picture.url if circle.picture else None,
+        'rides_offered': circle.rides_offered,
+        'rides_taken': circle.rides_taken,
+        'is_verified': circle.is_verified,
+        'is_public': circle.is_public,
+        'is_limited': circle.is_limited,
+        'members_limit': circle.members_limit,
+    }
+
+
+def fast_membership(membership):
+    """Read-only representation of a membership."""
+
+    return {
+        'user': fast_user(membership.user),
+        'is_admin': membership.is_admin,
+        'is_active': membership.is_active,
+        'used_invitations': membership.used_invitations,
+        'remaining_invitations': membership.remaining_invitations,
+        'invited_by': str(membership.invited_by) if membership.invited_by else None,
+        'rides_taken': membership.rides_taken,
+        'rides_offered': membership.rides_offered,
+        'joined_at': datetime_representation(membership.created),
+    }
+
+
+def fast_ride(ride):
+    """Read-only representation of a ride."""
+
+    return {
+        'id': ride.id,
+        'offered_by': fast_user(ride.offered_by),
+        'offered_in': str(ride.offered_in) if ride.offered_in else None,
+        'passengers': [fast_user(user) for user in ride.passengers.all()],
+        'rating': [
+            {'user': fast_user(rating.user), 'score': rating.score}
+            for rating in ride.rating.all()
+        ],
+        'created': datetime_representation(ride.created),
+        'modified': datetime_representation(ride.modified),
+        'available_seats': ride.available_seats,
+        'comments': ride.comments,
+        'departure_location': ride.departure_location,
+        'departure_date': datetime_representation(ride.departure_date),
+        'arrival_location': ride.arrival_location,
+        'arrival_date': datetime_representation(ride.arrival_date),
+        'is_active': ride.is_active,
+        'template': ride.template_id,
+    }
+
+
+def cases(instances):
+    """Returns the benchmarked cases as (name, factory, serializer, fast path)."""
+
+    # Serializers
+    from cride.users.serializers import UserModelSerializer
+    from cride.circles.serializers import CircleModelSerializer, MembershipModelSerializer
+    from cride.rides.serializers import RideModelSerializer
+
+    return [
+        ('user', instances.user, UserModelSerializer, fast_user),
+        ('circle', instances.circle, CircleModelSerializer, fast_circle),
+        ('membership', instances.membership, MembershipModelSerializer, fast_membership),
+        ('ride', instances.ride, RideModelSerializer, fast_ride),
+    ]
+
+
+def measure(function, repeat):
+    """Returns the median and best time of the function in seconds."""
+
+    timings = []
+
+    for attempt in range(repeat):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+
+    return statistics.median(timings), min(timings)
+
+
+def run(amount, repeat, passengers):
+    """Runs every case, returns the microseconds per instance of each one."""
+
+    results = {}
+
+    for name, factory, serializer_class, fast_path in cases(Instances(passengers)):
+        objects = [factory(pk) for pk in range(1, amount + 1)]
+
+        serialized = serializer_class(objects, many=True).data
+        if [dict(item) for item in serialized] != [fast_path(instance) for instance in objects]:
+            raise AssertionError(f'The {name} fast path output differs from {serializer_class.__name__}.')
+
+        median, best = measure(lambda: serializer_class(objects, many=True).data, repeat)
+        fast_median, fast_best = measure(lambda: [fast_path(instance) for instance in objects], repeat)
+
+        results[name] = {
+            'serializer': serializer_class.__name__,
+            'serializer_us': round(median / amount * 10 ** 6, 3),
+            'serializer_best_us': round(best / amount * 10 ** 6, 3),
+            'fast_path_us': round(fast_median / amount * 10 ** 6, 3),
+            'fast_path_best_us': round(fast_best / amount * 10 ** 6, 3),
+        }
+
+    return results
+
+
+def main():
+    """Parses the arguments, runs the cases and checks for regressions."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--instances', type=int, default=1000, help='Instances serialized per round.')
+    parser.add_argument('--repeat', type=int, default=5, help='Rounds per case, the median is reported.')
+    parser.add_argument('--passengers', type=int, default=3, help='Passengers and ratings of every ride.')
+    parser.add_argument('--threshold', type=float, default=10.0, help='Slowdown percentage considered a regression.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    results = run(args.instances, args.repeat, args.passengers)
+    previous = append_history('serializers', {
+        'instances': args.instances,
+        'passengers': args.passengers,
+        'results': results,
+    })
+    comparable = previous and previous['instances'] == args.instances and previous['passengers'] == args.passengers
+
+    header = f"{'case':<12}{'serializer us':>15}{'fast path us':>15}{'speedup':>10}{'vs last':>10}"
+    print(header)
+    print('-' * len(header))
+
+    regressions = []
+    for name, result in results.items():
+        delta = ''
+        if comparable and name in previous['results']:
+            variation = change(result['serializer_us'], previous['results'][name]['serializer_us'])
+            delta = f'{variation:+.1f}%'
+            if variation > args.threshold:
+                regressions.append(name)
+
+        print(
+            f"{name:<12}{result['serializer_us']:>15.2f}{result['fast_path_us']:>15.2f}"
+            f"{result['serializer_us'] / result['fast_path_us']:>9.1f}x{delta:>10}"
+        )
+
+    if regressions:
+        print(f"\nRegressions over {args.threshold}%: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
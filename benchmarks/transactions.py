@@ -0,0 +1,170 @@
+"""Transaction policy benchmark.
+
+Compares the read endpoints when every request is wrapped in a
+transaction (ATOMIC_REQUESTS) against the per action policy of
+TransactionPolicyMixin, where reads run in autocommit mode.
+
+Requests are sent in-process with the DRF test client over a kept
+alive database connection, like a production worker does. Round trips
+are the statements run plus the BEGIN and COMMIT of each transaction.
+
+Usage:
+    python -m benchmarks.transactions --requests 500
+"""
+
+# Utilities
+import argparse
+import time
+from contextlib import contextmanager
+
+# Benchmarks
+from benchmarks.loadtest import Fixture
+from benchmarks.utils import change, save_results, setup_django, summarize
+
+
+class RoundTripCounter:
+    """Round trip counter
+
+    Counts the statements sent through the connection
+    and the transactions committed on it.
+    """
+
+    def __init__(self):
+        """Starts the counters at zero."""
+
+        self.statements = 0
+        self.transactions = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Counts the statement."""
+
+        self.statements += 1
+
+        return execute(sql, params, many, context)
+
+    @property
+    def round_trips(self):
+        """Returns the statements plus the BEGIN and COMMIT of every transaction."""
+
+        return self.statements + 2 * self.transactions
+
+
+@contextmanager
+def counting(connection, counter):
+    """Counts the statements and commits of the connection inside the block."""
+
+    commit = connection.commit
+
+    def counted_commit():
+        counter.transactions += 1
+        return commit()
+
+    connection.commit = counted_commit
+
+    try:
+        with connection.execute_wrapper(counter):
+            yield counter
+    finally:
+        del connection.commit
+
+
+def endpoints(fixture):
+    """Returns the read endpoints as (label, path)."""
+
+    slug_name = fixture.circle.slug_name
+
+    return [
+        ('circles:list', '/circles/'),
+        ('circles:retrieve', f'/circles/{slug_name}/'),
+        ('rides:list', f'/circles/{slug_name}/rides/'),
+        ('members:list', f'/circles/{slug_name}/members/'),
+    ]
+
+
+def measure(client, path, amount, atomic_requests):
+    """Sends the requests with the given policy, returns the latencies and round trips."""
+
+    # Django
+    from django.db import connection
+
+    connection.settings_dict['ATOMIC_REQUESTS'] = atomic_requests
+    client.get(path)
+
+    latencies = []
+    counter = RoundTripCounter()
+
+    with counting(connection, counter):
+        for index in range(amount):
+            start = time.perf_counter()
+            response = client.get(path)
+            latencies.append(time.perf_counter() - start)
+
+            if response.status_code != 200:
+                raise AssertionError(f'{path} answered {response.status_code}.')
+
+    return dict(summarize(latencies), round_trips=round(counter.round_trips / amount, 2))
+
+
+def main():
+    """Parses the arguments, runs both policies and stores the results."""
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--settings', default='config.settings.local')
+    parser.add_argument('--requests', type=int, default=500, help='Requests per endpoint and policy.')
+    parser.add_argument('--members', type=int, default=20, help='Members listed in the circle.')
+    parser.add_argument('--rides', type=int, default=20, help='Rides listed in the circle.')
+    parser.add_argument('--output', default=None, help='Where to store the JSON results.')
+    args = parser.parse_args()
+
+    setup_django(args.settings)
+
+    # Django
+    from django.conf import settings
+    from django.db import connection
+
+    # Django REST Framework
+    from rest_framework.test import APIClient
+
+    # The SQL log of every request would dominate the timings.
+    settings.SQL_INSTRUMENTATION_SAMPLE_RATE = 0
+
+    fixture = Fixture(args.members, 0, args.rides, 0)
+    fixture.create()
+
+    # Keep the connection open between requests, like CONN_MAX_AGE does.
+    connection.close()
+    connection.settings_dict['CONN_MAX_AGE'] = None
+
+    client = APIClient(SERVER_NAME='localhost')
+    client.credentials(HTTP_AUTHORIZATION=fixture.token(fixture.members[0]))
+
+    header = f"{'endpoint':<18}{'policy':<16}{'round trips':>12}{'p50 ms':>10}{'p95 ms':>10}"
+    print(header)
+    print('-' * len(header))
+
+    results = {}
+    for label, path in endpoints(fixture):
+        results[label] = {
+            'atomic_requests': measure(client, path, args.requests, atomic_requests=True),
+            'per_action': measure(client, path, args.requests, atomic_requests=False),
+        }
+
+        for policy, result in results[label].items():
+            print(f"{label:<18}{policy:<16}{result['round_trips']:>12}{result['p50']:>10.2f}{result['p95']:>10.2f}")
+
+        before, after = results[label]['atomic_requests'], results[label]['per_action']
+        print(
+            f"{'':<18}{'change':<16}{after['round_trips'] - before['round_trips']:>12}"
+            f"{change(after['p50'], before['p50']):>+9.1f}%{change(after['p95'], before['p95']):>+9.1f}%"
+        )
+
+    path = save_results('transactions', {
+        'requests': args.requests,
+        'fixture': {'members': args.members, 'rides': args.rides},
+        'endpoints': results,
+    }, args.output)
+    print(f'\nResults stored in {path}')
+
+
+if __name__ == '__main__':
+    main()
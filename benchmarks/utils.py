@@ -0,0 +1,119 @@
+"""Benchmarks shared utilities."""
+
+# Utilities
+import json
+import os
+import subprocess
+import sys
+from datetime import datetime
+
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RESULTS_DIR = os.path.join(ROOT_DIR, 'benchmarks', 'results')
+
+
+def setup_django(settings_module='config.settings.local'):
+    """Configures Django so the benchmarks can use the ORM and the serializers."""
+
+    if ROOT_DIR not in sys.path:
+        sys.path.insert(0, ROOT_DIR)
+
+    os.environ.setdefault('DJANGO_SETTINGS_MODULE', settings_module)
+
+    import django
+    django.setup()
+
+
+def percentile(values, percent):
+    """Returns the percentile of an already sorted list using the nearest rank."""
+
+    if not values:
+        return 0.0
+
+    rank = max(int(round(percent / 100 * len(values) + 0.5)) - 1, 0)
+
+    return values[min(rank, len(values) - 1)]
+
+
+def summarize(latencies):
+    """Returns the latency distribution in milliseconds."""
+
+    values = sorted(latencies)
+
+    return {
+        'count': len(values),
+        'mean': round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        'p50': round(percentile(values, 50) * 1000, 3),
+        'p95': round(percentile(values, 95) * 1000, 3),
+        'p99': round(percentile(values, 99) * 1000, 3),
+    }
+
+
+def git_commit():
+    """Returns the current commit of the repository, if any."""
+
+    try:
+        output = subprocess.check_output(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=ROOT_DIR,
+            stderr=subprocess.DEVNULL
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return 'unknown'
+
+    return output.decode().strip()
+
+
+def save_results(name, results, path=None):
+    """Stores the results as JSON tagged with the commit, returns the file path."""
+
+    results = dict(results, commit=git_commit(), timestamp=datetime.utcnow().isoformat())
+
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, '{}-{}-{}.json'.format(
+            name,
+            results['commit'],
+            datetime.utcnow().strftime('%Y%m%d%H%M%S')
+        ))
+
+    with open(path, 'w') as results_file:
+        json.dump(results, results_file, indent=2, sort_keys=True)
+
+    return path
+
+
+def append_history(name, record):
+    """Appends a record to the history of a benchmark, returns the previous record if any."""
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    path = os.path.join(RESULTS_DIR, f'{name}-history.jsonl')
+    previous = None
+
+    if os.path.exists(path):
+        with open(path) as history:
+            lines = [line for line in history if line.strip()]
+        if lines:
+            previous = json.loads(lines[-1])
+
+    record = dict(record, commit=git_commit(), timestamp=datetime.utcnow().isoformat())
+    with open(path, 'a') as history:
+        history.write(json.dumps(record, sort_keys=True) + '\n')
+
+    return previous
+
+
+def load_results(path):
+    """Reads results previously stored with save_results."""
+
+    with open(path) as results_file:
+        return json.load(results_file)
+
+
+def change(current, previous):
+    """Returns the relative change between two measures as a percentage."""
+
+    if not previous:
+        return 0.0
+
+    return (current - previous) / previous * 100
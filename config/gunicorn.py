@@ -0,0 +1,38 @@
+"""Gunicorn configuration."""
+
+# Prometheus
+from prometheus_client import multiprocess
+
+# Utilities
+import os
+
+
+bind = '0.0.0.0:5000'
+chdir = '/app'
+workers = int(os.environ.get('GUNICORN_WORKERS', 1))
+# Event streams stay open for hours, greenlets serve them without
+# holding a worker, see EVENTS_STREAMS.
+worker_class = os.environ.get('GUNICORN_WORKER_CLASS', 'gevent')
+threads = int(os.environ.get('GUNICORN_THREADS', 1))
+
+
+def post_fork(server, worker):
+    """Makes psycopg2 yield to other greenlets while it waits on the database."""
+
+    if server.cfg.worker_class_str == 'gevent':
+        from psycogreen.gevent import patch_psycopg
+        patch_psycopg()
+
+
+def child_exit(server, worker):
+    """Removes the live samples of a dead worker from the metrics."""
+
+    if 'prometheus_multiproc_dir' in os.environ:
+        multiprocess.mark_process_dead(worker.pid)
+
+
+def worker_exit(server, worker):
+    """Closes the pooled database connections once the worker stops serving."""
+
+    from cride.utils.db.pool import drain_pools
+    drain_pools()
@@ -1,6 +1,7 @@
 """Base settings to build other settings files upon."""
 
 import environ
+from celery.schedules import crontab
 
 ROOT_DIR = environ.Path(__file__) - 3
 APPS_DIR = ROOT_DIR.path('cride')
@@ -22,7 +23,20 @@ USE_TZ = True
 DATABASES = {
     'default': env.db('DATABASE_URL'),
 }
-DATABASES['default']['ATOMIC_REQUESTS'] = True
+# Transactions are opened per viewset action, see TransactionPolicyMixin.
+DATABASES['default']['ATOMIC_REQUESTS'] = False
+
+# Read replicas
+# Safe reads of some views are sent to the replicas, users that wrote
+# something read from the primary for DATABASE_REPLICA_PIN_SECONDS.
+DATABASE_REPLICAS = []
+for index, url in enumerate(env.list('DATABASE_REPLICA_URLS', default=[])):
+    DATABASES[f'replica_{index}'] = env.db_url_config(url)
+    # Tests read the primary through the replicas instead of creating them.
+    DATABASES[f'replica_{index}']['TEST'] = {'MIRROR': 'default'}
+    DATABASE_REPLICAS.append(f'replica_{index}')
+DATABASE_ROUTERS = ['cride.utils.db.routers.ReplicaRouter']
+DATABASE_REPLICA_PIN_SECONDS = env.int('DATABASE_REPLICA_PIN_SECONDS', default=15)
 
 # URLs
 ROOT_URLCONF = 'config.urls'
@@ -81,15 +95,32 @@ AUTH_PASSWORD_VALIDATORS = [
 
 # Middlewares
 MIDDLEWARE = [
+    'cride.utils.middleware.MetricsMiddleware',
+    'cride.utils.middleware.QueryInstrumentationMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
     'django.contrib.auth.middleware.AuthenticationMiddleware',
+    'cride.utils.middleware.PrimaryPinningMiddleware',
     'django.contrib.messages.middleware.MessageMiddleware',
     'django.middleware.clickjacking.XFrameOptionsMiddleware',
 ]
 
+# SQL instrumentation
+# Fraction of the requests whose queries are counted, timed and logged.
+SQL_INSTRUMENTATION_SAMPLE_RATE = env.float('SQL_INSTRUMENTATION_SAMPLE_RATE', default=0.0)
+
+# Metrics
+# When set, the metrics endpoint requires it as a bearer token.
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN', default='')
+METRICS_CELERY_QUEUES = env.list('METRICS_CELERY_QUEUES', default=['celery'])
+# Port where each Celery worker exports its own metrics, 0 disables it.
+METRICS_CELERY_WORKER_PORT = env.int('METRICS_CELERY_WORKER_PORT', default=0)
+# Multiprocess directories of other services exported along with the
+# ones of this process, so the web exports the Celery task metrics too.
+METRICS_MULTIPROC_DIRS = env.list('METRICS_MULTIPROC_DIRS', default=[])
+
 # Static files
 STATIC_ROOT = str(ROOT_DIR('staticfiles'))
 STATIC_URL = '/static/'
@@ -105,6 +136,11 @@ STATICFILES_FINDERS = [
 MEDIA_ROOT = str(APPS_DIR('media'))
 MEDIA_URL = '/media/'
 
+# Uploads
+# Files are streamed to disk and capped, see cride.utils.uploads.
+FILE_UPLOAD_HANDLERS = ['cride.utils.uploads.LimitedUploadHandler']
+UPLOADS_MAX_FILE_SIZE = env.int('UPLOADS_MAX_FILE_SIZE', default=20 * 2 ** 20)
+
 # Templates
 TEMPLATES = [
     {
@@ -159,17 +195,102 @@ CELERY_TASK_SERIALIZER = 'json'
 CELERY_RESULT_SERIALIZER = 'json'
 CELERYD_TASK_TIME_LIMIT = 5 * 60
 CELERYD_TASK_SOFT_TIME_LIMIT = 60
+CELERY_BEAT_SCHEDULE = {
+    'materialize-ride-templates': {
+        'task': 'cride.rides.tasks.materialize_ride_templates',
+        'schedule': 60 * 60,
+    },
+    'reconcile-counters': {
+        'task': 'cride.rides.tasks.reconcile_counters',
+        'schedule': crontab(hour=3, minute=30),
+    },
+}
+
+# Ride templates
+# Days ahead whose rides are created from the templates.
+RIDE_TEMPLATES_WINDOW_DAYS = env.int('RIDE_TEMPLATES_WINDOW_DAYS', default=7)
+
+# Counters reconciliation
+# Circle or user ids whose counters are corrected by each statement, see cride.rides.counters.
+COUNTERS_RECONCILE_BATCH_SIZE = env.int('COUNTERS_RECONCILE_BATCH_SIZE', default=50000)
+
+# Bulk rides
+# Rides offered at once through the bulk creation endpoint.
+RIDES_BULK_CREATE_MAX = env.int('RIDES_BULK_CREATE_MAX', default=50)
+
+# Events
+# Server-sent events streams, see cride.utils.events. They are long
+# lived, so they are refused when EVENTS_STREAMS is off, which the
+# production settings do unless the workers are gevent ones.
+EVENTS_STREAMS = env.bool('EVENTS_STREAMS', default=True)
+EVENTS_BROKER = 'cride.utils.events.RedisBroker'
+EVENTS_REDIS_URL = env('REDIS_URL', default=CELERY_BROKER_URL)
+EVENTS_HEARTBEAT_SECONDS = env.int('EVENTS_HEARTBEAT_SECONDS', default=15)
+
+# My circles
+# Circles of the users shown with their profile, see cride.circles.cache.
+MY_CIRCLES_CACHE_SECONDS = env.int('MY_CIRCLES_CACHE_SECONDS', default=5 * 60)
+
+# Pictures
+# Uploads wait in PICTURES_PENDING_ROOT until a task writes their
+# variants to the media storage, web and workers must share it.
+PICTURES_DEFERRED = env.bool('PICTURES_DEFERRED', default=True)
+PICTURES_PENDING_ROOT = env('PICTURES_PENDING_ROOT', default=str(APPS_DIR('media/pending')))
+PICTURES_FORMATS = ['JPEG', 'PNG', 'WEBP', 'GIF']
+PICTURES_MAX_PIXELS = env.int('PICTURES_MAX_PIXELS', default=50 * 10 ** 6)
+PICTURE_VARIANTS = {
+    'picture': {'size': 1024, 'format': 'JPEG', 'quality': 85},
+    'picture_thumbnail': {'size': 256, 'format': 'JPEG', 'quality': 80},
+    'picture_webp': {'size': 1024, 'format': 'WEBP', 'quality': 80},
+}
+
+# Throttling
+# Token buckets of the actions, by '<throttle_scope>.<action>' and
+# then 'ip', 'circle' or 'user', see cride.utils.throttling.
+THROTTLE_BUCKETS = 'cride.utils.throttling.RedisBuckets'
+THROTTLE_REDIS_URL = env('REDIS_URL', default=CELERY_BROKER_URL)
+THROTTLE_RATES = {
+    'users.login': {'ip': '20/minute'},
+    'users.signup': {'ip': '10/hour'},
+    'users.verify': {'ip': '20/hour'},
+    'users.refresh': {'ip': '60/minute'},
+    'members.create': {'ip': '30/hour', 'user': '10/hour'},
+    'rides.join': {'user': '30/minute', 'circle': '600/minute'},
+}
+
+# Signed tokens
+# Lifetimes of the tokens of the login with token_type=jwt, see
+# cride.users.tokens.
+JWT_ACCESS_SECONDS = env.int('JWT_ACCESS_SECONDS', default=15 * 60)
+JWT_REFRESH_SECONDS = env.int('JWT_REFRESH_SECONDS', default=14 * 24 * 60 * 60)
+
+# Idempotency
+# Responses replayed to the retries of a request with the same
+# Idempotency-Key, see IdempotencyMixin.
+IDEMPOTENCY_KEY_SECONDS = env.int('IDEMPOTENCY_KEY_SECONDS', default=24 * 60 * 60)
+IDEMPOTENCY_LOCK_SECONDS = env.int('IDEMPOTENCY_LOCK_SECONDS', default=60)
+
+# Batch
+# Sub-requests accepted by POST /batch/.
+BATCH_MAX_REQUESTS = env.int('BATCH_MAX_REQUESTS', default=20)
 
 # Django REST FRAMEWORK
 
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
         'rest_framework.authentication.TokenAuthentication',
+        'cride.users.authentication.JWTAuthentication',
     ),
     'DEFAULT_PARSER_CLASSES': (
-        'rest_framework.parsers.JSONParser',
+        'cride.utils.parsers.ORJSONParser',
+        'cride.utils.parsers.MessagePackParser',
         'rest_framework.parsers.MultiPartParser'
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'cride.utils.renderers.ORJSONRenderer',
+        'cride.utils.renderers.MessagePackRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer'
+    ),
     'DEFAULT_PAGINATION_CLASS': 'rest_framework.pagination.LimitOffsetPagination',
     'PAGE_SIZE': 20
 }
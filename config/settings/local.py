@@ -33,6 +33,31 @@ EMAIL_PORT = 1025
 # django-extensions
 INSTALLED_APPS += ['django_extensions']  # noqa F405
 
+# SQL instrumentation
+SQL_INSTRUMENTATION_SAMPLE_RATE = env.float('SQL_INSTRUMENTATION_SAMPLE_RATE', default=1.0)
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {
+            'level': 'DEBUG',
+            'class': 'logging.StreamHandler',
+        },
+    },
+    'loggers': {
+        'cride': {
+            'handlers': ['console'],
+            'level': 'INFO',
+        },
+    },
+}
+
 # Celery
 CELERY_TASK_ALWAYS_EAGER = True
 CELERY_TASK_EAGER_PROPAGATES = True
+
+# Throttling
+# benchmarks.loadtest sends every request from a single address and
+# storms a single circle, the production rates apply with THROTTLE_LOCAL.
+if not env.bool('THROTTLE_LOCAL', default=False):
+    THROTTLE_RATES = {}
@@ -9,13 +9,24 @@ ALLOWED_HOSTS = env.list('DJANGO_ALLOWED_HOSTS', default=['comparteride.com'])
 
 # Databases
 DATABASES['default'] = env.db('DATABASE_URL')  # NOQA
-DATABASES['default']['ATOMIC_REQUESTS'] = True  # NOQA
-DATABASES['default']['CONN_MAX_AGE'] = env.int('CONN_MAX_AGE', default=60)  # NOQA
+DATABASES['default']['ATOMIC_REQUESTS'] = False  # NOQA
+# Connections are borrowed from a pool per process and given back
+# after every request, see cride.utils.db.backends.postgresql_pool.
+DATABASE_POOL = {
+    'MAX_SIZE': env.int('DATABASE_POOL_MAX_SIZE', default=10),
+    'MAX_LIFETIME': env.int('DATABASE_POOL_MAX_LIFETIME', default=1800),
+    'TIMEOUT': env.float('DATABASE_POOL_TIMEOUT', default=10.0),
+    'PRE_PING': env.bool('DATABASE_POOL_PRE_PING', default=True),
+}
+for alias in ['default'] + DATABASE_REPLICAS:  # NOQA
+    DATABASES[alias]['ENGINE'] = 'cride.utils.db.backends.postgresql_pool'  # NOQA
+    DATABASES[alias]['CONN_MAX_AGE'] = 0  # NOQA
+    DATABASES[alias]['POOL'] = DATABASE_POOL  # NOQA
 
 # Cache
 CACHES = {
     'default': {
-        'BACKEND': 'django_redis.cache.RedisCache',
+        'BACKEND': 'cride.utils.cache.InstrumentedRedisCache',
         'LOCATION': env('REDIS_URL'),
         'OPTIONS': {
             'CLIENT_CLASS': 'django_redis.client.DefaultClient',
@@ -51,6 +62,22 @@ STATICFILES_STORAGE = 'whitenoise.storage.CompressedManifestStaticFilesStorage'
 # Media
 DEFAULT_FILE_STORAGE = 'storages.backends.s3boto3.S3Boto3Storage'
 MEDIA_URL = f'https://{AWS_STORAGE_BUCKET_NAME}.s3.amazonaws.com/'
+PICTURES_PENDING_ROOT = env('PICTURES_PENDING_ROOT', default='/pending-pictures')
+
+# Events
+# Every open stream holds a worker unless greenlets serve the requests.
+EVENTS_STREAMS = env('GUNICORN_WORKER_CLASS', default='gevent') == 'gevent'
+
+# Throttling
+# Caddy replaces X-Forwarded-For with the client address, so the per IP
+# buckets neither trust what clients send nor share Caddy's address.
+REST_FRAMEWORK['NUM_PROXIES'] = 1  # NOQA
+
+# Metrics
+# The metrics endpoint is never public, and it also exports the samples
+# the Celery worker writes to the shared prometheus volume.
+METRICS_TOKEN = env('DJANGO_METRICS_TOKEN')
+METRICS_MULTIPROC_DIRS = env.list('METRICS_MULTIPROC_DIRS', default=['/prometheus/celeryworker'])
 
 # Templates
 TEMPLATES[0]['OPTIONS']['loaders'] = [  # noqa F405
@@ -89,6 +116,10 @@ INSTALLED_APPS += ['gunicorn']  # noqa F405
 MIDDLEWARE.insert(1, 'whitenoise.middleware.WhiteNoiseMiddleware')  # noqa F405
 
 
+# SQL instrumentation
+SQL_INSTRUMENTATION_SAMPLE_RATE = env.float('SQL_INSTRUMENTATION_SAMPLE_RATE', default=0.01)
+
+
 # Logging
 # A sample logging configuration. The only tangible logging
 # performed by this configuration is to send an email to
@@ -131,6 +162,11 @@ LOGGING = {
             'level': 'ERROR',
             'handlers': ['console', 'mail_admins'],
             'propagate': True
+        },
+        'cride': {
+            'level': 'INFO',
+            'handlers': ['console'],
+            'propagate': False
         }
     }
 }
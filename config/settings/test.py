@@ -19,6 +19,18 @@ CACHES = {
     }
 }
 
+# Events
+EVENTS_BROKER = "cride.utils.events.MemoryBroker"
+
+# Throttling
+THROTTLE_BUCKETS = "cride.utils.throttling.MemoryBuckets"
+
+# Celery
+CELERY_BROKER_URL = "memory://"
+CELERY_RESULT_BACKEND = "cache+memory://"
+CELERY_TASK_ALWAYS_EAGER = True
+CELERY_TASK_EAGER_PROPAGATES = True
+
 # Passwords
 PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
 
@@ -5,10 +5,22 @@ from django.urls import path, include
 from django.conf.urls.static import static
 from django.contrib import admin
 
+# Metrics
+from cride.utils.metrics import metrics_view
+
+# Batch
+from cride.utils.batch import BatchView
+
 urlpatterns = [
     # Django Admin
     path(settings.ADMIN_URL, admin.site.urls),
 
+    # Metrics
+    path('metrics/', metrics_view, name='metrics'),
+
+    # Batch
+    path('batch/', BatchView.as_view(), name='batch'),
+
     # Circles app
     path('circles/', include('cride.circles.urls', namespace='circles',)),
 
@@ -0,0 +1,78 @@
+"""Circles cache module.
+
+The circles of a user, as shown with their profile, are cached
+under a key that includes a version of the user's memberships.
+Invalidating replaces the version once the transaction commits, so
+readers racing with a write can only fill a key nobody reads again.
+Counters may lag up to MY_CIRCLES_CACHE_SECONDS behind.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+# Models
+from cride.circles.models import Circle, Membership
+
+# Serializers
+from cride.circles.serializers.circles import CircleModelSerializer
+
+# Utilities
+from uuid import uuid4
+
+
+def version_key(user_id):
+    """Returns the key of the memberships version of the user."""
+
+    return f'users:{user_id}:circles:version'
+
+
+def circles_key(user_id, version):
+    """Returns the key of the circles of the user at a version."""
+
+    return f'users:{user_id}:circles:{version}'
+
+
+def get_version(user_id):
+    """Returns the memberships version of the user, starting one if needed."""
+
+    version = cache.get(version_key(user_id))
+
+    if version is None:
+        cache.add(version_key(user_id), uuid4().hex, None)
+        version = cache.get(version_key(user_id))
+
+    return version
+
+
+def my_circles(user):
+    """Returns the serialized active circles of the user."""
+
+    key = circles_key(user.pk, get_version(user.pk))
+    data = cache.get(key)
+
+    if data is None:
+        circles = Circle.objects.filter(members=user, membership__is_active=True)
+        data = [dict(circle) for circle in CircleModelSerializer(circles, many=True).data]
+        cache.set(key, data, settings.MY_CIRCLES_CACHE_SECONDS)
+
+    return data
+
+
+def invalidate_my_circles(*user_ids):
+    """Drops the cached circles of the users when the transaction commits."""
+
+    def invalidate():
+        cache.set_many({version_key(user_id): uuid4().hex for user_id in user_ids}, None)
+
+    transaction.on_commit(invalidate)
+
+
+def invalidate_circle_members(circle):
+    """Drops the cached circles of every active member of the circle."""
+
+    invalidate_my_circles(*Membership.objects.filter(
+        circle=circle,
+        is_active=True
+    ).values_list('user_id', flat=True))
@@ -0,0 +1,28 @@
+# Generated by Django 2.0.9 on 2026-10-19 15:08
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0003_invitation'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='circle',
+            name='picture_thumbnail',
+            field=models.ImageField(blank=True, null=True, upload_to='circles/pictures'),
+        ),
+        migrations.AddField(
+            model_name='circle',
+            name='picture_upload',
+            field=models.CharField(blank=True, help_text='Uploaded picture waiting for its variants, see cride.utils.images.', max_length=255),
+        ),
+        migrations.AddField(
+            model_name='circle',
+            name='picture_webp',
+            field=models.ImageField(blank=True, null=True, upload_to='circles/pictures'),
+        ),
+    ]
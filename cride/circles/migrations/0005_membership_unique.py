@@ -0,0 +1,47 @@
+from django.conf import settings
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """A user holds a single membership per circle.
+
+    The constraint is named so IntegrityError can be told apart, see
+    cride.utils.serializers.constraint_errors. Duplicates left by
+    concurrent joins are dropped first. The active one stays, the
+    oldest when several are, so a user that left and joined again
+    keeps the live membership and its counters.
+    """
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('circles', '0004_picture_variants'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql=[
+                """
+                DELETE FROM circles_membership
+                WHERE id IN (
+                    SELECT id FROM (
+                        SELECT id, row_number() OVER (
+                            PARTITION BY user_id, circle_id
+                            ORDER BY is_active DESC, id
+                        ) AS position
+                        FROM circles_membership
+                    ) AS memberships
+                    WHERE position > 1
+                )
+                """,
+                'ALTER TABLE circles_membership ADD CONSTRAINT circles_membership_user_circle_uniq '
+                'UNIQUE (user_id, circle_id)',
+            ],
+            reverse_sql='ALTER TABLE circles_membership DROP CONSTRAINT circles_membership_user_circle_uniq',
+            state_operations=[
+                migrations.AlterUniqueTogether(
+                    name='membership',
+                    unique_together={('user', 'circle')},
+                ),
+            ],
+        ),
+    ]
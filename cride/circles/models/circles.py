@@ -20,6 +20,13 @@ class Circle(CRideModel):
 
     about = models.CharField(max_length=255)
     picture = models.ImageField(upload_to='circles/pictures', blank=True, null=True)
+    picture_thumbnail = models.ImageField(upload_to='circles/pictures', blank=True, null=True)
+    picture_webp = models.ImageField(upload_to='circles/pictures', blank=True, null=True)
+    picture_upload = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Uploaded picture waiting for its variants, see cride.utils.images.'
+    )
 
     members = models.ManyToManyField(
         'users.User',
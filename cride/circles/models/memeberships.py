@@ -42,6 +42,12 @@ class Membership(CRideModel):
         help_text='Only active users are allowed to interact in the circle.'
     )
 
+    class Meta(CRideModel.Meta):
+        """Meta attributes."""
+
+        # Named circles_membership_user_circle_uniq by its migration.
+        unique_together = ('user', 'circle')
+
     def __str__(self):
         """Return username and circle."""
         return '@{} at #{}'.format(
@@ -6,6 +6,9 @@ from rest_framework.permissions import BasePermission
 # Models
 from cride.circles.models import Membership
 
+# Batch
+from cride.utils.batch import memoize
+
 
 class IsCircleActiveMember(BasePermission):
     """Allow only active memberships.
@@ -17,18 +20,11 @@ class IsCircleActiveMember(BasePermission):
     def has_object_permission(self, request, view, obj):
         """Determines whether the user has an active membership within the circle"""
 
-        try:
-            Membership.objects.get(
-                user=request.user,
-                circle=view.circle,
-                is_active=True
-            )
-
-        except Membership.DoesNotExist:
-            return False
-
-        else:
-            return True
+        return memoize(request, ('membership', request.user.pk, view.circle.pk), lambda: Membership.objects.filter(
+            user=request.user,
+            circle=view.circle,
+            is_active=True
+        ).exists())
 
 
 class IsAdminOrMembershipOwner(BasePermission):
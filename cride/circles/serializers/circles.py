@@ -6,10 +6,18 @@ from rest_framework import serializers
 # Models
 from cride.circles.models import Circle
 
+# Serializers
+from cride.utils.serializers import DeferredPictureMixin, SparseFieldsMixin
 
-class CircleModelSerializer(serializers.ModelSerializer):
+# Tasks
+from cride.circles.tasks import process_circle_picture
+
+
+class CircleModelSerializer(SparseFieldsMixin, DeferredPictureMixin, serializers.ModelSerializer):
     """Circle Model serializer."""
 
+    picture_task = process_circle_picture
+
     members_limit = serializers.IntegerField(
         required=False,
         min_value=10
@@ -39,11 +47,12 @@ class CircleModelSerializer(serializers.ModelSerializer):
         model = Circle
 
         fields = (
-            'name', 'slug_name', 'about', 'picture', 'rides_offered',
-            'rides_taken', 'is_verified', 'is_public', 'is_limited', 'members_limit'
+            'name', 'slug_name', 'about', 'picture', 'picture_thumbnail', 'picture_webp',
+            'rides_offered', 'rides_taken', 'is_verified', 'is_public', 'is_limited', 'members_limit'
         )
 
         read_only_fields = (
+            'picture_thumbnail', 'picture_webp',
             'is_public', 'is_verified',
             'rides_offered', 'rides_taken'
         )
@@ -5,6 +5,7 @@ from rest_framework import serializers
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import SparseFieldsMixin, constraint_errors
 
 # Models
 from cride.circles.models import Membership, Invitation
@@ -12,8 +13,11 @@ from cride.circles.models import Membership, Invitation
 # Utilities
 from django.utils import timezone
 
+# Metrics
+from cride.utils.metrics import INVITATIONS_REDEEMED
 
-class MembershipModelSerializer(serializers.ModelSerializer):
+
+class MembershipModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Membership Model Serializer"""
 
     joined_at = serializers.DateTimeField(source='created', read_only=True)
@@ -21,6 +25,8 @@ class MembershipModelSerializer(serializers.ModelSerializer):
     user = UserModelSerializer(read_only=True)
     invited_by = serializers.StringRelatedField(read_only=True)
 
+    expandable_fields = {'user': 'username'}
+
     class Meta:
         """Metadata class."""
 
@@ -56,21 +62,6 @@ class AddMemberSerializer(serializers.Serializer):
     invitation_code = serializers.CharField(min_length=50, max_length=50)
     user = serializers.HiddenField(default=serializers.CurrentUserDefault())
 
-    def validate_user(self, user):
-        """Verify is'nt already a member."""
-
-        circle = self.context['circle']
-
-        query = Membership.objects.filter(
-            user=user,
-            circle=circle,
-        )
-
-        if query.exists():
-            raise serializers.ValidationError('The user is already a member.')
-
-        return user
-
     def validate_invitation_code(self, invitation_code):
         """Verify code exists and its related to the circle."""
 
@@ -110,11 +101,15 @@ class AddMemberSerializer(serializers.Serializer):
 
         now = timezone.now()
 
-        member = Membership.objects.create(
-            user=user,
-            circle=circle,
-            invited_by=invitation.issued_by,
-        )
+        # The action is atomic, a violation rolls it back anyway.
+        with constraint_errors({
+            'circles_membership_user_circle_uniq': {'user': ['The user is already a member.']},
+        }, savepoint=False):
+            member = Membership.objects.create(
+                user=user,
+                circle=circle,
+                invited_by=invitation.issued_by,
+            )
 
         invitation.used_by = user
         invitation.used_at = now
@@ -128,4 +123,7 @@ class AddMemberSerializer(serializers.Serializer):
         )
         issuer.used_invitations += 1
         issuer.save()
+
+        INVITATIONS_REDEEMED.inc()
+
         return member
@@ -0,0 +1,32 @@
+"""Circles tasks."""
+
+# Django
+from django.db import transaction
+
+# Celery
+from cride.taskapp.celery import app
+
+# Models
+from cride.circles.models import Circle
+
+# Images
+from cride.utils.images import process_picture
+
+
+@app.task
+def process_circle_picture(circle_pk, upload):
+    """Builds the variants of an uploaded circle picture.
+
+    Once swapped in, the cached circles of the members are dropped,
+    they still point to the replaced pictures.
+    """
+
+    # The cache renders circles with the serializer that enqueues this task.
+    from cride.circles.cache import invalidate_circle_members
+
+    swapped = process_picture(Circle, circle_pk, upload)
+
+    if swapped:
+        transaction.on_commit(lambda: invalidate_circle_members(circle_pk))
+
+    return swapped
@@ -0,0 +1,90 @@
+"""My circles cache tests."""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.shortcuts import reverse
+from django.test import TransactionTestCase
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from rest_framework.authtoken.models import Token
+
+# Tasks
+from cride.circles.tasks import process_circle_picture
+
+# Utilities
+from unittest import mock
+
+
+class MyCirclesCacheTestCase(TransactionTestCase):
+    """Manages testing of the cached circles of the user profile."""
+
+    def setUp(self):
+        """Creates an admin of a circle."""
+
+        cache.clear()
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True,
+            is_client=True
+        )
+        Profile.objects.create(user=self.user)
+        self.circle = Circle.objects.create(name='Facultad de Ciencias', slug_name='ciencias-unam', about='Circle.')
+        Membership.objects.create(user=self.user, circle=self.circle, is_admin=True)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = reverse('users:users-detail', kwargs={'username': 'cheke'})
+
+    def circles(self):
+        """Returns the circles of the profile and the queries run to get them."""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        circle_queries = [query for query in queries if 'FROM "circles_circle"' in query['sql']]
+
+        return [circle['name'] for circle in response.data['circles']], len(circle_queries)
+
+    def test_circles_are_cached_until_edited_or_left(self):
+        """The payload is read from the cache until a circle or membership changes."""
+
+        self.assertEqual(self.circles(), (['Facultad de Ciencias'], 1))
+        self.assertEqual(self.circles(), (['Facultad de Ciencias'], 0))
+
+        self.client.patch(
+            reverse('circles:circles-detail', kwargs={'slug_name': 'ciencias-unam'}),
+            {'name': 'Ciencias UNAM'},
+            format='json'
+        )
+        self.assertEqual(self.circles(), (['Ciencias UNAM'], 1))
+
+        self.client.delete(reverse('circles:membership-detail', kwargs={
+            'slug_name': 'ciencias-unam',
+            'username': 'cheke'
+        }))
+        self.assertEqual(self.circles(), ([], 1))
+
+    def test_circles_are_dropped_when_a_picture_is_swapped_in(self):
+        """Cached circles do not keep pointing to the replaced pictures."""
+
+        self.assertEqual(self.circles(), (['Facultad de Ciencias'], 1))
+
+        with mock.patch('cride.circles.tasks.process_picture', return_value=False):
+            process_circle_picture(self.circle.pk, 'circles/pictures/superseded.png')
+        self.assertEqual(self.circles(), (['Facultad de Ciencias'], 0))
+
+        with mock.patch('cride.circles.tasks.process_picture', return_value=True):
+            process_circle_picture(self.circle.pk, 'circles/pictures/latest.png')
+        self.assertEqual(self.circles(), (['Facultad de Ciencias'], 1))
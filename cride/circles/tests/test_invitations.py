@@ -170,3 +170,19 @@ class InvitationApiEndPoint(APITestCase):
 
         for invitation in invitations:
             self.assertIn(invitation.code, request.data['unused_invitations'])
+
+    def test_members_can_not_join_twice(self):
+        """The unique membership is reported as before and nothing is written."""
+
+        invitation = Invitation.objects.create(issued_by=self.user, circle=self.circle)
+
+        request = self.client.post(
+            reverse('circles:membership-list', args=[self.circle.slug_name]),
+            {'invitation_code': invitation.code}
+        )
+
+        self.assertEqual(request.status_code, 400)
+        self.assertEqual(request.data, {'user': ['The user is already a member.']})
+
+        invitation.refresh_from_db()
+        self.assertFalse(invitation.used)
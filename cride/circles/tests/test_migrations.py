@@ -0,0 +1,53 @@
+"""Circles migrations tests."""
+
+# Django
+from django.db import connection
+from django.db.migrations.executor import MigrationExecutor
+from django.test import TransactionTestCase
+
+# Models
+from cride.users.models import User
+from cride.circles.models import Circle
+
+
+class MembershipUniqueMigrationTestCase(TransactionTestCase):
+    """Manages testing of the duplicated memberships cleanup."""
+
+    before = [('circles', '0004_picture_variants')]
+    after = [('circles', '0005_membership_unique')]
+
+    def migrate(self, targets):
+        """Migrates to the targets, returns the models of that state."""
+
+        executor = MigrationExecutor(connection)
+        executor.loader.build_graph()
+        executor.migrate(targets)
+
+        return executor.loader.project_state(targets).apps
+
+    def setUp(self):
+        """Rolls the unique constraint back."""
+
+        self.addCleanup(self.migrate, MigrationExecutor(connection).loader.graph.leaf_nodes())
+        self.apps = self.migrate(self.before)
+
+    def test_the_active_membership_stays(self):
+        """A user that left and joined again keeps the newer, active membership."""
+
+        user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke'
+        )
+        circle = Circle.objects.create(name='Facultad de Ciencias', slug_name='ciencias-unam', about='Circle.')
+
+        Membership = self.apps.get_model('circles', 'Membership')
+        Membership.objects.create(user_id=user.pk, circle_id=circle.pk, is_active=False, rides_taken=2)
+        active = Membership.objects.create(user_id=user.pk, circle_id=circle.pk, is_active=True, rides_taken=5)
+        Membership.objects.create(user_id=user.pk, circle_id=circle.pk, is_active=True)
+
+        Membership = self.migrate(self.after).get_model('circles', 'Membership')
+
+        self.assertEqual(list(Membership.objects.values_list('pk', 'rides_taken')), [(active.pk, 5)])
@@ -15,22 +15,38 @@ from rest_framework.mixins import (
     ListModelMixin
 )
 
+from cride.utils.mixins import CompactListMixin, ReplicaReadMixin, SparseQuerysetMixin, TransactionPolicyMixin
+
 # Models
 from cride.circles.models import Circle, Membership
 
 # Serializers
 from cride.circles.serializers import CircleModelSerializer
 
+# Cache
+from cride.circles.cache import invalidate_circle_members, invalidate_my_circles
+
 # Filters
 from rest_framework.filters import SearchFilter, OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend
 
 
-class CircleModelViewSet(CreateModelMixin, RetrieveModelMixin, UpdateModelMixin, ListModelMixin, GenericViewSet):
+class CircleModelViewSet(
+    ReplicaReadMixin,
+    TransactionPolicyMixin,
+    CompactListMixin,
+    SparseQuerysetMixin,
+    CreateModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    ListModelMixin,
+    GenericViewSet
+):
     """Circle Model View Set. Manages Every API View related with Circle Model."""
 
     serializer_class = CircleModelSerializer
     lookup_field = 'slug_name'
+    atomic_actions = ('create',)
 
     # Filters
     filter_backends = (SearchFilter, OrderingFilter, DjangoFilterBackend)
@@ -39,6 +55,16 @@ class CircleModelViewSet(CreateModelMixin, RetrieveModelMixin, UpdateModelMixin,
     ordering = ('-rides_offered', '-rides_taken')
     filter_fields = ('is_verified', 'is_limited')
 
+    compact_fields = {
+        'slug_name': 'slug_name',
+        'name': 'name',
+        'rides_offered': 'rides_offered',
+        'rides_taken': 'rides_taken',
+        'is_verified': 'is_verified',
+        'is_limited': 'is_limited',
+        'members_limit': 'members_limit',
+    }
+
     def get_queryset(self):
         """Returns filtered queryset."""
 
@@ -69,3 +95,12 @@ class CircleModelViewSet(CreateModelMixin, RetrieveModelMixin, UpdateModelMixin,
             is_admin=True,
             remaining_invitations=20
         )
+
+        invalidate_my_circles(user.pk)
+
+    def perform_update(self, serializer):
+        """Drops the cached circles of the members after an edit."""
+
+        circle = serializer.save()
+
+        invalidate_circle_members(circle)
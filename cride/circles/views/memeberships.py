@@ -12,7 +12,15 @@ from rest_framework.mixins import (
     DestroyModelMixin,
     CreateModelMixin
 )
-from cride.utils.mixins import AddCircleMixin
+from cride.utils.mixins import (
+    AddCircleMixin,
+    CompactListMixin,
+    IdempotencyMixin,
+    ReplicaReadMixin,
+    SparseQuerysetMixin,
+    ThrottleMixin,
+    TransactionPolicyMixin
+)
 
 # Models
 from cride.circles.models import (
@@ -24,6 +32,9 @@ from cride.circles.models import (
 # Serializers
 from cride.circles.serializers import MembershipModelSerializer, AddMemberSerializer
 
+# Cache
+from cride.circles.cache import invalidate_my_circles
+
 # Permissions
 from rest_framework.permissions import IsAuthenticated
 from cride.circles.permissions import (
@@ -40,6 +51,12 @@ from rest_framework.status import (
 
 
 class MembershipViewSet(
+    IdempotencyMixin,
+    ThrottleMixin,
+    ReplicaReadMixin,
+    TransactionPolicyMixin,
+    CompactListMixin,
+    SparseQuerysetMixin,
     ListModelMixin,
     AddCircleMixin,
     CreateModelMixin,
@@ -50,6 +67,17 @@ class MembershipViewSet(
 
     serializer_class = MembershipModelSerializer
     lookup_field = 'username'
+    atomic_actions = ('create', 'invitations')
+    idempotent_actions = ('create',)
+    throttle_scope = 'members'
+
+    compact_fields = {
+        'username': 'user__username',
+        'is_admin': 'is_admin',
+        'rides_taken': 'rides_taken',
+        'rides_offered': 'rides_offered',
+        'joined_at': 'created',
+    }
 
     def get_permissions(self):
         """Modifies the default permission classes."""
@@ -91,6 +119,8 @@ class MembershipViewSet(
         instance.is_active = False
         instance.save()
 
+        invalidate_my_circles(instance.user_id)
+
     @action(detail=True, methods=['get'])
     def invitations(self, request, *args, **kwargs):
         """Retrieve a member's invitation breakdown.
@@ -146,6 +176,7 @@ class MembershipViewSet(
         if serializer.is_valid(raise_exception=True):
 
             member = serializer.save()
+            invalidate_my_circles(member.user_id)
 
             data = self.get_serializer(member).data
 
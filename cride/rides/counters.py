@@ -0,0 +1,138 @@
+"""Rides counters module.
+
+The rides and invitations counters of circles, memberships and profiles
+are kept with increments as rides are offered, joined and left, so they
+can drift. Reconciling recomputes them with GROUP BY queries over the
+rides, their passengers and the used invitations, one range of rows at
+a time, and only writes the rows whose counters differ. Every range is
+a single statement, so its counts and its corrections share a snapshot
+and no lock is held between ranges.
+"""
+
+# Django
+from django.db import connection
+
+# Models
+from cride.users.models import Profile
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+
+# Utilities
+from collections import namedtuple
+
+
+Counters = namedtuple('Counters', ['model', 'keys', 'range_column', 'sources'])
+
+
+def grouped_count(source, keys, condition='TRUE'):
+    """Returns the rows of the source counted by the keys.
+
+    keys are (name, column) pairs, the range is taken on the first column.
+    """
+
+    columns = ', '.join(f'{column} AS {name}' for name, column in keys)
+    groups = ', '.join(str(position) for position in range(1, len(keys) + 1))
+
+    return (
+        f'SELECT {columns}, count(*) AS amount FROM {source} '
+        f'WHERE {condition} AND {keys[0][1]} BETWEEN %(low)s AND %(high)s '
+        f'GROUP BY {groups}'
+    )
+
+
+def rides_offered(*keys):
+    """Returns the rides offered counted by the keys, ride columns."""
+
+    return grouped_count(Ride._meta.db_table, keys)
+
+
+def rides_taken(*keys):
+    """Returns the rides taken counted by the keys, passenger or ride columns."""
+
+    source = (
+        f'{Ride.passengers.through._meta.db_table} AS passenger '
+        f'JOIN {Ride._meta.db_table} AS ride ON ride.id = passenger.ride_id'
+    )
+
+    return grouped_count(source, keys)
+
+
+def used_invitations(*keys):
+    """Returns the used invitations counted by the keys, invitation columns."""
+
+    return grouped_count(Invitation._meta.db_table, keys, condition='used')
+
+
+COUNTERS = [
+    Counters(Circle, ('id',), 'id', {
+        'rides_offered': rides_offered(('id', 'offered_in_id')),
+        'rides_taken': rides_taken(('id', 'ride.offered_in_id')),
+    }),
+    Counters(Membership, ('user_id', 'circle_id'), 'user_id', {
+        'rides_offered': rides_offered(('user_id', 'offered_by_id'), ('circle_id', 'offered_in_id')),
+        'rides_taken': rides_taken(('user_id', 'passenger.user_id'), ('circle_id', 'ride.offered_in_id')),
+        'used_invitations': used_invitations(('user_id', 'issued_by_id'), ('circle_id', 'circle_id')),
+    }),
+    Counters(Profile, ('user_id',), 'user_id', {
+        'rides_offered': rides_offered(('user_id', 'offered_by_id')),
+        'rides_taken': rides_taken(('user_id', 'passenger.user_id')),
+    }),
+]
+
+
+def reconcile_sql(counters):
+    """Returns the statement correcting the counters of a range of rows.
+
+    It returns the corrected rows and the absolute drift of every field.
+    """
+
+    table = counters.model._meta.db_table
+    fields = list(counters.sources)
+    keys = ', '.join(counters.keys)
+
+    joins = ' '.join(f'LEFT JOIN ({sql}) AS {field}_counts USING ({keys})' for field, sql in counters.sources.items())
+    stored = ', '.join(f'stored.{field} AS stored_{field}' for field in fields)
+    expected = ', '.join(f'COALESCE({field}_counts.amount, 0) AS {field}' for field in fields)
+
+    return (
+        f'WITH corrected AS ('
+        f'UPDATE {table} SET {", ".join(f"{field} = counts.{field}" for field in fields)} '
+        f'FROM ('
+        f'SELECT stored.id, {stored}, {expected} FROM {table} AS stored {joins} '
+        f'WHERE stored.{counters.range_column} BETWEEN %(low)s AND %(high)s'
+        f') AS counts '
+        f'WHERE {table}.id = counts.id AND {table}.{counters.range_column} BETWEEN %(low)s AND %(high)s '
+        f'AND ({", ".join(f"{table}.{field}" for field in fields)}) '
+        f'IS DISTINCT FROM ({", ".join(f"counts.{field}" for field in fields)}) '
+        f'RETURNING {", ".join(f"abs(counts.{field} - counts.stored_{field}) AS {field}" for field in fields)}'
+        f') '
+        f'SELECT count(*), {", ".join(f"COALESCE(sum({field}), 0)::bigint" for field in fields)} FROM corrected'
+    )
+
+
+def reconcile(counters, batch_size):
+    """Corrects the counters batch_size values of the range column at a time.
+
+    Returns the corrected rows and the drift by field.
+    """
+
+    table = counters.model._meta.db_table
+    sql = reconcile_sql(counters)
+    rows = 0
+    drift = dict.fromkeys(counters.sources, 0)
+
+    with connection.cursor() as cursor:
+        cursor.execute(f'SELECT min({counters.range_column}), max({counters.range_column}) FROM {table}')
+        low, last = cursor.fetchone()
+
+        while low is not None and low <= last:
+            cursor.execute(sql, {'low': low, 'high': low + batch_size - 1})
+            corrected, *amounts = cursor.fetchone()
+
+            rows += corrected
+            for field, amount in zip(counters.sources, amounts):
+                drift[field] += amount
+
+            low += batch_size
+
+    return rows, drift
@@ -0,0 +1,66 @@
+"""Rides events.
+
+Seat availability changes pushed to the event streams of the
+circle and of the ride, once the transaction that made them commits.
+"""
+
+# Django
+from django.db import transaction
+
+# Events
+from cride.utils.events import format_event, get_broker
+
+
+def circle_channel(circle_id):
+    """Returns the channel of the rides of a circle."""
+
+    return f'circle:{circle_id}'
+
+
+def ride_channel(ride_id):
+    """Returns the channel of a single ride."""
+
+    return f'ride:{ride_id}'
+
+
+def publish(ride, name, data):
+    """Publishes the event to the circle and ride channels after the commit."""
+
+    message = format_event(name, data)
+    channels = (circle_channel(ride.offered_in_id), ride_channel(ride.pk))
+
+    def send():
+        broker = get_broker()
+
+        for channel in channels:
+            broker.publish(channel, message)
+
+    transaction.on_commit(send)
+
+
+def ride_created(ride):
+    """A new ride is offered in the circle."""
+
+    publish(ride, 'ride.created', {
+        'id': ride.pk,
+        'available_seats': ride.available_seats,
+        'departure_location': ride.departure_location,
+        'departure_date': ride.departure_date,
+        'arrival_location': ride.arrival_location,
+        'arrival_date': ride.arrival_date,
+    })
+
+
+def seats_changed(ride):
+    """The available seats of the ride changed."""
+
+    publish(ride, 'ride.seats', {
+        'id': ride.pk,
+        'available_seats': ride.available_seats,
+    })
+
+
+def ride_finished(ride):
+    """The ride ended."""
+
+    publish(ride, 'ride.finished', {'id': ride.pk})
@@ -0,0 +1,479 @@
+"""Synthetic dataset generation command."""
+
+# Django
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand, CommandError
+from django.core.management.color import no_style
+from django.db import connection
+from django.db.models import Max
+from django.utils import timezone
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership, Invitation
+from cride.rides.models import Ride, Qualification
+
+# Utilities
+import io
+import random
+from collections import Counter
+from datetime import timedelta
+from itertools import accumulate
+from string import ascii_letters, digits
+
+# psycopg2
+from psycopg2.extras import execute_values
+
+
+FIRST_NAMES = (
+    'Francisco', 'Pablo', 'Maria', 'Fernanda', 'Jose', 'Lucia', 'Diego',
+    'Valeria', 'Carlos', 'Andrea', 'Luis', 'Sofia', 'Miguel', 'Camila',
+)
+LAST_NAMES = (
+    'Ramirez', 'Trinidad', 'Hernandez', 'Garcia', 'Martinez', 'Lopez',
+    'Gonzalez', 'Perez', 'Sanchez', 'Romero', 'Flores', 'Torres',
+)
+LOCATIONS = (
+    'Ciudad Universitaria', 'Coyoacan', 'Polanco', 'Condesa', 'Roma Norte',
+    'Tlalpan', 'Santa Fe', 'Satelite', 'Xochimilco', 'Del Valle', 'Narvarte',
+    'Centro Historico', 'Iztapalapa', 'Azcapotzalco', 'Lindavista',
+)
+
+
+def zipf_weights(size, exponent):
+    """Returns the cumulative weights of a Zipf distribution over size ranks."""
+
+    return list(accumulate(1 / (rank ** exponent) for rank in range(1, size + 1)))
+
+
+class TableWriter:
+    """Table writer
+
+    Buffers the rows of a table and loads them with
+    PostgreSQL's COPY every time the buffer gets full.
+    Writers of the referenced tables are flushed first,
+    so foreign keys always point to loaded rows.
+    """
+
+    def __init__(self, cursor, table, columns, batch_size, parents=()):
+        """Stores the destination of the rows."""
+
+        self.cursor = cursor
+        self.table = table
+        self.columns = columns
+        self.batch_size = batch_size
+        self.parents = parents
+        self.buffer = io.StringIO()
+        self.buffered = 0
+        self.written = 0
+
+    def write(self, *values):
+        """Adds a row to the buffer."""
+
+        self.buffer.write('\t'.join(map(self.format, values)))
+        self.buffer.write('\n')
+        self.buffered += 1
+
+        if self.buffered >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        """Sends the buffered rows to the database."""
+
+        if not self.buffered:
+            return
+
+        for parent in self.parents:
+            parent.flush()
+
+        self.buffer.seek(0)
+        self.cursor.copy_expert(
+            'COPY {} ({}) FROM STDIN'.format(
+                connection.ops.quote_name(self.table),
+                ', '.join(connection.ops.quote_name(column) for column in self.columns)
+            ),
+            self.buffer
+        )
+
+        self.written += self.buffered
+        self.buffer = io.StringIO()
+        self.buffered = 0
+
+    @staticmethod
+    def format(value):
+        """Returns the COPY text representation of a value."""
+
+        if value is None:
+            return '\\N'
+
+        if value is True:
+            return 't'
+
+        if value is False:
+            return 'f'
+
+        if isinstance(value, str):
+            return value.replace('\\', '\\\\').replace('\t', '\\t').replace('\n', '\\n')
+
+        if hasattr(value, 'isoformat'):
+            return value.isoformat()
+
+        return str(value)
+
+
+class Command(BaseCommand):
+    """Generate dataset command
+
+    Fills the database with users, circles, memberships, invitations,
+    rides and qualifications at production-like volumes. Circle
+    popularity and ride demand follow Zipf distributions, so a few
+    circles and rides concentrate most of the activity.
+    Stats counters are computed while generating, so the data is
+    consistent with what the API would have produced.
+    """
+
+    help = 'Generates a synthetic production-scale dataset using COPY.'
+
+    def add_arguments(self, parser):
+        """Declares the volumes and distributions that can be configured."""
+
+        parser.add_argument('--users', type=int, default=10000)
+        parser.add_argument('--circles', type=int, default=100)
+        parser.add_argument('--rides', type=int, default=50000)
+        parser.add_argument(
+            '--invitations', type=int, default=20000,
+            help='Number of unused invitations, used ones come from the memberships.'
+        )
+        parser.add_argument(
+            '--memberships-per-user', type=float, default=1.5,
+            help='Average number of circles each user belongs to.'
+        )
+        parser.add_argument(
+            '--invited-ratio', type=float, default=0.6,
+            help='Fraction of the memberships that were created from an invitation.'
+        )
+        parser.add_argument(
+            '--circle-skew', type=float, default=1.1,
+            help='Zipf exponent of circle popularity, greater means hotter circles.'
+        )
+        parser.add_argument(
+            '--ride-skew', type=float, default=1.5,
+            help='Zipf exponent of ride demand, greater means fewer popular rides.'
+        )
+        parser.add_argument(
+            '--rated-ratio', type=float, default=0.7,
+            help='Fraction of the passengers of finished rides that gave a qualification.'
+        )
+        parser.add_argument(
+            '--password', default='cride12345678',
+            help='Password shared by every generated user.'
+        )
+        parser.add_argument('--batch-size', type=int, default=50000)
+        parser.add_argument('--seed', type=int, default=None)
+
+    def handle(self, *args, **options):
+        """Generates every table in dependency order."""
+
+        if connection.vendor != 'postgresql':
+            raise CommandError('The dataset generator relies on PostgreSQL COPY.')
+
+        if options['users'] < 2 or options['circles'] < 1:
+            raise CommandError('At least two users and one circle are required.')
+
+        self.options = options
+        self.random = random.Random(options['seed'])
+        self.now = timezone.now()
+
+        self.circle_stats = Counter()
+        self.membership_stats = Counter()
+        self.profile_stats = Counter()
+
+        with connection.cursor() as cursor:
+            self.cursor = cursor
+
+            users = self.generate_users()
+            circles = self.generate_circles()
+            members = self.generate_memberships(users, circles)
+            self.generate_invitations(members)
+            self.generate_rides(members)
+            self.write_memberships()
+            self.write_profiles(users)
+            self.update_circles()
+
+            for sql in connection.ops.sequence_reset_sql(
+                no_style(),
+                [User, Profile, Circle, Membership, Invitation, Ride, Qualification]
+            ):
+                cursor.execute(sql)
+
+    def writer(self, model, columns, parents=()):
+        """Returns a table writer for the model."""
+
+        return TableWriter(
+            self.cursor,
+            model._meta.db_table,
+            columns,
+            self.options['batch_size'],
+            parents
+        )
+
+    def first_id(self, model):
+        """Returns the first id that is free in the model's table."""
+
+        return (model.objects.aggregate(last=Max('id'))['last'] or 0) + 1
+
+    def report(self, name, writer):
+        """Flushes the writer and reports how many rows were loaded."""
+
+        writer.flush()
+        self.stdout.write(f'{name}: {writer.written} rows')
+
+    def past_date(self, days):
+        """Returns a random datetime within the last days."""
+
+        return self.now - timedelta(seconds=self.random.randint(0, days * 24 * 60 * 60))
+
+    def generate_users(self):
+        """Loads the users, returns their ids."""
+
+        password = make_password(self.options['password'])
+        first_id = self.first_id(User)
+        users = range(first_id, first_id + self.options['users'])
+
+        writer = self.writer(User, (
+            'id', 'password', 'is_superuser', 'username', 'first_name', 'last_name',
+            'email', 'is_staff', 'is_active', 'date_joined', 'created', 'modified',
+            'phone_number', 'is_client', 'is_verified',
+        ))
+
+        for user in users:
+            joined = self.past_date(365)
+            writer.write(
+                user, password, False, f'user{user}',
+                self.random.choice(FIRST_NAMES), self.random.choice(LAST_NAMES),
+                f'user{user}@example.com', False, True, joined, joined, joined,
+                f'+52{self.random.randint(10 ** 9, 10 ** 10 - 1)}', True, True,
+            )
+
+        self.report('Users', writer)
+        return users
+
+    def generate_circles(self):
+        """Loads the circles with empty stats, returns their ids by popularity."""
+
+        first_id = self.first_id(Circle)
+        circles = range(first_id, first_id + self.options['circles'])
+
+        writer = self.writer(Circle, (
+            'id', 'name', 'slug_name', 'about', 'picture_upload', 'rides_offered', 'rides_taken',
+            'is_verified', 'is_public', 'is_limited', 'members_limit', 'created', 'modified',
+        ))
+
+        for circle in circles:
+            created = self.past_date(730)
+            writer.write(
+                circle, f'Circle {circle}', f'circle-{circle}', f'Synthetic circle number {circle}.', '',
+                0, 0, self.random.random() < 0.2, self.random.random() < 0.9,
+                False, 0, created, created,
+            )
+
+        self.report('Circles', writer)
+        return circles
+
+    def generate_memberships(self, users, circles):
+        """Distributes the users among the circles.
+
+        Memberships are kept in memory and written after the rides,
+        once their stats are known. Returns the members of every
+        non empty circle, ordered by circle popularity.
+        """
+
+        weights = zipf_weights(len(circles), self.options['circle_skew'])
+        extra_memberships = max(self.options['memberships_per_user'] - 1, 0)
+
+        members = {circle: [] for circle in circles}
+        self.memberships = []
+
+        invitations = self.writer(Invitation, (
+            'code', 'issued_by_id', 'used_by_id', 'circle_id', 'used', 'used_at', 'created', 'modified',
+        ))
+
+        for user in users:
+            amount = 1
+            if extra_memberships:
+                amount += int(self.random.expovariate(1 / extra_memberships))
+            amount = min(amount, len(circles))
+
+            chosen = set()
+            while len(chosen) < amount:
+                chosen.update(self.random.choices(circles, cum_weights=weights, k=amount - len(chosen)))
+
+            for circle in chosen:
+                circle_members = members[circle]
+                joined = self.past_date(365)
+                invited_by = None
+
+                if circle_members and self.random.random() < self.options['invited_ratio']:
+                    invited_by = self.random.choice(circle_members)
+                    self.membership_stats[(invited_by, circle, 'used_invitations')] += 1
+                    invitations.write(
+                        self.invitation_code(), invited_by, user, circle,
+                        True, joined, joined, joined,
+                    )
+
+                self.memberships.append((user, circle, not circle_members, invited_by, joined))
+                circle_members.append(user)
+
+        self.report('Used invitations', invitations)
+
+        return {circle: users for circle, users in members.items() if users}
+
+    def generate_invitations(self, members):
+        """Loads the unused invitations, issued mostly in popular circles."""
+
+        circles = list(members)
+        weights = zipf_weights(len(circles), self.options['circle_skew'])
+
+        writer = self.writer(Invitation, (
+            'code', 'issued_by_id', 'circle_id', 'used', 'created', 'modified',
+        ))
+
+        for index in self.random.choices(range(len(circles)), cum_weights=weights, k=self.options['invitations']):
+            created = self.past_date(90)
+            writer.write(
+                self.invitation_code(), self.random.choice(members[circles[index]]), circles[index],
+                False, created, created,
+            )
+
+        self.report('Unused invitations', writer)
+
+    def invitation_code(self):
+        """Returns a random invitation code."""
+
+        return ''.join(self.random.choices(ascii_letters + digits, k=Invitation._meta.get_field('code').max_length))
+
+    def generate_rides(self, members):
+        """Loads rides with their passengers and qualifications.
+
+        Rides are offered mostly in popular circles and the number
+        of passengers of each ride follows a Zipf distribution.
+        """
+
+        circles = list(members)
+        circle_weights = zipf_weights(len(circles), self.options['circle_skew'])
+        demand_weights = zipf_weights(10, self.options['ride_skew'])
+
+        first_ride = self.first_id(Ride)
+        first_qualification = self.first_id(Qualification)
+
+        rides = self.writer(Ride, (
+            'id', 'offered_by_id', 'offered_in_id', 'available_seats', 'comments',
+            'departure_location', 'departure_date', 'arrival_location', 'arrival_date',
+            'is_active', 'created', 'modified',
+        ))
+        passengers = self.writer(Ride.passengers.through, ('ride_id', 'user_id'), parents=(rides,))
+        qualifications = self.writer(Qualification, ('id', 'user_id', 'score', 'created', 'modified'))
+        ratings = self.writer(Ride.rating.through, ('ride_id', 'qualification_id'), parents=(rides, qualifications))
+
+        qualification = first_qualification
+
+        for ride in range(first_ride, first_ride + self.options['rides']):
+            index = self.random.choices(range(len(circles)), cum_weights=circle_weights)[0]
+            circle = circles[index]
+            candidates = members[circle]
+
+            driver = self.random.choice(candidates)
+            seats = self.random.randint(1, 6)
+            demand = self.random.choices(range(10), cum_weights=demand_weights)[0]
+            taken = min(demand, seats, len(candidates) - 1)
+            riders = [user for user in self.random.sample(candidates, taken + 1) if user != driver][:taken]
+
+            departure = self.now + timedelta(minutes=self.random.randint(-180 * 24 * 60, 14 * 24 * 60))
+            arrival = departure + timedelta(minutes=self.random.randint(15, 180))
+            finished = arrival < self.now
+            created = departure - timedelta(hours=self.random.randint(1, 72))
+
+            rides.write(
+                ride, driver, circle, seats - taken, '',
+                self.random.choice(LOCATIONS), departure, self.random.choice(LOCATIONS), arrival,
+                not finished, created, created,
+            )
+
+            self.circle_stats[(circle, 'rides_offered')] += 1
+            self.membership_stats[(driver, circle, 'rides_offered')] += 1
+            self.profile_stats[(driver, 'rides_offered')] += 1
+
+            for rider in riders:
+                score = 0
+                if finished and self.random.random() < self.options['rated_ratio']:
+                    score = round(self.random.uniform(3, 5), 1)
+
+                passengers.write(ride, rider)
+                qualifications.write(qualification, rider, score, created, created)
+                ratings.write(ride, qualification)
+                qualification += 1
+
+                self.circle_stats[(circle, 'rides_taken')] += 1
+                self.membership_stats[(rider, circle, 'rides_taken')] += 1
+                self.profile_stats[(rider, 'rides_taken')] += 1
+
+        self.report('Rides', rides)
+        self.report('Passengers', passengers)
+        self.report('Qualifications', qualifications)
+        self.report('Ratings', ratings)
+
+    def write_memberships(self):
+        """Loads the memberships with their final stats."""
+
+        writer = self.writer(Membership, (
+            'user_id', 'circle_id', 'is_admin', 'used_invitations', 'remaining_invitations',
+            'invited_by_id', 'rides_taken', 'rides_offered', 'is_active', 'created', 'modified',
+        ))
+        stats = self.membership_stats
+
+        for user, circle, is_admin, invited_by, joined in self.memberships:
+            writer.write(
+                user, circle, is_admin,
+                stats[(user, circle, 'used_invitations')], self.random.randint(0, 5), invited_by,
+                stats[(user, circle, 'rides_taken')], stats[(user, circle, 'rides_offered')],
+                True, joined, joined,
+            )
+
+        self.report('Memberships', writer)
+
+    def write_profiles(self, users):
+        """Loads the profiles with their final stats."""
+
+        writer = self.writer(Profile, (
+            'user_id', 'biography', 'picture_upload', 'rides_taken', 'rides_offered', 'reputation',
+            'created', 'modified',
+        ))
+        stats = self.profile_stats
+
+        for user in users:
+            writer.write(
+                user, '', '', stats[(user, 'rides_taken')], stats[(user, 'rides_offered')],
+                round(self.random.uniform(3.5, 5), 2), self.now, self.now,
+            )
+
+        self.report('Profiles', writer)
+
+    def update_circles(self):
+        """Sets the circle stats computed while generating the rides."""
+
+        circles = {circle for circle, stat in self.circle_stats}
+        values = [
+            (circle, self.circle_stats[(circle, 'rides_offered')], self.circle_stats[(circle, 'rides_taken')])
+            for circle in circles
+        ]
+
+        execute_values(
+            self.cursor,
+            'UPDATE {table} SET rides_offered = stats.offered, rides_taken = stats.taken '
+            'FROM (VALUES %s) AS stats (id, offered, taken) '
+            'WHERE {table}.id = stats.id'.format(table=Circle._meta.db_table),
+            values,
+            page_size=self.options['batch_size']
+        )
+
+        self.stdout.write(f'Circle stats: {len(values)} rows')
@@ -0,0 +1,50 @@
+# Generated by Django 2.0.9 on 2026-10-19 14:49
+
+from django.conf import settings
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('circles', '0003_invitation'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('rides', '0002_auto_20190413_2020'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RideTemplate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date Time on which the object was created.')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date Time on which the object was last modified.')),
+                ('weekdays', models.CharField(help_text='Days the ride is offered, 0 is Monday and 6 is Sunday, e.g. 01234.', max_length=7, validators=[django.core.validators.RegexValidator('^[0-6]{1,7}$', 'Weekdays must be digits from 0 (Monday) to 6 (Sunday).')])),
+                ('departure_time', models.TimeField()),
+                ('duration', models.DurationField(help_text='Time between the departure and the arrival.')),
+                ('available_seats', models.PositiveSmallIntegerField(default=1)),
+                ('comments', models.TextField(blank=True)),
+                ('departure_location', models.CharField(max_length=255)),
+                ('arrival_location', models.CharField(max_length=255)),
+                ('materialized_until', models.DateField(blank=True, help_text='Last day whose ride was already created.', null=True)),
+                ('is_active', models.BooleanField(default=True, help_text='Inactive templates stop offering new rides.', verbose_name='active status')),
+                ('offered_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ride_templates', to=settings.AUTH_USER_MODEL)),
+                ('offered_in', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='ride_templates', to='circles.Circle')),
+            ],
+            options={
+                'ordering': ['-created', '-modified'],
+                'abstract': False,
+            },
+        ),
+        migrations.AddField(
+            model_name='ride',
+            name='template',
+            field=models.ForeignKey(blank=True, help_text='Template the ride was materialized from, if any.', null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='rides', to='rides.RideTemplate'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='ride',
+            unique_together={('template', 'departure_date')},
+        ),
+    ]
@@ -0,0 +1,35 @@
+# Generated by Django 2.0.9 on 2026-10-19 14:52
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('rides', '0003_ride_templates'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='WaitlistEntry',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created', models.DateTimeField(auto_now_add=True, help_text='Date Time on which the object was created.')),
+                ('modified', models.DateTimeField(auto_now=True, help_text='Date Time on which the object was last modified.')),
+                ('ride', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist', to='rides.Ride')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='waitlist_entries', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'verbose_name_plural': 'waitlist entries',
+                'ordering': ['pk'],
+                'abstract': False,
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='waitlistentry',
+            unique_together={('ride', 'user')},
+        ),
+    ]
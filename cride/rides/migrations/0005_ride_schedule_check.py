@@ -0,0 +1,21 @@
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    """Rides arrive after they depart.
+
+    NOT VALID skips scanning the existing rides while the table is
+    locked, only new and updated rows are checked.
+    """
+
+    dependencies = [
+        ('rides', '0004_waitlists'),
+    ]
+
+    operations = [
+        migrations.RunSQL(
+            sql='ALTER TABLE rides_ride ADD CONSTRAINT rides_ride_arrival_after_departure '
+                'CHECK (arrival_date > departure_date) NOT VALID',
+            reverse_sql='ALTER TABLE rides_ride DROP CONSTRAINT rides_ride_arrival_after_departure',
+        ),
+    ]
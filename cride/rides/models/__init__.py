@@ -1,2 +1,4 @@
 from .rides import Ride
 from .qualifications import Qualification
+from .templates import RideTemplate
+from .waitlists import WaitlistEntry
@@ -26,12 +26,27 @@ class Ride(CRideModel):
 
     rating = models.ManyToManyField(Qualification, related_name='rating')
 
+    template = models.ForeignKey(
+        'rides.RideTemplate',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='rides',
+        help_text='Template the ride was materialized from, if any.'
+    )
+
     is_active = models.BooleanField(
         'active status',
         default=True,
         help_text='Used for disabling the ride or marking it as finished.'
     )
 
+    class Meta(CRideModel.Meta):
+        """Meta attributes."""
+
+        # A template offers a single ride per departure.
+        unique_together = ('template', 'departure_date')
+
     def __str__(self):
         """Return ride details."""
         return '{_from} to {to} | {day} {i_time} - {f_time}'.format(
@@ -0,0 +1,60 @@
+"""Ride templates models."""
+
+# Django
+from django.core.validators import RegexValidator
+from django.db import models
+
+# Utilities
+from cride.utils.models import CRideModel
+
+
+class RideTemplate(CRideModel):
+    """Ride template model.
+
+    Commute offered every week on the same days and time. The rides
+    of the next days are materialized from it by a periodic task.
+    """
+
+    offered_by = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='ride_templates')
+    offered_in = models.ForeignKey('circles.Circle', on_delete=models.CASCADE, related_name='ride_templates')
+
+    weekdays = models.CharField(
+        max_length=7,
+        validators=[RegexValidator(r'^[0-6]{1,7}$', 'Weekdays must be digits from 0 (Monday) to 6 (Sunday).')],
+        help_text='Days the ride is offered, 0 is Monday and 6 is Sunday, e.g. 01234.'
+    )
+    departure_time = models.TimeField()
+    duration = models.DurationField(help_text='Time between the departure and the arrival.')
+
+    available_seats = models.PositiveSmallIntegerField(default=1)
+    comments = models.TextField(blank=True)
+
+    departure_location = models.CharField(max_length=255)
+    arrival_location = models.CharField(max_length=255)
+
+    materialized_until = models.DateField(
+        null=True,
+        blank=True,
+        help_text='Last day whose ride was already created.'
+    )
+
+    is_active = models.BooleanField(
+        'active status',
+        default=True,
+        help_text='Inactive templates stop offering new rides.'
+    )
+
+    @property
+    def weekday_set(self):
+        """Returns the days the ride is offered as integers."""
+
+        return {int(day) for day in self.weekdays}
+
+    def __str__(self):
+        """Return template details."""
+        return '{_from} to {to} | {days} {time}'.format(
+            _from=self.departure_location,
+            to=self.arrival_location,
+            days=self.weekdays,
+            time=self.departure_time.strftime('%I:%M %p'),
+        )
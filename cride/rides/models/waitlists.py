@@ -0,0 +1,30 @@
+"""Waitlists models."""
+
+# Django
+from django.db import models
+
+# Utilities
+from cride.utils.models import CRideModel
+
+
+class WaitlistEntry(CRideModel):
+    """Waitlist entry model.
+
+    Rider waiting for a seat of a full ride. Entries are served
+    in the order they were created, when a passenger leaves.
+    """
+
+    ride = models.ForeignKey('rides.Ride', on_delete=models.CASCADE, related_name='waitlist')
+    user = models.ForeignKey('users.User', on_delete=models.CASCADE, related_name='waitlist_entries')
+
+    class Meta(CRideModel.Meta):
+        """Meta attributes."""
+
+        ordering = ['pk']
+        unique_together = ('ride', 'user')
+        verbose_name_plural = 'waitlist entries'
+
+    def __str__(self):
+        """Returns object string representation."""
+
+        return f'{self.user} waiting for {self.ride_id}'
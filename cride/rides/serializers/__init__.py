@@ -1,5 +1,6 @@
 from .rides import (
     CreateRideSerializer,
+    BulkCreateRideSerializer,
     RideModelSerializer,
     JoinRideSerializer,
     EndRideSerializer,
@@ -9,3 +10,12 @@ from .rides import (
 from .qualifications import (
     QualificationModelSerializer
 )
+
+from .templates import (
+    RideTemplateModelSerializer
+)
+
+from .waitlists import (
+    WaitlistSerializer,
+    LeaveRideSerializer
+)
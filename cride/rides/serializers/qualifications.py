@@ -8,12 +8,15 @@ from cride.rides.models import Qualification
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import SparseFieldsMixin
 
 
-class QualificationModelSerializer(serializers.ModelSerializer):
+class QualificationModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
 
     user = UserModelSerializer()
 
+    expandable_fields = {'user': 'username'}
+
     class Meta:
         """Metadata class."""
 
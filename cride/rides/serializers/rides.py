@@ -1,16 +1,20 @@
-
 """Rides Model Related Serializers."""
 
+# Django
+from django.conf import settings
+from django.db.models import F
+
 # Django REST Framework
 from rest_framework import serializers
+from rest_framework.settings import api_settings
 
 # Models
 from cride.rides.models import (
     Ride,
     Qualification
 )
-from cride.circles.models import Membership
-from cride.users.models import User
+from cride.circles.models import Circle, Membership
+from cride.users.models import User, Profile
 
 # Utilities
 from django.utils import timezone
@@ -18,10 +22,24 @@ from datetime import timedelta
 
 # Serializers
 from cride.users.serializers import UserModelSerializer
+from cride.utils.serializers import SparseFieldsMixin, constraint_errors
 from .qualifications import QualificationModelSerializer
+from .waitlists import add_rides_taken
+
+# Metrics
+from cride.utils.metrics import RIDES_CREATED, RIDE_JOINS
+
+# Events
+from cride.rides import events
+
 
+SCHEDULE_ERROR = 'Departure date must be after arrival date.'
+SCHEDULE_CONSTRAINT_ERRORS = {
+    'rides_ride_arrival_after_departure': {api_settings.NON_FIELD_ERRORS_KEY: [SCHEDULE_ERROR]},
+}
 
-class RideModelSerializer(serializers.ModelSerializer):
+
+class RideModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Ride Model Serializer."""
 
     offered_by = UserModelSerializer(read_only=True)
@@ -31,6 +49,12 @@ class RideModelSerializer(serializers.ModelSerializer):
 
     rating = QualificationModelSerializer(read_only=True, many=True)
 
+    expandable_fields = {
+        'offered_by': 'username',
+        'passengers': 'username',
+        'rating': 'pk',
+    }
+
     class Meta:
         """Metadata class."""
 
@@ -40,7 +64,7 @@ class RideModelSerializer(serializers.ModelSerializer):
 
         read_only_fields = (
             'rating', 'offered_by',
-            'offered_in'
+            'offered_in', 'template'
         )
 
     def update(self, instance, validated_data):
@@ -51,7 +75,8 @@ class RideModelSerializer(serializers.ModelSerializer):
         if instance.departure_date <= now:
             raise serializers.ValidationError('On going rides can not be updated.')
 
-        return super(RideModelSerializer, self).update(instance, validated_data)
+        with constraint_errors(SCHEDULE_CONSTRAINT_ERRORS, savepoint=False):
+            return super(RideModelSerializer, self).update(instance, validated_data)
 
 
 class CreateRideSerializer(serializers.ModelSerializer):
@@ -70,7 +95,8 @@ class CreateRideSerializer(serializers.ModelSerializer):
 
         exclude = (
             'rating', 'passengers',
-            'is_active', 'offered_in'
+            'is_active', 'offered_in',
+            'template'
         )
 
     def validate_departure_date(self, departure_date):
@@ -88,15 +114,13 @@ class CreateRideSerializer(serializers.ModelSerializer):
     def validate(self, data):
         """Validate
 
-        Verify that the person who offers the ride is member,
-        the same user making the request
-        and also the departure_date is'nt less than arrival_date.
+        Verify that the person who offers the ride is member
+        and the same user making the request. The arrival_date
+        being after the departure_date is checked by the database.
         """
 
         user = data['offered_by']
         circle = self.context['circle']
-        arrival_date = data['arrival_date']
-        departure_date = data['departure_date']
 
         # Validates user is member of the circle
         try:
@@ -117,11 +141,6 @@ class CreateRideSerializer(serializers.ModelSerializer):
         if self.context['request'].user != user:
             raise serializers.ValidationError('Rides offered on behalf of others are not allowed.')
 
-        # Validates the dates.
-
-        if arrival_date <= departure_date:
-            raise serializers.ValidationError('Departure date must be after arrival date.')
-
         return data
 
     def create(self, validated_data):
@@ -131,10 +150,12 @@ class CreateRideSerializer(serializers.ModelSerializer):
         membership = self.context['membership']
         profile = validated_data['offered_by'].profile
 
-        ride = Ride.objects.create(
-            offered_in=circle,
-            **validated_data
-        )
+        # The action is atomic, a violation rolls it back anyway.
+        with constraint_errors(SCHEDULE_CONSTRAINT_ERRORS, savepoint=False):
+            ride = Ride.objects.create(
+                offered_in=circle,
+                **validated_data
+            )
 
         # Updating data
         circle.rides_offered += 1
@@ -146,9 +167,102 @@ class CreateRideSerializer(serializers.ModelSerializer):
         profile.rides_offered += 1
         profile.save()
 
+        RIDES_CREATED.inc()
+        events.ride_created(ride)
+
         return ride
 
 
+class BulkRideItemSerializer(CreateRideSerializer):
+    """Validates a ride of a bulk creation.
+
+    Membership and ownership are verified once for the whole
+    batch by BulkCreateRideSerializer.
+    """
+
+    def validate(self, data):
+        """Verifies the dates only.
+
+        A single ride violating the database check would fail the whole
+        insert, so the invalid ones are singled out here.
+        """
+
+        if data['arrival_date'] <= data['departure_date']:
+            raise serializers.ValidationError(SCHEDULE_ERROR)
+
+        return data
+
+
+class BulkCreateRideSerializer(serializers.Serializer):
+    """Handles offering several rides at once.
+
+    Every ride is validated on its own, the invalid ones are reported
+    in item_errors with their index and the rest are created with a
+    single insert and a single counters update per table.
+    """
+
+    offered_by = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+    rides = serializers.ListField(
+        child=serializers.DictField(),
+        min_length=1,
+        max_length=settings.RIDES_BULK_CREATE_MAX
+    )
+
+    def validate_offered_by(self, user):
+        """Verifies the user is an active member of the circle."""
+
+        circle = self.context['circle']
+
+        try:
+            self.context['membership'] = Membership.objects.get(user=user, circle=circle, is_active=True)
+        except Membership.DoesNotExist:
+            raise serializers.ValidationError(f'This user is not a member of the circle {circle.name}')
+
+        return user
+
+    def validate(self, data):
+        """Validates every ride, fails only when none of them is valid."""
+
+        self.item_errors = []
+        data['valid_rides'] = []
+
+        for index, ride in enumerate(data['rides']):
+            serializer = BulkRideItemSerializer(data=ride, context=self.context)
+
+            if serializer.is_valid():
+                data['valid_rides'].append(serializer.validated_data)
+            else:
+                self.item_errors.append({'index': index, 'errors': serializer.errors})
+
+        if not data['valid_rides']:
+            raise serializers.ValidationError({'rides': self.item_errors})
+
+        return data
+
+    def create(self, validated_data):
+        """Inserts the rides and adds them to the counters."""
+
+        circle = self.context['circle']
+        membership = self.context['membership']
+        user = validated_data['offered_by']
+
+        rides = Ride.objects.bulk_create([
+            Ride(offered_in=circle, **ride) for ride in validated_data['valid_rides']
+        ])
+        amount = len(rides)
+
+        Circle.objects.filter(pk=circle.pk).update(rides_offered=F('rides_offered') + amount)
+        Membership.objects.filter(pk=membership.pk).update(rides_offered=F('rides_offered') + amount)
+        Profile.objects.filter(user=user).update(rides_offered=F('rides_offered') + amount)
+
+        RIDES_CREATED.inc(amount)
+        for ride in rides:
+            events.ride_created(ride)
+
+        return rides
+
+
 class JoinRideSerializer(serializers.ModelSerializer):
     """Handles validating data and joining to a ride."""
 
@@ -191,7 +305,7 @@ class JoinRideSerializer(serializers.ModelSerializer):
             raise serializers.ValidationError('You are already in this ride.')
 
         if ride.available_seats < 1:
-            raise serializers.ValidationError('This ride has not available seats.')
+            raise serializers.ValidationError('This ride has not available seats, join its waitlist instead.')
 
         if not ride.is_active:
             raise serializers.ValidationError('This ride has already ended.')
@@ -206,29 +320,18 @@ class JoinRideSerializer(serializers.ModelSerializer):
 
         ride = self.context['ride']
         user = self.context['user']
-        profile = user.profile
         circle = self.context['circle']
-        membership = self.context['membership']
 
         ride.passengers.add(user)
+        ride.waitlist.filter(user=user).delete()
 
         # Updating stats
+        Ride.objects.filter(pk=ride.pk).update(available_seats=F('available_seats') - 1)
+        add_rides_taken(user, circle, 1)
+        ride.refresh_from_db()
 
-        # Ride
-        ride.available_seats -= 1
-        ride.save()
-
-        # Profile
-        profile.rides_taken += 1
-        profile.save()
-
-        # Circle
-        circle.rides_taken += 1
-        circle.save()
-
-        # Membership
-        membership.rides_taken += 1
-        membership.save()
+        RIDE_JOINS.inc()
+        events.seats_changed(ride)
 
         return ride
 
@@ -268,6 +371,14 @@ class EndRideSerializer(serializers.ModelSerializer):
 
         return current_time
 
+    def update(self, instance, validated_data):
+        """Finishes the ride and notifies its streams."""
+
+        ride = super(EndRideSerializer, self).update(instance, validated_data)
+        events.ride_finished(ride)
+
+        return ride
+
 
 class QualifyRideSerializer(serializers.Serializer):
 
@@ -0,0 +1,62 @@
+"""Ride templates serializers."""
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from cride.rides.models import RideTemplate
+from cride.circles.models import Membership
+
+
+class RideTemplateModelSerializer(serializers.ModelSerializer):
+    """Ride template model serializer."""
+
+    offered_by = serializers.HiddenField(
+        default=serializers.CurrentUserDefault()
+    )
+
+    available_seats = serializers.IntegerField(min_value=1, max_value=10)
+
+    class Meta:
+        """Metadata class."""
+
+        model = RideTemplate
+
+        exclude = ('offered_in', 'created', 'modified')
+
+        read_only_fields = ('materialized_until',)
+
+    def validate_weekdays(self, weekdays):
+        """Returns the days sorted and without repetitions."""
+
+        return ''.join(sorted(set(weekdays)))
+
+    def validate_duration(self, duration):
+        """Verifies the arrival is after the departure."""
+
+        if duration.total_seconds() <= 0:
+            raise serializers.ValidationError('Duration must be greater than zero.')
+
+        return duration
+
+    def validate(self, data):
+        """Verifies the driver is an active member of the circle."""
+
+        circle = self.context['circle']
+
+        if self.instance is None and not Membership.objects.filter(
+            user=data['offered_by'],
+            circle=circle,
+            is_active=True
+        ).exists():
+            raise serializers.ValidationError(f'This user is not a member of the circle {circle.name}')
+
+        return data
+
+    def create(self, validated_data):
+        """Creates the template in the circle of the request."""
+
+        return RideTemplate.objects.create(
+            offered_in=self.context['circle'],
+            **validated_data
+        )
@@ -0,0 +1,149 @@
+"""Waitlists serializers."""
+
+# Django
+from django.db.models import F
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Models
+from cride.rides.models import Ride, Qualification, WaitlistEntry
+from cride.circles.models import Circle, Membership
+from cride.users.models import Profile
+
+# Events
+from cride.rides import events
+
+# Utilities
+from django.utils import timezone
+from datetime import timedelta
+
+
+def add_rides_taken(user, circle, amount):
+    """Adds amount to the rides taken counters of the user, its membership and the circle."""
+
+    Profile.objects.filter(user=user).update(rides_taken=F('rides_taken') + amount)
+    Circle.objects.filter(pk=circle.pk).update(rides_taken=F('rides_taken') + amount)
+    Membership.objects.filter(
+        user=user,
+        circle=circle,
+        is_active=True
+    ).update(rides_taken=F('rides_taken') + amount)
+
+
+def validate_upcoming(ride):
+    """Verifies the ride can still change its passengers."""
+
+    if not ride.is_active:
+        raise serializers.ValidationError('This ride has already ended.')
+
+    if ride.departure_date <= timezone.now() + timedelta(minutes=10):
+        raise serializers.ValidationError('This ride is on going.')
+
+
+class WaitlistSerializer(serializers.Serializer):
+    """Handles queueing the request user for a seat of a full ride."""
+
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+    def validate(self, data):
+        """Verifies the ride is full and the user is not in it yet."""
+
+        ride = self.context['ride']
+        user = data['user']
+
+        validate_upcoming(ride)
+
+        if ride.available_seats > 0:
+            raise serializers.ValidationError('This ride has available seats, join it instead.')
+
+        if ride.passengers.filter(pk=user.pk).exists():
+            raise serializers.ValidationError('You are already in this ride.')
+
+        if ride.waitlist.filter(user=user).exists():
+            raise serializers.ValidationError('You are already in the waitlist of this ride.')
+
+        return data
+
+    def create(self, validated_data):
+        """Adds the user at the end of the waitlist."""
+
+        return WaitlistEntry.objects.create(
+            ride=self.context['ride'],
+            user=validated_data['user']
+        )
+
+    def to_representation(self, entry):
+        """Returns the place of the user in the waitlist."""
+
+        return {
+            'ride': entry.ride_id,
+            'position': entry.ride.waitlist.filter(pk__lte=entry.pk).count(),
+        }
+
+
+class LeaveRideSerializer(serializers.Serializer):
+    """Handles leaving a ride and giving the seat to the waitlist."""
+
+    user = serializers.HiddenField(default=serializers.CurrentUserDefault())
+
+    def validate(self, data):
+        """Verifies the user is a passenger of an upcoming ride."""
+
+        ride = self.context['ride']
+
+        validate_upcoming(ride)
+
+        if not ride.passengers.filter(pk=data['user'].pk).exists():
+            raise serializers.ValidationError('You are not in this ride.')
+
+        return data
+
+    def save(self, **kwargs):
+        """Removes the passenger and promotes the first rider of the waitlist.
+
+        The view locked the ride row before validating, so concurrent
+        leaves and joins see the passengers and seats one at a time.
+        """
+
+        user = self.validated_data['user']
+        circle = self.context['circle']
+        ride = self.context['ride']
+
+        ride.passengers.remove(user)
+        qualifications = list(ride.rating.filter(user=user))
+        ride.rating.remove(*qualifications)
+        Qualification.objects.filter(pk__in=[qualification.pk for qualification in qualifications]).delete()
+        add_rides_taken(user, circle, -1)
+
+        if self.promote(ride, circle) is None:
+            Ride.objects.filter(pk=ride.pk).update(available_seats=F('available_seats') + 1)
+
+        ride.refresh_from_db()
+        events.seats_changed(ride)
+
+        return ride
+
+    def promote(self, ride, circle):
+        """Gives the seat to the first waitlisted rider that is still a member.
+
+        Riders that took a seat meanwhile are skipped.
+        """
+
+        entry = ride.waitlist.select_related('user').first()
+
+        while entry is not None:
+            entry.delete()
+
+            is_member = Membership.objects.filter(user=entry.user, circle=circle, is_active=True).exists()
+
+            if is_member and not ride.passengers.filter(pk=entry.user_id).exists():
+                ride.passengers.add(entry.user)
+                ride.rating.add(Qualification.objects.create(user=entry.user))
+                add_rides_taken(entry.user, circle, 1)
+
+                return entry.user
+
+            entry = ride.waitlist.select_related('user').first()
+
+        return None
@@ -0,0 +1,194 @@
+"""Rides tasks."""
+
+# Django
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+
+# Celery
+from cride.taskapp.celery import app
+
+# Models
+from cride.users.models import Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride, RideTemplate
+
+# Counters
+from cride.rides.counters import COUNTERS, reconcile
+
+# Metrics
+from cride.utils.metrics import COUNTERS_CORRECTED, COUNTERS_DRIFT, RIDES_CREATED
+
+# Utilities
+import logging
+from collections import Counter
+from datetime import datetime, timedelta
+
+# psycopg2
+from psycopg2.extras import execute_values
+
+
+logger = logging.getLogger('cride.counters')
+
+
+def template_rides(template, first_day, last_day, earliest):
+    """Returns the unsaved rides of the template from first_day to last_day."""
+
+    rides = []
+    weekdays = template.weekday_set
+    day = first_day
+
+    while day <= last_day:
+        if day.weekday() in weekdays:
+            departure_date = timezone.make_aware(datetime.combine(day, template.departure_time), is_dst=False)
+
+            if departure_date >= earliest:
+                rides.append(Ride(
+                    offered_by_id=template.offered_by_id,
+                    offered_in_id=template.offered_in_id,
+                    template=template,
+                    available_seats=template.available_seats,
+                    comments=template.comments,
+                    departure_location=template.departure_location,
+                    departure_date=departure_date,
+                    arrival_location=template.arrival_location,
+                    arrival_date=departure_date + template.duration,
+                ))
+
+        day += timedelta(days=1)
+
+    return rides
+
+
+def insert_template_rides(template, rides):
+    """Inserts the rides of the template in its own savepoint.
+
+    Departures the template already has, offered by a run that
+    overlapped this one, are skipped. Returns the inserted rides.
+    """
+
+    if not rides:
+        return rides
+
+    try:
+        with transaction.atomic():
+            return Ride.objects.bulk_create(rides, batch_size=1000)
+    except IntegrityError:
+        existing = set(Ride.objects.filter(
+            template=template,
+            departure_date__in=[ride.departure_date for ride in rides]
+        ).values_list('departure_date', flat=True))
+
+        rides = [ride for ride in rides if ride.departure_date not in existing]
+        for ride in rides:
+            ride.pk = None
+
+        with transaction.atomic():
+            return Ride.objects.bulk_create(rides, batch_size=1000)
+
+
+def add_rides_offered(cursor, model, columns, counts, condition=''):
+    """Adds the counts to the rides_offered of the rows matching the columns."""
+
+    table = model._meta.db_table
+    matches = ' AND '.join(f'{table}.{column} = counts.{column}' for column in columns)
+
+    execute_values(
+        cursor,
+        f'UPDATE {table} SET rides_offered = {table}.rides_offered + counts.amount '
+        f'FROM (VALUES %s) AS counts ({", ".join(columns)}, amount) '
+        f'WHERE {matches}{condition}',
+        [(*key, amount) if isinstance(key, tuple) else (key, amount) for key, amount in counts.items()]
+    )
+
+
+@app.task
+def materialize_ride_templates(template_id=None):
+    """Creates the rides of every active template for the next days.
+
+    Only RIDE_TEMPLATES_WINDOW_DAYS days ahead are created, so the rides
+    table grows with the window and not with the age of the templates.
+    Rides are inserted in bulk, one savepoint per template, and the offered
+    rides counters of the circles, memberships and profiles are updated
+    with one query each. Given a template_id, only that template is
+    materialized.
+    """
+
+    today = timezone.localdate()
+    last_day = today + timedelta(days=settings.RIDE_TEMPLATES_WINDOW_DAYS)
+    earliest = timezone.now() + timedelta(minutes=30)
+
+    memberships = Membership.objects.filter(
+        user=OuterRef('offered_by'),
+        circle=OuterRef('offered_in'),
+        is_active=True
+    )
+    templates = RideTemplate.objects.annotate(
+        is_member=Exists(memberships)
+    ).filter(
+        Q(materialized_until__isnull=True) | Q(materialized_until__lt=last_day),
+        is_active=True,
+        is_member=True
+    )
+
+    if template_id is not None:
+        templates = templates.filter(pk=template_id)
+
+    with transaction.atomic():
+        templates = list(templates.select_for_update(skip_locked=True))
+        rides = []
+
+        for template in templates:
+            first_day = today
+
+            if template.materialized_until is not None:
+                first_day = max(today, template.materialized_until + timedelta(days=1))
+
+            rides.extend(insert_template_rides(template, template_rides(template, first_day, last_day, earliest)))
+
+        if rides:
+            circles = Counter(ride.offered_in_id for ride in rides)
+            members = Counter((ride.offered_by_id, ride.offered_in_id) for ride in rides)
+            users = Counter(ride.offered_by_id for ride in rides)
+
+            with connection.cursor() as cursor:
+                add_rides_offered(cursor, Circle, ('id',), circles)
+                add_rides_offered(
+                    cursor, Membership, ('user_id', 'circle_id'), members,
+                    condition=f' AND {Membership._meta.db_table}.is_active'
+                )
+                add_rides_offered(cursor, Profile, ('user_id',), users)
+
+        RideTemplate.objects.filter(
+            pk__in=[template.pk for template in templates]
+        ).update(materialized_until=last_day)
+
+    RIDES_CREATED.inc(len(rides))
+
+    return len(rides)
+
+
+@app.task(soft_time_limit=30 * 60, time_limit=35 * 60)
+def reconcile_counters():
+    """Recomputes the rides and invitations counters, fixing the drifted ones.
+
+    Returns the corrected rows by table.
+    """
+
+    corrected = {}
+
+    for counters in COUNTERS:
+        table = counters.model._meta.db_table
+        rows, drift = reconcile(counters, settings.COUNTERS_RECONCILE_BATCH_SIZE)
+
+        COUNTERS_CORRECTED.labels(table).inc(rows)
+        for field, amount in drift.items():
+            COUNTERS_DRIFT.labels(table, field).inc(amount)
+
+        if rows:
+            logger.warning('Corrected the counters of %s %s rows, drift: %s.', rows, table, drift)
+
+        corrected[table] = rows
+
+    return corrected
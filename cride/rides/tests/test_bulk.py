@@ -0,0 +1,126 @@
+"""Bulk ride creation tests."""
+
+# Django
+from django.test import TestCase
+from django.shortcuts import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from rest_framework.authtoken.models import Token
+
+# Utilities
+from datetime import timedelta
+
+
+class BulkRidesTestCase(TestCase):
+    """Manages testing of the bulk ride creation."""
+
+    def setUp(self):
+        """Creates a driver member of the circle."""
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.'
+        )
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='driver',
+            email='driver@example.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        Profile.objects.create(user=self.user)
+        self.membership = Membership.objects.create(user=self.user, circle=self.circle)
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = reverse('rides:ride-bulk', kwargs={'slug_name': self.circle.slug_name})
+
+    def ride(self, days, hours=1):
+        """Returns the data of a ride departing in some days."""
+
+        departure = timezone.now() + timedelta(days=days)
+
+        return {
+            'available_seats': 3,
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure.isoformat(),
+            'arrival_location': 'Polanco',
+            'arrival_date': (departure + timedelta(hours=hours)).isoformat(),
+        }
+
+    def test_valid_rides_are_created_and_invalid_reported(self):
+        """Valid rides are inserted and counted, invalid ones come back with their index."""
+
+        response = self.client.post(
+            self.url,
+            {'rides': [self.ride(1), self.ride(2, hours=-1), self.ride(3)]},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 207)
+        self.assertEqual(len(response.data['rides']), 2)
+        self.assertEqual([error['index'] for error in response.data['errors']], [1])
+        self.assertEqual(Ride.objects.filter(offered_in=self.circle).count(), 2)
+
+        self.circle.refresh_from_db()
+        self.membership.refresh_from_db()
+        self.assertEqual(self.circle.rides_offered, 2)
+        self.assertEqual(self.membership.rides_offered, 2)
+        self.assertEqual(Profile.objects.get(user=self.user).rides_offered, 2)
+
+    def test_nothing_valid_is_rejected(self):
+        """Batches without valid rides, or of non members, create nothing."""
+
+        response = self.client.post(self.url, {'rides': [self.ride(1, hours=-1)]}, format='json')
+        self.assertEqual(response.status_code, 400)
+
+        self.membership.is_active = False
+        self.membership.save()
+
+        response = self.client.post(self.url, {'rides': [self.ride(1)]}, format='json')
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Ride.objects.exists())
+
+    def test_single_ride_schedule_is_checked_by_the_database(self):
+        """Rides arriving before departing violate the constraint, reported as before."""
+
+        response = self.client.post(
+            reverse('rides:ride-list', kwargs={'slug_name': self.circle.slug_name}),
+            self.ride(1, hours=-1),
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'non_field_errors': ['Departure date must be after arrival date.']})
+        self.assertFalse(Ride.objects.exists())
+
+    def test_updated_schedule_is_checked_by_the_database(self):
+        """Updates moving the arrival before the departure are rejected too."""
+
+        departure = timezone.now() + timedelta(days=1)
+        ride = Ride.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Polanco',
+            arrival_date=departure + timedelta(hours=1)
+        )
+
+        response = self.client.patch(
+            reverse('rides:ride-detail', kwargs={'slug_name': self.circle.slug_name, 'pk': ride.pk}),
+            {'arrival_date': (departure - timedelta(hours=1)).isoformat()},
+            format='json'
+        )
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'non_field_errors': ['Departure date must be after arrival date.']})
@@ -0,0 +1,92 @@
+"""Counters reconciliation tests."""
+
+# Django
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Invitation, Membership
+from cride.rides.models import Ride
+
+# Tasks
+from cride.rides.tasks import reconcile_counters
+
+# Utilities
+from datetime import timedelta
+
+
+@override_settings(COUNTERS_RECONCILE_BATCH_SIZE=1)
+class ReconcileCountersTestCase(TestCase):
+    """Manages testing of the counters reconciliation."""
+
+    def setUp(self):
+        """Creates a driver and a passenger sharing a ride with drifted counters."""
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.',
+            rides_taken=7
+        )
+
+        self.users = []
+        for username in ('driver', 'rider'):
+            user = User.objects.create_user(
+                first_name='Francisco',
+                last_name='Ramirez',
+                username=username,
+                email=f'{username}@example.com',
+                password='cheke12345678cheke',
+                is_verified=True
+            )
+            Profile.objects.create(user=user, rides_offered=2)
+            Membership.objects.create(user=user, circle=self.circle)
+            self.users.append(user)
+
+        driver, rider = self.users
+        departure = timezone.now() + timedelta(days=1)
+
+        for _ in range(3):
+            ride = Ride.objects.create(
+                offered_by=driver,
+                offered_in=self.circle,
+                departure_location='Ciudad Universitaria',
+                departure_date=departure,
+                arrival_location='Polanco',
+                arrival_date=departure + timedelta(hours=1)
+            )
+        ride.passengers.add(rider)
+
+        Invitation.objects.create(issued_by=driver, circle=self.circle, used_by=rider, used=True)
+        Invitation.objects.create(issued_by=driver, circle=self.circle)
+
+    def test_drifted_counters_are_corrected(self):
+        """Only the rows that drifted are written, with the recomputed values."""
+
+        self.assertEqual(reconcile_counters(), {
+            'circles_circle': 1,
+            'circles_membership': 2,
+            'users_profile': 2,
+        })
+
+        self.assertEqual(
+            Circle.objects.values_list('rides_offered', 'rides_taken').get(),
+            (3, 1)
+        )
+        self.assertEqual(
+            list(Membership.objects.order_by('user_id').values_list(
+                'rides_offered', 'rides_taken', 'used_invitations'
+            )),
+            [(3, 0, 1), (0, 1, 0)]
+        )
+        self.assertEqual(
+            list(Profile.objects.order_by('user_id').values_list('rides_offered', 'rides_taken')),
+            [(3, 0), (0, 1)]
+        )
+
+        self.assertEqual(reconcile_counters(), {
+            'circles_circle': 0,
+            'circles_membership': 0,
+            'users_profile': 0,
+        })
@@ -0,0 +1,117 @@
+"""Rides events tests."""
+
+# Django
+from django.test import TransactionTestCase, override_settings
+from django.shortcuts import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from rest_framework.authtoken.models import Token
+
+# Events
+from cride.rides.events import ride_channel
+from cride.utils.events import get_broker
+
+# Utilities
+from datetime import timedelta
+
+
+@override_settings(EVENTS_HEARTBEAT_SECONDS=0.01)
+class RideEventsTestCase(TransactionTestCase):
+    """Manages testing of the ride event streams."""
+
+    def setUp(self):
+        """Creates a circle with a driver and a passenger."""
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.'
+        )
+        self.driver = self.member('driver')
+        self.passenger = self.member('passenger')
+
+    def member(self, username):
+        """Returns an authenticated client of a new circle member."""
+
+        user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username=username,
+            email=f'{username}@example.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        Profile.objects.create(user=user)
+        Membership.objects.create(user=user, circle=self.circle)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        client.user = user
+
+        return client
+
+    @override_settings(EVENTS_STREAMS=False)
+    def test_streams_are_refused_when_disabled(self):
+        """Synchronous workers answer with a 503 instead of holding the worker."""
+
+        for url in (
+            reverse('rides:ride-events', kwargs={'slug_name': self.circle.slug_name}),
+            reverse('rides:ride-ride-events', kwargs={'slug_name': self.circle.slug_name, 'pk': 1}),
+        ):
+            response = self.driver.get(url, HTTP_ACCEPT='text/event-stream')
+            self.assertEqual(response.status_code, 503)
+
+    def test_circle_stream_receives_new_rides(self):
+        """Offering a ride pushes an event to the circle stream."""
+
+        response = self.passenger.get(
+            reverse('rides:ride-events', kwargs={'slug_name': self.circle.slug_name}),
+            HTTP_ACCEPT='text/event-stream'
+        )
+        stream = iter(response.streaming_content)
+
+        self.assertEqual(response['Content-Type'], 'text/event-stream')
+        self.assertEqual(next(stream), b'retry: 5000\n\n')
+
+        departure = timezone.now() + timedelta(hours=1)
+        self.driver.post(reverse('rides:ride-list', kwargs={'slug_name': self.circle.slug_name}), {
+            'available_seats': 3,
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure.isoformat(),
+            'arrival_location': 'Polanco',
+            'arrival_date': (departure + timedelta(hours=1)).isoformat(),
+        }, format='json')
+
+        frames = [frame for frame in (next(stream) for index in range(3)) if not frame.startswith(b':')]
+        response.close()
+
+        self.assertTrue(frames[0].startswith(b'event: ride.created\n'))
+        self.assertIn(b'"available_seats": 3', frames[0])
+
+    def test_joining_publishes_the_seats_left(self):
+        """Joining a ride pushes its new seat count to the ride channel."""
+
+        departure = timezone.now() + timedelta(hours=1)
+        ride = Ride.objects.create(
+            offered_by=self.driver.user,
+            offered_in=self.circle,
+            available_seats=2,
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Polanco',
+            arrival_date=departure + timedelta(hours=1),
+        )
+        subscription = get_broker().subscribe([ride_channel(ride.pk)])
+
+        self.passenger.post(reverse('rides:ride-join', kwargs={'slug_name': self.circle.slug_name, 'pk': ride.pk}))
+        message = subscription.get(timeout=1)
+        subscription.close()
+
+        self.assertEqual(message, f'event: ride.seats\ndata: {{"id": {ride.pk}, "available_seats": 1}}\n\n')
@@ -0,0 +1,91 @@
+"""Idempotent ride creation tests."""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.test import RequestFactory, TestCase
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from rest_framework.authtoken.models import Token
+
+# Mixins
+from cride.utils.mixins import idempotency_cache_key
+
+# Utilities
+from datetime import timedelta
+
+
+class IdempotentRidesTestCase(TestCase):
+    """Manages testing of the rides created with an Idempotency-Key."""
+
+    def setUp(self):
+        """Creates a driver member of the circle."""
+
+        cache.clear()
+
+        self.circle = Circle.objects.create(name='Facultad de Ciencias', slug_name='ciencias-unam', about='Circle.')
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='driver',
+            email='driver@example.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        Profile.objects.create(user=self.user)
+        Membership.objects.create(user=self.user, circle=self.circle)
+
+        self.authorization = f'Token {Token.objects.create(user=self.user).key}'
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=self.authorization)
+        self.url = reverse('rides:ride-list', kwargs={'slug_name': self.circle.slug_name})
+
+        departure = timezone.now() + timedelta(days=1)
+        self.ride = {
+            'available_seats': 3,
+            'departure_location': 'Ciudad Universitaria',
+            'departure_date': departure.isoformat(),
+            'arrival_location': 'Polanco',
+            'arrival_date': (departure + timedelta(hours=1)).isoformat(),
+        }
+
+    def create(self, data, key='ride-1'):
+        """Posts the ride with the Idempotency-Key."""
+
+        return self.client.post(self.url, data, format='json', HTTP_IDEMPOTENCY_KEY=key)
+
+    def test_retries_replay_the_first_response(self):
+        """Retries create nothing and run no query."""
+
+        first = self.create(self.ride)
+
+        with CaptureQueriesContext(connection) as queries:
+            retry = self.create(self.ride)
+
+        self.assertEqual(first.status_code, 201)
+        self.assertEqual((retry.status_code, retry.content), (201, first.content))
+        self.assertEqual(retry['Idempotent-Replayed'], 'true')
+        self.assertEqual(len(queries), 0)
+        self.assertEqual(Ride.objects.count(), 1)
+
+        self.assertEqual(self.create(dict(self.ride, available_seats=4)).status_code, 422)
+        self.assertEqual(self.create(self.ride, key='ride-2').status_code, 201)
+        self.assertEqual(Ride.objects.count(), 2)
+
+    def test_concurrent_duplicates_are_rejected(self):
+        """A retry arriving while the first request runs gets a conflict."""
+
+        request = RequestFactory().post(self.url, HTTP_AUTHORIZATION=self.authorization)
+        cache.add(f'{idempotency_cache_key(request, "ride-1")}:lock', 'running')
+
+        self.assertEqual(self.create(self.ride).status_code, 409)
+        self.assertFalse(Ride.objects.exists())
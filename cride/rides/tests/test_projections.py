@@ -0,0 +1,151 @@
+"""Compact and sparse ride lists tests."""
+
+# Django
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.shortcuts import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride
+from rest_framework.authtoken.models import Token
+
+# Utilities
+from datetime import timedelta
+
+
+class RidesListTestCase(TestCase):
+    """Base of the ride list tests."""
+
+    def setUp(self):
+        """Creates a circle with a few rides and passengers."""
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.'
+        )
+        self.users = [self.member(f'member{index}') for index in range(4)]
+
+        departure = timezone.now() + timedelta(hours=2)
+        for driver in self.users[:3]:
+            ride = Ride.objects.create(
+                offered_by=driver,
+                offered_in=self.circle,
+                available_seats=3,
+                departure_location='Ciudad Universitaria',
+                departure_date=departure,
+                arrival_location='Polanco',
+                arrival_date=departure + timedelta(hours=1),
+            )
+            ride.passengers.add(self.users[3])
+
+        self.client = APIClient()
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.users[3]).key}')
+        self.url = reverse('rides:ride-list', kwargs={'slug_name': self.circle.slug_name})
+
+    def member(self, username):
+        """Returns a new member of the circle."""
+
+        user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username=username,
+            email=f'{username}@example.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        Profile.objects.create(user=user)
+        Membership.objects.create(user=user, circle=self.circle)
+
+        return user
+
+
+class CompactRidesTestCase(RidesListTestCase):
+    """Manages testing of the compact ride list."""
+
+    def test_compact_list_is_projected(self):
+        """The compact rides carry the usernames and no nested objects."""
+
+        response = self.client.get(self.url, {'view': 'compact'})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['count'], 3)
+
+        ride = response.data['results'][0]
+        self.assertEqual(set(ride), {
+            'id', 'offered_by', 'available_seats', 'departure_location',
+            'departure_date', 'arrival_location', 'arrival_date', 'passengers',
+        })
+        self.assertIn(ride['offered_by'], {'member0', 'member1', 'member2'})
+        self.assertEqual(ride['passengers'], ['member3'])
+
+        full = self.client.get(self.url).data['results'][0]
+        self.assertEqual(ride['departure_date'], full['departure_date'])
+
+    def test_compact_list_queries_do_not_grow_with_rides(self):
+        """Passengers of every listed ride are read with a single query."""
+
+        with CaptureQueriesContext(connection) as three_rides:
+            self.client.get(self.url, {'view': 'compact'})
+
+        ride = Ride.objects.first()
+        ride.pk = None
+        ride.save()
+
+        with CaptureQueriesContext(connection) as four_rides:
+            response = self.client.get(self.url, {'view': 'compact'})
+
+        self.assertEqual(response.data['count'], 4)
+        self.assertEqual(len(four_rides), len(three_rides))
+
+
+class SparseRidesTestCase(RidesListTestCase):
+    """Manages testing of the ?fields= and ?expand= parameters."""
+
+    def test_fields_and_expand(self):
+        """Only requested fields are rendered, nested users collapse to usernames."""
+
+        response = self.client.get(self.url, {'fields': 'id,offered_by,passengers', 'expand': 'passengers'})
+
+        ride = response.data['results'][0]
+        self.assertEqual(set(ride), {'id', 'offered_by', 'passengers'})
+        self.assertIn(ride['offered_by'], {'member0', 'member1', 'member2'})
+        self.assertEqual(ride['passengers'][0]['username'], 'member3')
+        self.assertNotIn('profile', ride['passengers'][0])
+
+        response = self.client.get(self.url, {'fields': 'id,offered_by.profile.reputation'})
+
+        ride = response.data['results'][0]
+        self.assertEqual(set(ride), {'id', 'offered_by'})
+        self.assertEqual(ride['offered_by'], {'profile': {'reputation': 5.0}})
+
+    def test_unrequested_relations_are_not_loaded(self):
+        """Sparse lists need fewer queries and the full one no longer grows with the rides."""
+
+        with CaptureQueriesContext(connection) as full:
+            response = self.client.get(self.url)
+
+        self.assertEqual(set(response.data['results'][0]['offered_by']['profile']), {
+            'picture', 'picture_thumbnail', 'picture_webp', 'biography', 'rides_taken', 'rides_offered', 'reputation',
+        })
+
+        with CaptureQueriesContext(connection) as sparse:
+            self.client.get(self.url, {'fields': 'id,departure_date'})
+
+        self.assertLess(len(sparse), len(full))
+
+        ride = Ride.objects.first()
+        ride.pk = None
+        ride.save()
+
+        with CaptureQueriesContext(connection) as more_rides:
+            self.client.get(self.url)
+
+        self.assertEqual(len(more_rides), len(full))
@@ -0,0 +1,110 @@
+"""Ride templates tests."""
+
+# Django
+from django.test import TestCase, override_settings
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride, RideTemplate
+
+# Tasks
+from cride.rides.tasks import materialize_ride_templates
+
+# Utilities
+from datetime import time, timedelta
+
+
+@override_settings(RIDE_TEMPLATES_WINDOW_DAYS=13)
+class MaterializeRideTemplatesTestCase(TestCase):
+    """Manages testing of the ride templates materialization."""
+
+    def setUp(self):
+        """Creates a driver with a commute template."""
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        self.profile = Profile.objects.create(user=self.user)
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.'
+        )
+        self.membership = Membership.objects.create(user=self.user, circle=self.circle)
+        self.template = RideTemplate.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            weekdays='02',
+            departure_time=time(8, 0),
+            duration=timedelta(hours=1),
+            available_seats=3,
+            departure_location='Ciudad Universitaria',
+            arrival_location='Polanco'
+        )
+
+    def test_rides_are_created_once_for_the_window(self):
+        """Only the template weekdays of the window are offered, once."""
+
+        created = materialize_ride_templates()
+
+        rides = Ride.objects.filter(template=self.template)
+        self.assertIn(created, (3, 4))
+        self.assertEqual(rides.count(), created)
+        self.assertTrue(all(ride.departure_date.weekday() in (0, 2) for ride in rides))
+
+        self.assertEqual(materialize_ride_templates(), 0)
+        self.assertEqual(rides.count(), created)
+
+    def test_counters_are_updated(self):
+        """The offered rides counters grow with the materialized rides."""
+
+        created = materialize_ride_templates()
+
+        for instance in (self.circle, self.membership, self.profile):
+            instance.refresh_from_db()
+            self.assertEqual(instance.rides_offered, created)
+
+    def test_former_members_are_skipped(self):
+        """Templates of users that left the circle offer nothing."""
+
+        self.membership.is_active = False
+        self.membership.save()
+
+        self.assertEqual(materialize_ride_templates(), 0)
+
+    def test_only_the_given_template_is_materialized(self):
+        """A template_id leaves the other templates for the next run."""
+
+        other = RideTemplate.objects.create(
+            offered_by=self.user,
+            offered_in=self.circle,
+            weekdays='02',
+            departure_time=time(18, 0),
+            duration=timedelta(hours=1),
+            available_seats=3,
+            departure_location='Polanco',
+            arrival_location='Ciudad Universitaria'
+        )
+
+        created = materialize_ride_templates(other.pk)
+
+        self.assertEqual(Ride.objects.filter(template=other).count(), created)
+        self.assertFalse(Ride.objects.filter(template=self.template).exists())
+
+    def test_a_conflict_only_skips_the_offered_departure(self):
+        """Departures offered by an overlapping run are not offered twice."""
+
+        created = materialize_ride_templates()
+        ride = Ride.objects.filter(template=self.template).earliest('departure_date')
+
+        Ride.objects.filter(template=self.template).exclude(pk=ride.pk).delete()
+        RideTemplate.objects.filter(pk=self.template.pk).update(materialized_until=None)
+
+        self.assertEqual(materialize_ride_templates(), created - 1)
+        self.assertEqual(Ride.objects.filter(template=self.template).count(), created)
@@ -0,0 +1,170 @@
+"""Waitlists tests."""
+
+# Django
+from django.db import connection
+from django.test import TestCase, TransactionTestCase
+from django.shortcuts import reverse
+from django.utils import timezone
+
+# Django REST Framework
+from rest_framework.test import APIClient
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from cride.rides.models import Ride, WaitlistEntry
+from rest_framework.authtoken.models import Token
+
+# Utilities
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+from functools import partial
+
+
+class WaitlistTestCase(TestCase):
+    """Manages testing of the ride waitlist."""
+
+    def setUp(self):
+        """Creates a full ride of a single seat."""
+
+        self.circle = Circle.objects.create(
+            name='Facultad de Ciencias',
+            slug_name='ciencias-unam',
+            about='Grupo oficial de la Facultad de Ciencias.'
+        )
+        self.driver = self.member('driver')
+        self.passenger = self.member('passenger')
+        self.rider = self.member('rider')
+
+        departure = timezone.now() + timedelta(hours=2)
+        self.ride = Ride.objects.create(
+            offered_by=self.driver.user,
+            offered_in=self.circle,
+            available_seats=1,
+            departure_location='Ciudad Universitaria',
+            departure_date=departure,
+            arrival_location='Polanco',
+            arrival_date=departure + timedelta(hours=1),
+        )
+        self.passenger.post(self.url('join'))
+
+    def member(self, username):
+        """Returns an authenticated client of a new circle member."""
+
+        user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username=username,
+            email=f'{username}@example.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        Profile.objects.create(user=user)
+        Membership.objects.create(user=user, circle=self.circle)
+
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+        client.user = user
+
+        return client
+
+    def url(self, action):
+        """Returns the url of a ride action."""
+
+        return reverse(f'rides:ride-{action}', kwargs={'slug_name': self.circle.slug_name, 'pk': self.ride.pk})
+
+    def test_leaving_promotes_the_first_rider(self):
+        """The seat released by a passenger goes to the waitlist."""
+
+        self.assertEqual(self.rider.post(self.url('join')).status_code, 400)
+
+        response = self.rider.post(self.url('waitlist'))
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data['position'], 1)
+
+        self.assertEqual(self.passenger.post(self.url('leave')).status_code, 200)
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(list(self.ride.passengers.all()), [self.rider.user])
+        self.assertFalse(self.ride.waitlist.exists())
+        self.assertEqual(self.ride.rating.get().user, self.rider.user)
+        self.assertEqual(Profile.objects.get(user=self.passenger.user).rides_taken, 0)
+        self.assertEqual(Profile.objects.get(user=self.rider.user).rides_taken, 1)
+
+    def test_leaving_without_waitlist_frees_the_seat(self):
+        """With nobody waiting, leaving gives the seat back to the ride."""
+
+        self.assertEqual(self.passenger.post(self.url('leave')).status_code, 200)
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 1)
+        self.assertFalse(self.ride.passengers.exists())
+        self.assertEqual(self.rider.post(self.url('waitlist')).status_code, 400)
+
+    def test_joining_directly_leaves_the_waitlist(self):
+        """A waitlisted rider that takes a free seat is not promoted again."""
+
+        self.rider.post(self.url('waitlist'))
+        Ride.objects.filter(pk=self.ride.pk).update(available_seats=1)
+
+        self.assertEqual(self.rider.post(self.url('join')).status_code, 200)
+        self.assertFalse(self.ride.waitlist.exists())
+
+        # An entry left behind by an older join must not take a second seat.
+        WaitlistEntry.objects.create(ride=self.ride, user=self.rider.user)
+        self.assertEqual(self.passenger.post(self.url('leave')).status_code, 200)
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 1)
+        self.assertEqual(list(self.ride.passengers.all()), [self.rider.user])
+        self.assertEqual(Profile.objects.get(user=self.rider.user).rides_taken, 1)
+
+
+class ConcurrentSeatsTestCase(TransactionTestCase):
+    """Manages testing of joins and leaves racing for the seats."""
+
+    setUp = WaitlistTestCase.setUp
+    member = WaitlistTestCase.member
+    url = WaitlistTestCase.url
+
+    def post(self, action, client):
+        """Posts the ride action from its own connection, returns the status."""
+
+        try:
+            return client.post(self.url(action)).status_code
+        finally:
+            connection.close()
+
+    def race(self, action, clients):
+        """Posts the action of every client at once, returns the sorted statuses."""
+
+        with ThreadPoolExecutor(max_workers=len(clients)) as executor:
+            return sorted(executor.map(partial(self.post, action), clients))
+
+    def test_seats_are_never_oversold(self):
+        """Only as many riders as free seats get in, whatever the order."""
+
+        self.assertEqual(self.passenger.post(self.url('leave')).status_code, 200)
+        riders = [self.member(f'rider{index}') for index in range(4)]
+
+        statuses = self.race('join', riders)
+
+        self.ride.refresh_from_db()
+        self.assertEqual(statuses, [200, 400, 400, 400])
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(self.ride.passengers.count(), 1)
+
+    def test_a_passenger_leaves_once(self):
+        """Repeated leaves free a single seat and count a single ride."""
+
+        self.rider.post(self.url('waitlist'))
+        retry = APIClient()
+        retry.credentials(HTTP_AUTHORIZATION=f'Token {self.passenger.user.auth_token.key}')
+
+        self.assertEqual(self.race('leave', [self.passenger, retry]), [200, 400])
+
+        self.ride.refresh_from_db()
+        self.assertEqual(self.ride.available_seats, 0)
+        self.assertEqual(list(self.ride.passengers.all()), [self.rider.user])
+        self.assertEqual(Profile.objects.get(user=self.passenger.user).rides_taken, 0)
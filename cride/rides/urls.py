@@ -7,7 +7,7 @@ from django.urls import path, include
 from rest_framework.routers import SimpleRouter
 
 # Views
-from .views import RideViewSet
+from .views import RideViewSet, RideTemplateViewSet
 
 app_name = 'Rides'
 
@@ -20,6 +20,11 @@ router.register(
     RideViewSet,
     base_name='ride'
 )
+router.register(
+    r'(?P<slug_name>[^/.]+)/ride-templates',
+    RideTemplateViewSet,
+    base_name='ride-template'
+)
 
 urlpatterns = [
     path('', include(router.urls))
@@ -1 +1,2 @@
 from .rides import RideViewSet
+from .templates import RideTemplateViewSet
@@ -1,5 +1,10 @@
 """Ride Model Related views."""
 
+# Django
+from django.conf import settings
+from django.db import connections
+from django.http import StreamingHttpResponse
+
 # Django REST Framework
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -10,7 +15,15 @@ from rest_framework.mixins import (
     ListModelMixin,
     UpdateModelMixin
 )
-from cride.utils.mixins import AddCircleMixin
+from cride.utils.mixins import (
+    AddCircleMixin,
+    CompactListMixin,
+    IdempotencyMixin,
+    ReplicaReadMixin,
+    SparseQuerysetMixin,
+    ThrottleMixin,
+    TransactionPolicyMixin
+)
 
 # Permissions
 from rest_framework.permissions import IsAuthenticated
@@ -23,11 +36,20 @@ from cride.rides.permissions import (
 # Serializers
 from cride.rides.serializers import (
     CreateRideSerializer,
+    BulkCreateRideSerializer,
     RideModelSerializer,
     JoinRideSerializer,
     EndRideSerializer,
-    QualifyRideSerializer
+    QualifyRideSerializer,
+    WaitlistSerializer,
+    LeaveRideSerializer
 )
+from cride.utils.serializers import prune_queryset
+
+# Events
+from cride.rides.events import circle_channel, ride_channel
+from cride.utils.events import StreamsUnavailable, event_stream, get_broker
+from cride.utils.renderers import EventStreamRenderer, ORJSONRenderer
 
 # Utilities
 from django.utils import timezone
@@ -36,13 +58,25 @@ from datetime import timedelta
 # Filters
 from rest_framework.filters import SearchFilter, OrderingFilter
 
+# Models
+from cride.rides.models import Ride, WaitlistEntry
+
 # Status
 from rest_framework.status import (
-    HTTP_200_OK
+    HTTP_200_OK,
+    HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT,
+    HTTP_207_MULTI_STATUS
 )
 
 
 class RideViewSet(
+    IdempotencyMixin,
+    ThrottleMixin,
+    ReplicaReadMixin,
+    TransactionPolicyMixin,
+    CompactListMixin,
+    SparseQuerysetMixin,
     AddCircleMixin,
     ListModelMixin,
     CreateModelMixin,
@@ -50,6 +84,10 @@ class RideViewSet(
 ):
     """Manages CRUD of Ride model."""
 
+    atomic_actions = ('create', 'bulk', 'join', 'finish', 'qualify', 'leave', 'waitlist')
+    idempotent_actions = ('create', 'bulk', 'join')
+    throttle_scope = 'rides'
+
     filter_backends = (SearchFilter, OrderingFilter)
 
     search_fields = ('departure_location', 'arrival_location')
@@ -58,6 +96,32 @@ class RideViewSet(
 
     ordering = ('departure_date', 'arrival_date', 'available_seats')
 
+    compact_fields = {
+        'id': 'id',
+        'offered_by': 'offered_by__username',
+        'available_seats': 'available_seats',
+        'departure_location': 'departure_location',
+        'departure_date': 'departure_date',
+        'arrival_location': 'arrival_location',
+        'arrival_date': 'arrival_date',
+    }
+
+    def get_compact_data(self, rows):
+        """Adds the usernames of the passengers of every ride."""
+
+        data = super(RideViewSet, self).get_compact_data(rows)
+        passengers = {ride['id']: [] for ride in data}
+
+        for ride_id, username in Ride.passengers.through.objects.filter(
+            ride_id__in=list(passengers)
+        ).values_list('ride_id', 'user__username'):
+            passengers[ride_id].append(username)
+
+        for ride in data:
+            ride['passengers'] = passengers[ride['id']]
+
+        return data
+
     def get_serializer_context(self):
         """Modifies the serializer context adding the current circle to the context."""
 
@@ -65,7 +129,7 @@ class RideViewSet(
 
         context['circle'] = self.circle
 
-        if self.action in ['join', 'finish', 'qualify']:
+        if self.action in ['join', 'finish', 'qualify', 'leave', 'waitlist']:
             context['ride'] = self.get_object()
 
         return context
@@ -76,6 +140,9 @@ class RideViewSet(
         if self.action == 'create':
             return CreateRideSerializer
 
+        if self.action == 'bulk':
+            return BulkCreateRideSerializer
+
         if self.action == 'join':
             return JoinRideSerializer
 
@@ -85,6 +152,12 @@ class RideViewSet(
         if self.action == 'qualify':
             return QualifyRideSerializer
 
+        if self.action == 'leave':
+            return LeaveRideSerializer
+
+        if self.action == 'waitlist':
+            return WaitlistSerializer
+
         return RideModelSerializer
 
     def get_queryset(self):
@@ -92,7 +165,7 @@ class RideViewSet(
 
         circle = self.circle
 
-        if self.action not in ['finish', 'qualify']:
+        if self.action not in ['join', 'finish', 'qualify', 'ride_events', 'leave', 'waitlist']:
             offset = timezone.now() + timedelta(minutes=10)
 
             queryset = circle.ride_set.filter(
@@ -102,6 +175,11 @@ class RideViewSet(
         else:
             queryset = circle.ride_set.all()
 
+        if self.action in ['join', 'leave', 'waitlist']:
+            # The ride stays locked until the transaction ends, so concurrent
+            # joins, leaves and waitlists validate and see the seats one at a time.
+            queryset = queryset.select_for_update()
+
         return queryset
 
     def get_permissions(self):
@@ -117,26 +195,49 @@ class RideViewSet(
                 IsRideOwner()
             )
 
-        if self.action in ['join', 'qualify']:
+        if self.action in ['join', 'qualify', 'leave', 'waitlist']:
             permissions.append(
                 IsNotRideOwner()
             )
 
         return permissions
 
+    @action(detail=False, methods=['post'])
+    def bulk(self, request, *args, **kwargs):
+        """Handles offering several rides at once, reporting the invalid ones."""
+
+        serializer = self.get_serializer(data=request.data)
+
+        if serializer.is_valid(raise_exception=True):
+            rides = serializer.save()
+
+            # Fetched again so the relations are loaded once and not once per ride.
+            context = self.get_serializer_context()
+            queryset = prune_queryset(
+                Ride.objects.filter(pk__in=[ride.pk for ride in rides]).order_by('departure_date'),
+                RideModelSerializer(context=context)
+            )
+
+            data = {
+                'rides': RideModelSerializer(queryset, many=True, context=context).data,
+                'errors': serializer.item_errors,
+            }
+
+            return Response(data=data, status=HTTP_207_MULTI_STATUS if serializer.item_errors else HTTP_201_CREATED)
+
     @action(detail=True, methods=['post'])
     def join(self, request, *args, **kwargs):
         """Handles joining to a circle."""
 
-        ride = self.get_object()
+        context = self.get_serializer_context()
 
         serializer_class = self.get_serializer_class()
         serializer = serializer_class(
-            ride,
+            context['ride'],
             data={
                 'passenger': request.user.pk
             },
-            context=self.get_serializer_context(),
+            context=context,
             partial=True
         )
 
@@ -186,3 +287,84 @@ class RideViewSet(
             data = RideModelSerializer(ride).data
 
             return Response(data=data, status=HTTP_200_OK)
+
+    @action(detail=True, methods=['post'])
+    def leave(self, request, *args, **kwargs):
+        """Handles leaving a ride, the seat goes to the waitlist first."""
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data={},
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+            ride = serializer.save()
+            data = RideModelSerializer(ride).data
+
+            return Response(data=data, status=HTTP_200_OK)
+
+    @action(detail=True, methods=['post', 'delete'])
+    def waitlist(self, request, *args, **kwargs):
+        """Handles queueing for a seat of a full ride, or leaving the queue."""
+
+        if request.method == 'DELETE':
+            ride = self.get_object()
+            WaitlistEntry.objects.filter(ride=ride, user=request.user).delete()
+
+            return Response(status=HTTP_204_NO_CONTENT)
+
+        serializer_class = self.get_serializer_class()
+        serializer = serializer_class(
+            data={},
+            context=self.get_serializer_context()
+        )
+
+        if serializer.is_valid(raise_exception=True):
+            entry = serializer.save()
+
+            return Response(data=serializer.to_representation(entry), status=HTTP_201_CREATED)
+
+    @action(detail=False, methods=['get'], renderer_classes=[ORJSONRenderer, EventStreamRenderer])
+    def events(self, request, *args, **kwargs):
+        """Streams the new rides, seat changes and finished rides of the circle."""
+
+        return self.stream(circle_channel(self.circle.pk))
+
+    @action(
+        detail=True,
+        methods=['get'],
+        url_path='events',
+        url_name='ride-events',
+        renderer_classes=[ORJSONRenderer, EventStreamRenderer]
+    )
+    def ride_events(self, request, *args, **kwargs):
+        """Streams the seat changes of a ride and its end."""
+
+        if not settings.EVENTS_STREAMS:
+            raise StreamsUnavailable()
+
+        ride = self.get_object()
+
+        return self.stream(ride_channel(ride.pk))
+
+    def stream(self, channel):
+        """Returns a server-sent events response fed by the channel."""
+
+        # On a synchronous worker every open stream would hold the whole worker.
+        if not settings.EVENTS_STREAMS:
+            raise StreamsUnavailable()
+
+        subscription = get_broker().subscribe([channel])
+
+        # The stream may stay open for hours, it must not hold a database connection.
+        connections.close_all()
+
+        response = StreamingHttpResponse(
+            event_stream(subscription, settings.EVENTS_HEARTBEAT_SECONDS),
+            content_type='text/event-stream'
+        )
+        response['Cache-Control'] = 'no-cache'
+        response['X-Accel-Buffering'] = 'no'
+
+        return response
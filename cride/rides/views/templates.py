@@ -0,0 +1,69 @@
+"""Ride templates views."""
+
+# Django
+from django.db import transaction
+
+# Django REST Framework
+from rest_framework.mixins import (
+    CreateModelMixin,
+    DestroyModelMixin,
+    ListModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin
+)
+from cride.utils.mixins import AddCircleMixin, TransactionPolicyMixin
+
+# Permissions
+from rest_framework.permissions import IsAuthenticated
+from cride.circles.permissions import IsCircleActiveMember
+
+# Serializers
+from cride.rides.serializers import RideTemplateModelSerializer
+
+# Tasks
+from cride.rides.tasks import materialize_ride_templates
+
+
+class RideTemplateViewSet(
+    TransactionPolicyMixin,
+    AddCircleMixin,
+    ListModelMixin,
+    CreateModelMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    DestroyModelMixin
+):
+    """Manages the recurring rides a user offers in a circle."""
+
+    serializer_class = RideTemplateModelSerializer
+    permission_classes = (IsAuthenticated, IsCircleActiveMember)
+    atomic_actions = ('create',)
+
+    def get_serializer_context(self):
+        """Adds the circle to the serializer context."""
+
+        context = super(RideTemplateViewSet, self).get_serializer_context()
+        context['circle'] = self.circle
+
+        return context
+
+    def get_queryset(self):
+        """Returns the active templates of the request user in the circle."""
+
+        return self.circle.ride_templates.filter(
+            offered_by=self.request.user,
+            is_active=True
+        )
+
+    def perform_create(self, serializer):
+        """Creates the template and materializes its first rides."""
+
+        template = serializer.save()
+
+        transaction.on_commit(lambda: materialize_ride_templates.delay(template.pk))
+
+    def perform_destroy(self, instance):
+        """Deactivates the template, rides already offered are kept."""
+
+        instance.is_active = False
+        instance.save()
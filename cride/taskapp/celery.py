@@ -2,6 +2,7 @@
 
 import os
 from celery import Celery
+from celery.signals import worker_init, worker_process_shutdown
 from django.apps import apps, AppConfig
 from django.conf import settings
 
@@ -27,6 +28,26 @@ class CeleryAppConfig(AppConfig):
         installed_apps = [app_config.name for app_config in apps.get_app_configs()]
         app.autodiscover_tasks(lambda: installed_apps, force=True)
 
+        # Connects the task duration signals.
+        from cride.utils import metrics  # noqa F401
+
+
+@worker_init.connect
+def start_metrics_server(**kwargs):
+    """Exports the worker metrics if a port was configured."""
+
+    if settings.METRICS_CELERY_WORKER_PORT:
+        from cride.utils.metrics import start_worker_server
+        start_worker_server(settings.METRICS_CELERY_WORKER_PORT)
+
+
+@worker_process_shutdown.connect
+def drain_database_pools(**kwargs):
+    """Closes the pooled database connections of the worker process."""
+
+    from cride.utils.db.pool import drain_pools
+    drain_pools()
+
 
 @app.task(bind=True)
 def debug_task(self):
@@ -11,3 +11,7 @@ class UsersConfig(AppConfig):
     """
     name = 'cride.users'
     verbose_name = 'Users'
+
+    def ready(self):
+        # Connects the deactivated users denylist.
+        from cride.users import tokens  # noqa F401
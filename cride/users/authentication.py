@@ -0,0 +1,46 @@
+"""Users authentication classes."""
+
+# Django REST Framework
+from rest_framework.authentication import BaseAuthentication, get_authorization_header
+from rest_framework.exceptions import AuthenticationFailed
+
+# Tokens
+from cride.users.tokens import ACCESS, decode, token_user
+
+# JWT
+import jwt
+
+
+class JWTAuthentication(BaseAuthentication):
+    """Authenticates the requests sent with 'Authorization: Bearer <access token>'.
+
+    The user is built from the token claims, its other fields are
+    only queried if something reads them.
+    """
+
+    keyword = 'Bearer'
+
+    def authenticate(self, request):
+        """Returns the user and the payload of the access token, if one was sent."""
+
+        auth = get_authorization_header(request).split()
+
+        if not auth or auth[0].lower() != self.keyword.lower().encode():
+            return None
+
+        if len(auth) != 2:
+            raise AuthenticationFailed('Invalid token header.')
+
+        try:
+            payload = decode(auth[1].decode(), ACCESS)
+        except jwt.ExpiredSignatureError:
+            raise AuthenticationFailed('The access token has expired.')
+        except (jwt.PyJWTError, UnicodeError):
+            raise AuthenticationFailed('Invalid token.')
+
+        return token_user(payload), payload
+
+    def authenticate_header(self, request):
+        """Returns the WWW-Authenticate header of the 401 responses."""
+
+        return self.keyword
@@ -24,6 +24,13 @@ class Profile(CRideModel):
         blank=True,
         null=True
     )
+    picture_thumbnail = models.ImageField(upload_to='users/pictures/', blank=True, null=True)
+    picture_webp = models.ImageField(upload_to='users/pictures/', blank=True, null=True)
+    picture_upload = models.CharField(
+        max_length=255,
+        blank=True,
+        help_text='Uploaded picture waiting for its variants, see cride.utils.images.'
+    )
 
     biography = models.TextField(
         max_length=500,
@@ -2,6 +2,7 @@ from .user_management import (
     UserLoginSerializer,
     UserModelSerializer,
     UserSignupSerializer,
-    UserVerifySerializer
+    UserVerifySerializer,
+    TokenRefreshSerializer
 )
 from .profiles import ProfileModelSerializer
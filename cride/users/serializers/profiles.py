@@ -6,10 +6,18 @@ from rest_framework import serializers
 # Models
 from cride.users.models import Profile
 
+# Serializers
+from cride.utils.serializers import DeferredPictureMixin, SparseFieldsMixin
 
-class ProfileModelSerializer(serializers.ModelSerializer):
+# Tasks
+from cride.users.tasks import process_profile_picture
+
+
+class ProfileModelSerializer(SparseFieldsMixin, DeferredPictureMixin, serializers.ModelSerializer):
     """Profile Model Serializer."""
 
+    picture_task = process_profile_picture
+
     class Meta:
         """Metadata class."""
 
@@ -17,12 +25,16 @@ class ProfileModelSerializer(serializers.ModelSerializer):
 
         fields = (
             'picture',
+            'picture_thumbnail',
+            'picture_webp',
             'biography',
             'rides_taken',
             'rides_offered',
             'reputation'
         )
         read_only_fields = (
+            'picture_thumbnail',
+            'picture_webp',
             'rides_taken',
             'rides_offered',
             'reputation'
@@ -3,6 +3,7 @@
 # Django REST Framework
 from rest_framework import serializers
 from rest_framework.authtoken.models import Token
+from rest_framework.settings import api_settings
 
 # Django
 from django.contrib.auth import authenticate, password_validation
@@ -12,8 +13,10 @@ from django.core.mail import EmailMultiAlternatives
 # Models
 from cride.users.models import User, Profile
 
+# Tokens
+from cride.users.tokens import REFRESH, decode, issue_tokens, revoke
+
 # Validators
-from rest_framework.validators import UniqueValidator
 from django.core.validators import RegexValidator
 
 # JWT
@@ -28,13 +31,19 @@ from django.conf import settings
 
 # Serializers
 from .profiles import ProfileModelSerializer
+from cride.utils.serializers import SparseFieldsMixin, constraint_errors
 
 
 class UserLoginSerializer(serializers.Serializer):
-    """Handles and validate the data when a user tries to login."""
+    """Handles and validate the data when a user tries to login.
+
+    With token_type=jwt the user gets signed access and refresh
+    tokens instead of an authtoken key, see cride.users.tokens.
+    """
 
     email = serializers.EmailField()
     password = serializers.CharField(min_length=8)
+    token_type = serializers.ChoiceField(choices=('token', 'jwt'), default='token')
 
     def validate(self, data):
         """Checks credentials."""
@@ -60,16 +69,57 @@ class UserLoginSerializer(serializers.Serializer):
         """Generate or retrieve a new token."""
 
         user = self.context['user']
+
+        if validated_data['token_type'] == 'jwt':
+            return (user, issue_tokens(user))
+
         token, created = Token.objects.get_or_create(user=user)
 
-        return (user, token.key)
+        return (user, {'access_token': token.key})
+
+
+class TokenRefreshSerializer(serializers.Serializer):
+    """Exchanges a refresh token for a new pair of tokens.
+
+    Refresh tokens are single use, the one sent is revoked.
+    """
+
+    refresh_token = serializers.CharField()
+
+    def validate_refresh_token(self, refresh_token):
+        """Verifies the token is a valid refresh token."""
+
+        try:
+            payload = decode(refresh_token, REFRESH)
+        except jwt.ExpiredSignatureError:
+            raise serializers.ValidationError('The refresh token has expired.')
+        except jwt.PyJWTError:
+            raise serializers.ValidationError('Invalid token.')
+
+        self.context['payload'] = payload
+
+        return refresh_token
+
+    def create(self, validated_data):
+        """Revokes the refresh token and issues the new ones."""
+
+        payload = self.context['payload']
+        user = User.objects.filter(pk=payload['id'], is_active=True, is_verified=True).first()
+
+        # Concurrent refreshes of the same token only succeed once.
+        if user is None or not revoke(payload):
+            raise serializers.ValidationError({'refresh_token': ['Invalid token.']})
+
+        return (user, issue_tokens(user))
 
 
-class UserModelSerializer(serializers.ModelSerializer):
+class UserModelSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     """Serializer of the user model."""
 
     profile = ProfileModelSerializer(read_only=True)
 
+    expandable_fields = {'profile': None}
+
     class Meta:
         """Metadata configurations."""
 
@@ -85,19 +135,16 @@ class UserModelSerializer(serializers.ModelSerializer):
 
 
 class UserSignupSerializer(serializers.Serializer):
-    """Handles and validates te data when a user signs up."""
+    """Handles and validates te data when a user signs up.
 
-    email = serializers.EmailField(
-        validators=[
-            UniqueValidator(queryset=User.objects.all())
-        ]
-    )
+    Taken emails and usernames are caught by their unique constraints
+    when the user is inserted, the signup transaction is rolled back.
+    """
+
+    email = serializers.EmailField()
     username = serializers.CharField(
         min_length=4,
-        max_length=20,
-        validators=[
-            UniqueValidator(queryset=User.objects.all())
-        ]
+        max_length=20
     )
 
     # Phone number
@@ -149,7 +196,12 @@ class UserSignupSerializer(serializers.Serializer):
     def create(self, validated_data):
         """Creates user and profile when the data is validated."""
 
-        user = User.objects.create_user(**validated_data)
+        with constraint_errors({
+            'users_user_email_key': {'email': ['This field must be unique.']},
+            'users_user_username_key': {'username': ['This field must be unique.']},
+        }, savepoint=False):
+            user = User.objects.create_user(**validated_data)
+
         Profile.objects.create(user=user)
 
         self.send_confirmation_email(user)
@@ -221,23 +273,22 @@ class UserVerifySerializer(serializers.Serializer):
 
             return token
 
-    def validate(self, data):
-        """Verifies the user have'nt verified it's account yet."""
-
-        payload = self.context['payload']
-        username = payload['user']
-
-        if User.objects.filter(username=username, is_verified=True).exists():
-            raise serializers.ValidationError('You have already verified your email.')
-
-        return data
-
     def save(self):
-        """Makes the field is_verified of the user True(Only if the token was valid)."""
+        """Makes the field is_verified of the user True(Only if the token was valid).
+
+        A single conditional UPDATE, no row updated means the
+        account was already verified.
+        """
 
         payload = self.context['payload']
         username = payload['user']
 
-        user = User.objects.get(username=username)
-        user.is_verified = True
-        user.save()
+        verified = User.objects.filter(username=username, is_verified=False).update(
+            is_verified=True,
+            modified=timezone.now()
+        )
+
+        if not verified:
+            raise serializers.ValidationError({
+                api_settings.NON_FIELD_ERRORS_KEY: ['You have already verified your email.']
+            })
@@ -0,0 +1,17 @@
+"""Users tasks."""
+
+# Celery
+from cride.taskapp.celery import app
+
+# Models
+from cride.users.models import Profile
+
+# Images
+from cride.utils.images import process_picture
+
+
+@app.task
+def process_profile_picture(profile_pk, upload):
+    """Builds the variants of an uploaded profile picture."""
+
+    return process_picture(Profile, profile_pk, upload)
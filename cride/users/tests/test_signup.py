@@ -0,0 +1,74 @@
+"""Signup and verification tests."""
+
+# Django
+from django.db import connection
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User
+
+# Serializers
+from cride.users.serializers import UserSignupSerializer
+
+# Throttling
+from cride.utils.throttling import get_buckets
+
+
+def statements(queries):
+    """Returns the queries that are not savepoints of the test transaction."""
+
+    return [query['sql'].split()[0] for query in queries if not query['sql'].startswith(('SAVEPOINT', 'RELEASE'))]
+
+
+class SignupTestCase(APITestCase):
+    """Manages testing of the signup and the verification."""
+
+    def setUp(self):
+        """Empties the throttling buckets."""
+
+        get_buckets().clear()
+
+        self.data = {
+            'email': 'c@a.com',
+            'username': 'cheke',
+            'phone_number': '+525512345678',
+            'password': 'cheke12345678cheke',
+            'password_confirmation': 'cheke12345678cheke',
+            'first_name': 'Francisco',
+            'last_name': 'Ramirez',
+        }
+
+    def test_signup_inserts_the_user_and_profile_only(self):
+        """Signing up runs two inserts, taken fields are reported by the constraints."""
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('users:users-signup'), self.data)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(statements(queries), ['INSERT', 'INSERT'])
+
+        response = self.client.post(reverse('users:users-signup'), dict(self.data, email='other@a.com'))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'username': ['This field must be unique.']})
+        self.assertEqual(User.objects.count(), 1)
+
+    def test_verification_is_a_single_update(self):
+        """Verifying runs one UPDATE, verifying again is rejected."""
+
+        self.client.post(reverse('users:users-signup'), self.data)
+        token = UserSignupSerializer().generate_verification_token(User.objects.get())
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('users:users-verify'), {'token': token})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(statements(queries), ['UPDATE'])
+        self.assertTrue(User.objects.get().is_verified)
+
+        response = self.client.post(reverse('users:users-verify'), {'token': token})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data, {'non_field_errors': ['You have already verified your email.']})
@@ -0,0 +1,94 @@
+"""Signed tokens tests."""
+
+# Django
+from django.core.cache import cache
+from django.db import connection
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+
+# Throttling
+from cride.utils.throttling import get_buckets
+
+
+class SignedTokensTestCase(APITestCase):
+    """Manages testing of the signed access and refresh tokens."""
+
+    def setUp(self):
+        """Creates a verified user and logs in for signed tokens."""
+
+        cache.clear()
+        get_buckets().clear()
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True,
+            is_client=True
+        )
+        Profile.objects.create(user=self.user)
+
+        response = self.client.post(reverse('users:users-login'), {
+            'email': 'c@a.com',
+            'password': 'cheke12345678cheke',
+            'token_type': 'jwt',
+        })
+        self.assertEqual(response.status_code, 201)
+        self.tokens = response.data
+        self.url = reverse('users:users-detail', kwargs={'username': 'cheke'})
+
+    def get(self, access_token):
+        """Retrieves the user with the access token, returns the response and the queries."""
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(self.url)
+
+        return response, [query['sql'] for query in queries]
+
+    def test_access_tokens_authenticate_without_queries(self):
+        """Neither the token nor the user are read to authenticate."""
+
+        response, queries = self.get(self.tokens['access_token'])
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([sql for sql in queries if 'authtoken_token' in sql])
+        self.assertFalse([sql for sql in queries if '"users_user"."id" = %s' % self.user.pk in sql])
+
+    def test_refresh_rotates_and_logout_revokes(self):
+        """Refresh tokens work once, logging out denies both tokens."""
+
+        refresh = self.client.post(reverse('users:users-refresh'), {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(refresh.status_code, 201)
+
+        reused = self.client.post(reverse('users:users-refresh'), {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(reused.status_code, 400)
+
+        access_token = refresh.data['access_token']
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {access_token}')
+        logout = self.client.post(reverse('users:users-logout'), {'refresh_token': refresh.data['refresh_token']})
+        self.assertEqual(logout.status_code, 204)
+
+        self.assertEqual(self.get(access_token)[0].status_code, 401)
+        self.assertEqual(self.get(self.tokens['access_token'])[0].status_code, 200)
+
+    def test_deactivated_users_lose_access(self):
+        """Access tokens stop working once the user is deactivated, refresh tokens too."""
+
+        self.user.is_active = False
+        self.user.save()
+
+        self.assertEqual(self.get(self.tokens['access_token'])[0].status_code, 401)
+
+        self.client.credentials()
+        refresh = self.client.post(reverse('users:users-refresh'), {'refresh_token': self.tokens['refresh_token']})
+        self.assertEqual(refresh.status_code, 400)
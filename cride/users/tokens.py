@@ -0,0 +1,130 @@
+"""Users tokens module.
+
+Signed access and refresh tokens, an alternative to the authtoken
+keys requested with token_type=jwt on login. Access tokens are short
+lived and carry what authenticating needs, so JWTAuthentication never
+reads the database. Refresh tokens are exchanged for a new pair and
+revoked on the way. Revoked tokens are kept in a denylist in the cache
+until they would have expired anyway. Deactivating a user denies their
+access tokens the same way, refresh tokens check the user itself.
+Deactivations through QuerySet.update skip the denylist, their access
+tokens last up to JWT_ACCESS_SECONDS.
+"""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+# Models
+from cride.users.models import User
+
+# JWT
+import jwt
+
+# Utilities
+import time
+from uuid import uuid4
+
+
+ACCESS = 'access'
+REFRESH = 'refresh'
+
+# Claims copied to the user of an access token, the rest load on access.
+USER_CLAIMS = ('id', 'username', 'is_active', 'is_verified', 'is_client')
+
+
+def encode(user, token_type, lifetime):
+    """Returns a token of the given type valid for lifetime seconds."""
+
+    now = int(time.time())
+    payload = {
+        'type': token_type,
+        'jti': uuid4().hex,
+        'iat': now,
+        'exp': now + lifetime,
+    }
+
+    if token_type == ACCESS:
+        payload.update({claim: getattr(user, claim) for claim in USER_CLAIMS})
+    else:
+        payload['id'] = user.pk
+
+    return jwt.encode(payload, settings.SECRET_KEY, algorithm='HS256').decode()
+
+
+def issue_tokens(user):
+    """Returns a new pair of access and refresh tokens."""
+
+    return {
+        'access_token': encode(user, ACCESS, settings.JWT_ACCESS_SECONDS),
+        'refresh_token': encode(user, REFRESH, settings.JWT_REFRESH_SECONDS),
+        'token_type': 'Bearer',
+        'expires_in': settings.JWT_ACCESS_SECONDS,
+    }
+
+
+def denylist_key(jti):
+    """Returns the cache key of a revoked token."""
+
+    return f'jwt:denylist:{jti}'
+
+
+def inactive_key(user_id):
+    """Returns the cache key of a deactivated user."""
+
+    return f'jwt:inactive:{user_id}'
+
+
+@receiver(post_save, sender=User)
+def deny_inactive_user(instance, **kwargs):
+    """Denies the access tokens of a deactivated user until they expire."""
+
+    if instance.is_active:
+        cache.delete(inactive_key(instance.pk))
+    else:
+        cache.set(inactive_key(instance.pk), 1, settings.JWT_ACCESS_SECONDS)
+
+
+def decode(token, token_type):
+    """Returns the payload of a valid token of the given type.
+
+    Raises jwt.ExpiredSignatureError when it expired and
+    jwt.PyJWTError when it is invalid, was revoked or its
+    user was deactivated.
+    """
+
+    payload = jwt.decode(token, settings.SECRET_KEY, algorithms=['HS256'])
+
+    if payload.get('type') != token_type:
+        raise jwt.InvalidTokenError('Unexpected token type.')
+
+    keys = [denylist_key(payload['jti'])]
+
+    if token_type == ACCESS:
+        if not all(claim in payload for claim in USER_CLAIMS) or not payload['is_active']:
+            raise jwt.InvalidTokenError('Inactive user.')
+
+        keys.append(inactive_key(payload['id']))
+
+    # A single round trip checks both denylists.
+    if cache.get_many(keys):
+        raise jwt.InvalidTokenError('Revoked token.')
+
+    return payload
+
+
+def revoke(payload):
+    """Denies the token until it expires, returns False if it already was."""
+
+    remaining = max(int(payload['exp'] - time.time()), 1)
+
+    return cache.add(denylist_key(payload['jti']), 1, remaining)
+
+
+def token_user(payload):
+    """Returns the user of an access token without querying it."""
+
+    return User.from_db(DEFAULT_DB_ALIAS, USER_CLAIMS, [payload[claim] for claim in USER_CLAIMS])
@@ -5,12 +5,14 @@ from rest_framework.response import Response
 from rest_framework.status import (
     HTTP_200_OK,
     HTTP_201_CREATED,
+    HTTP_204_NO_CONTENT,
 )
 from rest_framework.viewsets import GenericViewSet
 from rest_framework.decorators import action
 
 # Mixins
 from rest_framework.mixins import RetrieveModelMixin, UpdateModelMixin
+from cride.utils.mixins import SparseQuerysetMixin, ThrottleMixin, TransactionPolicyMixin
 
 # Serializers
 from cride.users.serializers import (
@@ -18,29 +20,43 @@ from cride.users.serializers import (
     UserModelSerializer,
     UserSignupSerializer,
     UserVerifySerializer,
-    ProfileModelSerializer
+    ProfileModelSerializer,
+    TokenRefreshSerializer
 )
-from cride.circles.serializers import CircleModelSerializer
 
 # Models
 from cride.users.models import User
-from cride.circles.models import Circle
+
+# Cache
+from cride.circles.cache import my_circles
+
+# Tokens
+from cride.users.tokens import ACCESS, revoke
 
 # Permissions
 from rest_framework.permissions import AllowAny, IsAuthenticated
 from cride.users.permissions import IsAccountOwner
 
 
-class UserManagementViewSet(RetrieveModelMixin, UpdateModelMixin, GenericViewSet):
+class UserManagementViewSet(
+    ThrottleMixin,
+    TransactionPolicyMixin,
+    SparseQuerysetMixin,
+    RetrieveModelMixin,
+    UpdateModelMixin,
+    GenericViewSet
+):
     """Manages all views related to the user model."""
 
     queryset = User.objects.filter(is_verified=True, is_client=True)
     lookup_field = 'username'
     serializer_class = UserModelSerializer
+    atomic_actions = ('signup',)
+    throttle_scope = 'users'
 
     def get_permissions(self):
         """Returns the permissions depending on the action."""
-        if self.action in ['login', 'signup', 'verify']:
+        if self.action in ['login', 'signup', 'verify', 'refresh', 'logout']:
             permissions = [AllowAny()]
         elif self.action in ['retrieve', 'update', 'partial_update', 'profile']:
             permissions = [IsAuthenticated(), IsAccountOwner()]
@@ -55,13 +71,38 @@ class UserManagementViewSet(RetrieveModelMixin, UpdateModelMixin, GenericViewSet
         login = UserLoginSerializer(data=request.data)
 
         if login.is_valid(raise_exception=True):
-            user, token = login.save()
+            user, tokens = login.save()
             response = {
                 'user': UserModelSerializer(user).data,
-                'access_token': token
+                **tokens
             }
             return Response(response, status=HTTP_201_CREATED)
 
+    @action(detail=False, methods=['post'])
+    def refresh(self, request):
+        """Exchanges a refresh token for new access and refresh tokens."""
+
+        serializer = TokenRefreshSerializer(data=request.data)
+
+        if serializer.is_valid(raise_exception=True):
+            user, tokens = serializer.save()
+
+            return Response(tokens, status=HTTP_201_CREATED)
+
+    @action(detail=False, methods=['post'])
+    def logout(self, request):
+        """Revokes the refresh token, and the access token the request was sent with."""
+
+        serializer = TokenRefreshSerializer(data=request.data)
+
+        if serializer.is_valid(raise_exception=True):
+            revoke(serializer.context['payload'])
+
+            if isinstance(request.auth, dict) and request.auth.get('type') == ACCESS:
+                revoke(request.auth)
+
+            return Response(status=HTTP_204_NO_CONTENT)
+
     @action(detail=False, methods=['post'])
     def signup(self, request):
         """ Manages the signup of a user."""
@@ -94,13 +135,9 @@ class UserManagementViewSet(RetrieveModelMixin, UpdateModelMixin, GenericViewSet
 
         response = super(UserManagementViewSet, self).retrieve(request, args, kwargs)
 
-        circles = Circle.objects.filter(
-            members=request.user,
-            membership__is_active=True
-        )
         data = {
             'user': response.data,
-            'circles': CircleModelSerializer(circles, many=True).data
+            'circles': my_circles(request.user)
         }
         response.data = data
 
@@ -0,0 +1,147 @@
+"""Utils app batch module.
+
+Runs several API requests in a single round trip:
+
+    POST /batch/
+    {"requests": [
+        {"method": "GET", "path": "/users/francisco/"},
+        {"method": "GET", "path": "/circles/?limit=5"},
+        {"method": "GET", "path": "/circles/ciencias-unam/rides/"}
+    ]}
+
+Sub-requests run in order through the same views, authenticated as the
+batch user without looking the token up again, and share the circles
+and memberships they resolve through memoize(). Only API views can be
+batched, they run without the middleware. The answer lists the status
+and body of every sub-request, one failing does not fail the others.
+"""
+
+# Django
+from django.core.handlers.wsgi import WSGIRequest
+from django.urls import Resolver404, resolve
+
+# Django REST Framework
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+# Serializers
+from cride.utils.serializers import BatchSerializer
+
+# Utilities
+import json
+import logging
+from io import BytesIO
+from urllib.parse import urlsplit
+
+
+SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+logger = logging.getLogger('cride.batch')
+
+
+def memoize(request, key, function):
+    """Returns function(), computed once per batch when the request belongs to one."""
+
+    cache = getattr(request, 'batch_cache', None)
+
+    if cache is None:
+        return function()
+
+    if key not in cache:
+        cache[key] = function()
+
+    return cache[key]
+
+
+class BatchView(APIView):
+    """Batch view
+
+    Handles POST /batch/, see the module documentation.
+    """
+
+    permission_classes = (IsAuthenticated,)
+
+    def post(self, request, *args, **kwargs):
+        """Runs the sub-requests and returns their results."""
+
+        serializer = BatchSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        cache = {}
+        responses = []
+        wrote = False
+
+        for sub_request in serializer.validated_data['requests']:
+            status, data = self.perform(request, sub_request, cache)
+            responses.append({'status': status, 'body': data})
+
+            if sub_request['method'] not in SAFE_METHODS:
+                # Writes may change what was memoized so far.
+                cache.clear()
+                wrote = wrote or status < 400
+
+        # Only batches that wrote pin the user to the primary database.
+        request._request.wrote = wrote
+
+        return Response({'responses': responses})
+
+    def perform(self, request, sub_request, cache):
+        """Runs a sub-request, returns its status and data."""
+
+        url = urlsplit(sub_request['path'])
+
+        try:
+            match = resolve(url.path)
+        except Resolver404:
+            return 404, {'detail': 'Not found.'}
+
+        # Other views rely on the middleware, which sub-requests skip.
+        view_class = getattr(match.func, 'cls', None)
+        if view_class is None or not issubclass(view_class, APIView) or issubclass(view_class, BatchView):
+            return 404, {'detail': 'Not found.'}
+
+        http_request = self.build_request(request, sub_request, url)
+        http_request.batch_cache = cache
+        http_request.resolver_match = match
+
+        try:
+            response = match.func(http_request, *match.args, **match.kwargs)
+        except Exception:
+            logger.exception('Batched %s %s failed.', sub_request['method'], url.path)
+            return 500, {'detail': 'A server error occurred.'}
+
+        if response.streaming:
+            response.close()
+            return 400, {'detail': 'Streaming endpoints can not be batched.'}
+
+        return response.status_code, getattr(response, 'data', None)
+
+    def build_request(self, request, sub_request, url):
+        """Returns the HTTP request of a sub-request, authenticated as the batch user."""
+
+        body = b''
+        if 'body' in sub_request:
+            body = json.dumps(sub_request['body']).encode()
+
+        environ = {
+            key: value for key, value in request.META.items()
+            if key not in (
+                'CONTENT_TYPE', 'CONTENT_LENGTH', 'HTTP_CONTENT_TYPE', 'HTTP_CONTENT_LENGTH', 'HTTP_IDEMPOTENCY_KEY'
+            )
+        }
+        environ.update({
+            'REQUEST_METHOD': sub_request['method'],
+            'PATH_INFO': url.path,
+            'QUERY_STRING': url.query,
+            'HTTP_ACCEPT': 'application/json',
+            'CONTENT_TYPE': 'application/json',
+            'CONTENT_LENGTH': str(len(body)),
+            'wsgi.input': BytesIO(body),
+        })
+
+        http_request = WSGIRequest(environ)
+        http_request._force_auth_user = request.user
+        http_request._force_auth_token = request.auth
+
+        return http_request
@@ -0,0 +1,40 @@
+"""Utils app cache module."""
+
+# Django Redis
+from django_redis.cache import RedisCache
+
+# Metrics
+from cride.utils.metrics import CACHE_REQUESTS
+
+
+MISSING = object()
+
+
+class InstrumentedRedisCache(RedisCache):
+    """Instrumented Redis cache
+
+    Redis cache backend that counts hits and misses,
+    so the cache hit ratio can be monitored.
+    """
+
+    def get(self, key, default=None, version=None, client=None):
+        """Returns the cached value recording whether it was found."""
+
+        value = super(InstrumentedRedisCache, self).get(key, default=MISSING, version=version, client=client)
+
+        if value is MISSING:
+            CACHE_REQUESTS.labels('miss').inc()
+            return default
+
+        CACHE_REQUESTS.labels('hit').inc()
+        return value
+
+    def get_many(self, keys, version=None, client=None):
+        """Returns the cached values recording how many were found."""
+
+        values = super(InstrumentedRedisCache, self).get_many(keys, version=version, client=client)
+
+        CACHE_REQUESTS.labels('hit').inc(len(values))
+        CACHE_REQUESTS.labels('miss').inc(len(keys) - len(values))
+
+        return values
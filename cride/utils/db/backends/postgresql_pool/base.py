@@ -0,0 +1,68 @@
+"""PostgreSQL backend with an in-process connection pool.
+
+Every thread still gets its own connection while it handles a request,
+but closing it gives it back to the pool of the process instead of
+closing the socket. Use it with CONN_MAX_AGE = 0 so connections go back
+to the pool at the end of every request. The pool is configured with
+the POOL key of the database settings:
+
+    'POOL': {
+        'MAX_SIZE': 10,        # Connections per process.
+        'MAX_LIFETIME': 1800,  # Seconds before a connection is replaced.
+        'TIMEOUT': 10,         # Seconds to wait for a connection.
+        'PRE_PING': True,      # Check connections before handing them out.
+    }
+"""
+
+# Django
+from django.db.backends.postgresql.base import DatabaseWrapper as PostgreSQLDatabaseWrapper, Database
+from django.utils.functional import cached_property
+
+# Pool
+from cride.utils.db.pool import PoolClosed, PoolTimeout, get_pool
+
+# Utilities
+from functools import partial
+
+
+class DatabaseWrapper(PostgreSQLDatabaseWrapper):
+    """PostgreSQL database wrapper that borrows its connections from a pool."""
+
+    @cached_property
+    def pool(self):
+        """Returns the pool of this database in the current process."""
+
+        options = self.settings_dict.get('POOL', {})
+        connect = partial(
+            super(DatabaseWrapper, self).get_new_connection,
+            self.get_connection_params()
+        )
+
+        return get_pool(
+            self.alias,
+            connect,
+            max_size=options.get('MAX_SIZE', 10),
+            max_lifetime=options.get('MAX_LIFETIME', 1800),
+            timeout=options.get('TIMEOUT', 10),
+            pre_ping=options.get('PRE_PING', True),
+        )
+
+    def get_new_connection(self, conn_params):
+        """Borrows a connection from the pool."""
+
+        try:
+            connection = self.pool.acquire()
+        except (PoolClosed, PoolTimeout) as error:
+            raise Database.OperationalError(str(error)) from error
+
+        # The pooled connection may have been opened by another thread.
+        self.isolation_level = self.settings_dict['OPTIONS'].get('isolation_level', connection.isolation_level)
+
+        return connection
+
+    def _close(self):
+        """Gives the connection back to the pool."""
+
+        if self.connection is not None:
+            with self.wrap_database_errors:
+                self.pool.release(self.connection)
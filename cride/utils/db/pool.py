@@ -0,0 +1,219 @@
+"""Database connection pool.
+
+Bounded pool of DB-API connections shared by every thread (or greenlet)
+of a process. Connections are checked with a cheap query before being
+handed out, replaced once they reach their maximum lifetime and closed
+when the process drains the pool on shutdown. Under gevent the queries
+only yield to other greenlets because config/gunicorn.py patches
+psycopg2 with psycogreen.
+"""
+
+# Metrics
+from cride.utils import metrics
+
+# Utilities
+import os
+import threading
+import time
+from collections import deque
+
+
+class PoolTimeout(Exception):
+    """No connection was released before the pool timeout."""
+
+
+class PoolClosed(Exception):
+    """The pool is draining and does not hand out connections."""
+
+
+class ConnectionPool:
+    """Connection pool
+
+    Hands out idle connections, opens new ones while there are less than
+    max_size and otherwise waits up to timeout seconds for a release.
+    """
+
+    PING_QUERY = 'SELECT 1'
+
+    def __init__(self, alias, connect, max_size=10, max_lifetime=1800, timeout=10, pre_ping=True):
+        """Stores the pool configuration, no connection is opened yet."""
+
+        self.alias = alias
+        self.connect = connect
+        self.max_size = max_size
+        self.max_lifetime = max_lifetime
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+
+        self.condition = threading.Condition()
+        self.idle = deque()
+        self.opened_at = {}
+        self.in_use = 0
+        self.closing = False
+
+        metrics.DB_POOL_CONNECTIONS.labels(alias, 'max').set(max_size)
+
+    @property
+    def size(self):
+        """Returns the amount of open connections."""
+
+        return self.in_use + len(self.idle)
+
+    def acquire(self):
+        """Returns a healthy connection, waiting for one if the pool is full."""
+
+        start = time.perf_counter()
+        deadline = start + self.timeout
+
+        with self.condition:
+            while True:
+                if self.closing:
+                    raise PoolClosed(f'The {self.alias} connection pool is closed.')
+
+                if self.idle:
+                    connection = self.idle.pop()
+                elif self.size < self.max_size:
+                    connection = None
+                else:
+                    remaining = deadline - time.perf_counter()
+
+                    if remaining <= 0:
+                        metrics.DB_POOL_TIMEOUTS.labels(self.alias).inc()
+                        raise PoolTimeout(
+                            f'No {self.alias} connection was released in {self.timeout} seconds, '
+                            f'all {self.max_size} are in use.'
+                        )
+
+                    self.condition.wait(remaining)
+                    continue
+
+                # Counted as in use while it is checked or opened outside the lock.
+                self.in_use += 1
+                break
+
+        try:
+            if connection is not None and not self.is_healthy(connection):
+                self.discard(connection)
+                connection = None
+
+            if connection is None:
+                connection = self.connect()
+                self.opened_at[id(connection)] = time.monotonic()
+        except BaseException:
+            with self.condition:
+                self.in_use -= 1
+                self.condition.notify()
+            self.report()
+            raise
+
+        metrics.DB_POOL_WAIT.labels(self.alias).observe(time.perf_counter() - start)
+        self.report()
+
+        return connection
+
+    def release(self, connection):
+        """Gives the connection back, closing it if it can't be reused."""
+
+        try:
+            # Ends any transaction left open, a no-op in autocommit mode.
+            connection.rollback()
+            reusable = not connection.closed and not self.is_expired(connection)
+        except Exception:
+            reusable = False
+
+        with self.condition:
+            self.in_use -= 1
+
+            if reusable and not self.closing:
+                self.idle.append(connection)
+            else:
+                self.discard(connection)
+
+            self.condition.notify()
+
+        self.report()
+
+    def is_expired(self, connection):
+        """Returns whether the connection reached its maximum lifetime."""
+
+        opened_at = self.opened_at.get(id(connection), 0)
+
+        return self.max_lifetime is not None and time.monotonic() - opened_at >= self.max_lifetime
+
+    def is_healthy(self, connection):
+        """Returns whether the connection can still be used."""
+
+        if connection.closed or self.is_expired(connection):
+            return False
+
+        if not self.pre_ping:
+            return True
+
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(self.PING_QUERY)
+        except Exception:
+            return False
+
+        return True
+
+    def discard(self, connection):
+        """Closes a connection that leaves the pool."""
+
+        self.opened_at.pop(id(connection), None)
+
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def drain(self, timeout=None):
+        """Stops handing out connections and closes them as they are released."""
+
+        deadline = time.perf_counter() + (self.timeout if timeout is None else timeout)
+
+        with self.condition:
+            self.closing = True
+
+            while self.idle:
+                self.discard(self.idle.pop())
+
+            while self.in_use and time.perf_counter() < deadline:
+                self.condition.wait(deadline - time.perf_counter())
+
+        self.report()
+
+    def report(self):
+        """Updates the pool gauges."""
+
+        metrics.DB_POOL_CONNECTIONS.labels(self.alias, 'in_use').set(self.in_use)
+        metrics.DB_POOL_CONNECTIONS.labels(self.alias, 'idle').set(len(self.idle))
+
+
+_pools = {}
+_pools_lock = threading.Lock()
+
+
+def get_pool(alias, connect, **options):
+    """Returns the pool of the database alias in the current process."""
+
+    key = (os.getpid(), alias)
+
+    with _pools_lock:
+        # A forked process must not share the sockets of its parent.
+        if key not in _pools:
+            _pools[key] = ConnectionPool(alias, connect, **options)
+
+        return _pools[key]
+
+
+def drain_pools(timeout=None):
+    """Drains every pool of the current process."""
+
+    pid = os.getpid()
+
+    with _pools_lock:
+        pools = [pool for (owner, alias), pool in _pools.items() if owner == pid]
+
+    for pool in pools:
+        pool.drain(timeout)
@@ -0,0 +1,83 @@
+"""Database routers."""
+
+# Django
+from django.conf import settings
+from django.core.cache import cache
+
+# Utilities
+import random
+import threading
+from contextlib import contextmanager
+
+
+_state = threading.local()
+
+
+@contextmanager
+def reading_from_replica():
+    """Sends the reads run inside the block to one of the replicas.
+
+    The replica is chosen once, so every read of the block
+    sees the same snapshot of the data.
+    """
+
+    previous = getattr(_state, 'replica', None)
+    _state.replica = random.choice(settings.DATABASE_REPLICAS) if settings.DATABASE_REPLICAS else None
+
+    try:
+        yield _state.replica
+    finally:
+        _state.replica = previous
+
+
+def pin_key(user):
+    """Returns the cache key that marks the user as pinned."""
+
+    return f'db:pinned:{user.pk}'
+
+
+def pin_to_primary(user):
+    """Makes the reads of the user go to the primary for a while.
+
+    Replicas lag behind the primary, so after writing something
+    the user must read from the primary to see their own writes.
+    """
+
+    cache.set(pin_key(user), True, settings.DATABASE_REPLICA_PIN_SECONDS)
+
+
+def is_pinned(user):
+    """Returns whether the user wrote something recently."""
+
+    return bool(cache.get(pin_key(user)))
+
+
+class ReplicaRouter:
+    """Replica router
+
+    Routes the reads to the replica chosen by reading_from_replica,
+    everything else goes to the primary (default) database.
+    """
+
+    def db_for_read(self, model, **hints):
+        """Returns the replica of the current block, if any."""
+
+        return getattr(_state, 'replica', None)
+
+    def db_for_write(self, model, **hints):
+        """Writes always go to the primary."""
+
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        """Replicas hold the same data than the primary."""
+
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        """Replicas get the schema from the primary through replication."""
+
+        if db in settings.DATABASE_REPLICAS:
+            return False
+
+        return None
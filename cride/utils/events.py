@@ -0,0 +1,235 @@
+"""Utils app events module.
+
+Publish/subscribe brokers behind the server-sent events streams.
+Every process keeps the subscribers of its streams in memory and
+receives the messages through a single connection to the broker,
+so thousands of idle streams cost a queue each and not a socket.
+"""
+
+# Django
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+# Redis
+import redis
+
+# Utilities
+import json
+import logging
+import queue
+import threading
+import time
+from collections import defaultdict
+
+
+logger = logging.getLogger('cride.events')
+
+
+class StreamsUnavailable(APIException):
+    """Streams are disabled by EVENTS_STREAMS, the workers are synchronous."""
+
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = 'Event streams are not served by this server.'
+    default_code = 'streams_unavailable'
+
+
+class Subscription:
+    """Subscription
+
+    Queue of the messages published to some channels,
+    read by a single stream.
+    """
+
+    def __init__(self, broker, channels, max_size):
+        """Stores the broker and the channels listened to."""
+
+        self.broker = broker
+        self.channels = channels
+        self.queue = queue.Queue(max_size)
+
+    def get(self, timeout=None):
+        """Returns the next message, or None if nothing arrived in timeout seconds."""
+
+        try:
+            return self.queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+    def put(self, message):
+        """Adds a message, dropped if the stream is not keeping up."""
+
+        try:
+            self.queue.put_nowait(message)
+        except queue.Full:
+            pass
+
+    def close(self):
+        """Stops receiving messages."""
+
+        self.broker.unsubscribe(self)
+
+
+class Broker:
+    """Broker
+
+    Fans out the messages of a channel to the local subscriptions,
+    subclasses decide how messages travel between processes.
+    """
+
+    SUBSCRIPTION_MAX_SIZE = 100
+
+    def __init__(self):
+        """Starts without subscriptions."""
+
+        self.lock = threading.Lock()
+        self.subscriptions = defaultdict(set)
+
+    def publish(self, channel, message):
+        """Sends a message to every subscriber of the channel."""
+
+        raise NotImplementedError
+
+    def subscribe(self, channels):
+        """Returns a subscription to the given channels."""
+
+        subscription = Subscription(self, channels, self.SUBSCRIPTION_MAX_SIZE)
+
+        with self.lock:
+            for channel in channels:
+                self.subscriptions[channel].add(subscription)
+
+        return subscription
+
+    def unsubscribe(self, subscription):
+        """Removes the subscription from its channels."""
+
+        with self.lock:
+            for channel in subscription.channels:
+                self.subscriptions[channel].discard(subscription)
+
+                if not self.subscriptions[channel]:
+                    del self.subscriptions[channel]
+
+    def dispatch(self, channel, message):
+        """Delivers a message to the local subscribers of the channel."""
+
+        with self.lock:
+            subscriptions = list(self.subscriptions.get(channel, ()))
+
+        for subscription in subscriptions:
+            subscription.put(message)
+
+
+class MemoryBroker(Broker):
+    """Memory broker
+
+    Delivers the messages within the process,
+    used by the tests and single process setups.
+    """
+
+    def publish(self, channel, message):
+        """Delivers the message right away."""
+
+        self.dispatch(channel, message)
+
+
+class RedisBroker(Broker):
+    """Redis broker
+
+    Publishes through Redis pub/sub. A listener thread per process
+    receives the messages of every channel and dispatches them to
+    the local subscribers.
+    """
+
+    PREFIX = 'events:'
+    RECONNECT_SECONDS = 1
+
+    def __init__(self, url=None):
+        """Connects to Redis, the listener starts with the first subscription."""
+
+        super(RedisBroker, self).__init__()
+
+        self.client = redis.StrictRedis.from_url(url or settings.EVENTS_REDIS_URL)
+        self.listener = None
+
+    def publish(self, channel, message):
+        """Publishes the message to every process."""
+
+        try:
+            self.client.publish(self.PREFIX + channel, message)
+        except redis.RedisError:
+            # Streams are best effort, the write itself already happened.
+            logger.exception('Could not publish to %s.', channel)
+
+    def subscribe(self, channels):
+        """Starts the listener if needed and subscribes locally."""
+
+        with self.lock:
+            if self.listener is None or not self.listener.is_alive():
+                self.listener = threading.Thread(target=self.listen, name='events-listener', daemon=True)
+                self.listener.start()
+
+        return super(RedisBroker, self).subscribe(channels)
+
+    def listen(self):
+        """Dispatches the published messages, reconnecting when Redis goes away."""
+
+        while True:
+            pubsub = self.client.pubsub(ignore_subscribe_messages=True)
+
+            try:
+                pubsub.psubscribe(self.PREFIX + '*')
+
+                for message in pubsub.listen():
+                    if message['type'] == 'pmessage':
+                        channel = message['channel'].decode()[len(self.PREFIX):]
+                        self.dispatch(channel, message['data'].decode())
+            except redis.RedisError:
+                logger.warning('Lost the events connection, reconnecting.')
+                time.sleep(self.RECONNECT_SECONDS)
+            finally:
+                pubsub.close()
+
+
+_broker = None
+_broker_lock = threading.Lock()
+
+
+def get_broker():
+    """Returns the broker configured in EVENTS_BROKER."""
+
+    global _broker
+
+    with _broker_lock:
+        if _broker is None:
+            _broker = import_string(settings.EVENTS_BROKER)()
+
+        return _broker
+
+
+def format_event(name, data):
+    """Returns a server-sent event frame."""
+
+    return f'event: {name}\ndata: {json.dumps(data, cls=DjangoJSONEncoder)}\n\n'
+
+
+def event_stream(subscription, heartbeat):
+    """Yields the frames of the subscription until the client goes away.
+
+    A comment is sent after heartbeat seconds without events, so proxies
+    keep the connection open and dead clients are noticed.
+    """
+
+    try:
+        yield 'retry: 5000\n\n'
+
+        while True:
+            message = subscription.get(timeout=heartbeat)
+            yield ': keep-alive\n\n' if message is None else message
+    finally:
+        subscription.close()
@@ -0,0 +1,146 @@
+"""Utils app images module.
+
+Profile and circle pictures are not written to the media storage while
+the request waits. The upload is kept in a local pending storage, its
+name is stored in picture_upload, and a task builds the variants of
+PICTURE_VARIANTS in parallel, writes them to the media storage and swaps
+them in. Only the task of the latest upload may swap, so pictures
+uploaded one after the other can not overwrite each other out of order.
+"""
+
+# Django
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import FileSystemStorage, default_storage
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.functional import LazyObject, empty
+
+# Pillow
+from PIL import Image
+
+# Utilities
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from uuid import uuid4
+
+
+logger = logging.getLogger('cride.images')
+
+
+class PendingStorage(LazyObject):
+    """Local storage of the uploads waiting for their variants."""
+
+    def _setup(self):
+        self._wrapped = FileSystemStorage(location=settings.PICTURES_PENDING_ROOT)
+
+
+pending_storage = PendingStorage()
+
+
+@receiver(setting_changed)
+def reset_pending_storage(setting, **kwargs):
+    """Moves the pending storage along with PICTURES_PENDING_ROOT."""
+
+    if setting == 'PICTURES_PENDING_ROOT':
+        pending_storage._wrapped = empty
+
+
+def store_pending(upload):
+    """Writes the upload to the pending storage, returns its name."""
+
+    extension = os.path.splitext(upload.name)[1].lower()
+
+    return pending_storage.save(f'{uuid4().hex}{extension}', upload)
+
+
+def render_variant(image, size, image_format, quality):
+    """Returns the image fitted in a size x size box and encoded."""
+
+    variant = image.copy()
+    variant.thumbnail((size, size), Image.LANCZOS)
+
+    if image_format == 'JPEG' and variant.mode != 'RGB':
+        variant = variant.convert('RGB')
+
+    content = BytesIO()
+    variant.save(content, image_format, quality=quality, optimize=True)
+
+    return content.getvalue()
+
+
+def render_variants(file):
+    """Returns the content of every variant of PICTURE_VARIANTS by field."""
+
+    image = Image.open(file)
+    image.load()
+
+    variants = settings.PICTURE_VARIANTS
+
+    # Pillow releases the GIL while resizing and encoding.
+    with ThreadPoolExecutor(max_workers=len(variants)) as executor:
+        futures = {
+            field: executor.submit(render_variant, image, variant['size'], variant['format'], variant['quality'])
+            for field, variant in variants.items()
+        }
+
+        return {field: future.result() for field, future in futures.items()}
+
+
+def delete_pictures(names):
+    """Deletes the pictures from the media storage, logging the failures."""
+
+    for name in names:
+        try:
+            default_storage.delete(name)
+        except Exception:
+            logger.exception('Could not delete the picture %s.', name)
+
+
+def process_picture(model, pk, upload):
+    """Builds the variants of a pending upload and swaps them in.
+
+    Returns whether the variants were swapped in, False when the
+    instance is gone or a newer upload replaced this one.
+    """
+
+    instance = model.objects.filter(pk=pk, picture_upload=upload).first()
+
+    if instance is None:
+        pending_storage.delete(upload)
+        return False
+
+    names = {}
+
+    try:
+        with pending_storage.open(upload) as file:
+            variants = render_variants(file)
+
+        for field, content in variants.items():
+            extension = settings.PICTURE_VARIANTS[field]['format'].lower().replace('jpeg', 'jpg')
+            name = model._meta.get_field(field).generate_filename(instance, f'{uuid4().hex}.{extension}')
+            names[field] = default_storage.save(name, ContentFile(content))
+    except Exception:
+        # Only the header was checked with the upload, and the upload must
+        # not stay pending whatever failed: decoding, encoding or storing.
+        logger.exception('Could not build the variants of the picture %s of %s %s.', upload, model.__name__, pk)
+        model.objects.filter(pk=pk, picture_upload=upload).update(picture_upload='')
+        delete_pictures(names.values())
+        pending_storage.delete(upload)
+        return False
+
+    swapped = model.objects.filter(pk=pk, picture_upload=upload).update(picture_upload='', **names)
+
+    # Whatever is not referenced anymore goes away: the replaced
+    # variants, or the new ones if a newer upload arrived meanwhile.
+    if swapped:
+        stale = [getattr(instance, field).name for field in names if getattr(instance, field)]
+    else:
+        stale = list(names.values())
+
+    delete_pictures(stale)
+    pending_storage.delete(upload)
+
+    return bool(swapped)
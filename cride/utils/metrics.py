@@ -0,0 +1,234 @@
+"""Utils app metrics module.
+
+Prometheus metrics of the application. When the environment variable
+prometheus_multiproc_dir is set every process writes its samples there
+and the metrics view aggregates them, which is how the gunicorn workers
+and the Celery worker processes report through a single endpoint.
+"""
+
+# Django
+from django.conf import settings
+from django.http import HttpResponse, HttpResponseForbidden
+
+# Celery
+from celery.signals import task_prerun, task_postrun
+
+# Prometheus
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+    start_http_server,
+)
+from prometheus_client.core import GaugeMetricFamily
+
+# Utilities
+import glob
+import os
+import time
+
+
+# Requests
+REQUEST_LATENCY = Histogram(
+    'cride_request_latency_seconds',
+    'Time spent handling a request.',
+    ['view', 'action', 'method']
+)
+REQUESTS = Counter(
+    'cride_requests',
+    'Handled requests.',
+    ['view', 'action', 'method', 'status']
+)
+REQUEST_QUERIES = Histogram(
+    'cride_request_queries',
+    'Database queries run while handling a request.',
+    ['view', 'action'],
+    buckets=(0, 1, 2, 3, 5, 8, 13, 21, 34, 55, 89, 144, float('inf'))
+)
+
+# Cache
+CACHE_REQUESTS = Counter(
+    'cride_cache_requests',
+    'Cache lookups by result.',
+    ['result']
+)
+
+# Database pool
+DB_POOL_WAIT = Histogram(
+    'cride_db_pool_wait_seconds',
+    'Time spent waiting for a pooled database connection.',
+    ['alias'],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 10, float('inf'))
+)
+DB_POOL_CONNECTIONS = Gauge(
+    'cride_db_pool_connections',
+    'Pooled database connections by state, in_use over max is the saturation.',
+    ['alias', 'state'],
+    multiprocess_mode='livesum'
+)
+DB_POOL_TIMEOUTS = Counter(
+    'cride_db_pool_timeouts',
+    'Connection requests that timed out because the pool was full.',
+    ['alias']
+)
+
+# Celery
+TASK_DURATION = Histogram(
+    'cride_celery_task_duration_seconds',
+    'Time spent running a Celery task.',
+    ['task', 'state']
+)
+
+# Business
+RIDES_CREATED = Counter('cride_rides_created', 'Rides offered.')
+RIDE_JOINS = Counter('cride_ride_joins', 'Passengers that joined a ride.')
+INVITATIONS_REDEEMED = Counter('cride_invitations_redeemed', 'Invitations used to join a circle.')
+
+# Counters reconciliation
+COUNTERS_CORRECTED = Counter(
+    'cride_counters_corrected_rows',
+    'Rows whose counters were corrected by the reconciliation.',
+    ['table']
+)
+COUNTERS_DRIFT = Counter(
+    'cride_counters_drift',
+    'Absolute difference between the counters and their recomputed values.',
+    ['table', 'field']
+)
+
+
+def observe_request(view, action, method, status, duration, queries):
+    """Records a handled request."""
+
+    REQUEST_LATENCY.labels(view, action, method).observe(duration)
+    REQUESTS.labels(view, action, method, f'{status // 100}xx').inc()
+    REQUEST_QUERIES.labels(view, action).observe(queries)
+
+
+_task_starts = {}
+
+
+@task_prerun.connect
+def task_started(task_id=None, **kwargs):
+    """Remembers when the task started."""
+
+    _task_starts[task_id] = time.perf_counter()
+
+
+@task_postrun.connect
+def task_finished(task_id=None, task=None, state=None, **kwargs):
+    """Records how long the task took."""
+
+    start = _task_starts.pop(task_id, None)
+
+    if start is not None:
+        TASK_DURATION.labels(task.name, state or 'UNKNOWN').observe(time.perf_counter() - start)
+
+
+class CeleryQueueCollector:
+    """Celery queue collector
+
+    Reports, at scrape time, the amount of messages
+    waiting in every Celery queue of the broker.
+    """
+
+    def collect(self):
+        """Asks the broker for the length of each queue."""
+
+        # Celery
+        from cride.taskapp.celery import app
+
+        gauge = GaugeMetricFamily(
+            'cride_celery_queue_length',
+            'Messages waiting in a Celery queue.',
+            labels=['queue']
+        )
+
+        with app.connection_for_read() as connection:
+            try:
+                connection.ensure_connection(max_retries=1)
+            except connection.connection_errors:
+                return
+
+            for queue in settings.METRICS_CELERY_QUEUES:
+                with connection.channel() as channel:
+                    try:
+                        length = channel.queue_declare(queue=queue, passive=True).message_count
+                    except connection.channel_errors:
+                        # The queue was never declared, nothing was sent to it.
+                        length = 0
+
+                gauge.add_metric([queue], length)
+
+        yield gauge
+
+
+queues_registry = CollectorRegistry(auto_describe=False)
+queues_registry.register(CeleryQueueCollector())
+
+
+class MultiProcessDirsCollector(multiprocess.MultiProcessCollector):
+    """Multiprocess dirs collector
+
+    Merges the samples written to several multiprocess directories,
+    as if every process had written to the same one.
+    """
+
+    def __init__(self, registry, paths):
+        self._paths = paths
+        registry.register(self)
+
+    def collect(self):
+        """Merges the samples of every file of the directories."""
+
+        files = [file for path in self._paths for file in glob.glob(os.path.join(path, '*.db'))]
+
+        return self.merge(files, accumulate=True)
+
+
+def get_registry():
+    """Returns the registry with the samples of every process.
+
+    The directories of METRICS_MULTIPROC_DIRS that exist are merged
+    in, which is how the web exports the Celery task metrics.
+    """
+
+    if 'prometheus_multiproc_dir' not in os.environ:
+        return REGISTRY
+
+    paths = [os.environ['prometheus_multiproc_dir']]
+    for path in settings.METRICS_MULTIPROC_DIRS:
+        if os.path.isdir(path) and not any(os.path.samefile(path, known) for known in paths):
+            paths.append(path)
+
+    registry = CollectorRegistry()
+    MultiProcessDirsCollector(registry, paths)
+
+    return registry
+
+
+def metrics_view(request):
+    """Exports the metrics in the Prometheus text format.
+
+    If METRICS_TOKEN is set, it must be sent as a bearer token.
+    """
+
+    token = settings.METRICS_TOKEN
+
+    if token and request.META.get('HTTP_AUTHORIZATION') != f'Bearer {token}':
+        return HttpResponseForbidden()
+
+    content = generate_latest(get_registry()) + generate_latest(queues_registry)
+
+    return HttpResponse(content, content_type=CONTENT_TYPE_LATEST)
+
+
+def start_worker_server(port):
+    """Exports the metrics of a Celery worker and its child processes."""
+
+    start_http_server(port, registry=get_registry())
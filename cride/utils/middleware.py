@@ -0,0 +1,255 @@
+"""Utils app middleware module."""
+
+# Django
+from django.conf import settings
+from django.db import connections
+
+# Metrics
+from cride.utils import metrics
+
+# Routers
+from cride.utils.db.routers import pin_to_primary
+
+# Utilities
+import json
+import logging
+import random
+import re
+import time
+from collections import Counter
+from contextlib import ExitStack
+
+
+logger = logging.getLogger('cride.sql')
+
+
+class QueryCounter:
+    """Query counter
+
+    Database execute wrapper that counts and times
+    the statements run on a connection.
+    """
+
+    def __init__(self):
+        """Starts every statistic at zero."""
+
+        self.count = 0
+        self.duration = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        """Times the statement and stores its statistics."""
+
+        start = time.perf_counter()
+
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.record(sql, time.perf_counter() - start)
+
+    def record(self, sql, duration):
+        """Adds the statement to the statistics."""
+
+        self.count += 1
+        self.duration += duration
+
+
+class QueryCollector(QueryCounter):
+    """Query collector
+
+    Query counter that also records which statements
+    were repeated and which one was the slowest.
+    """
+
+    LITERALS_REGEX = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+    PLACEHOLDER_LIST_REGEX = re.compile(r'\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)')
+    SPACES_REGEX = re.compile(r'\s+')
+
+    def __init__(self):
+        """Starts every statistic at zero."""
+
+        super(QueryCollector, self).__init__()
+
+        self.fingerprints = Counter()
+        self.slowest_sql = ''
+        self.slowest_duration = 0.0
+
+    def record(self, sql, duration):
+        """Adds the statement to the statistics."""
+
+        super(QueryCollector, self).record(sql, duration)
+
+        self.fingerprints[self.fingerprint(sql)] += 1
+
+        if duration > self.slowest_duration:
+            self.slowest_duration = duration
+            self.slowest_sql = sql
+
+    @classmethod
+    def fingerprint(cls, sql):
+        """Returns the statement without literals, so equivalent queries match."""
+
+        sql = cls.LITERALS_REGEX.sub('?', sql)
+        sql = cls.PLACEHOLDER_LIST_REGEX.sub('(...)', sql)
+
+        return cls.SPACES_REGEX.sub(' ', sql).strip()
+
+    @property
+    def duplicates(self):
+        """Returns the fingerprints that were executed more than once."""
+
+        return {sql: count for sql, count in self.fingerprints.items() if count > 1}
+
+
+def instrument_connections(stack, wrapper):
+    """Installs the execute wrapper on every database connection of the stack."""
+
+    for alias in connections:
+        stack.enter_context(connections[alias].execute_wrapper(wrapper))
+
+
+class QueryInstrumentationMiddleware:
+    """Query instrumentation middleware
+
+    Records the SQL cost of a sample of the requests and reports it
+    both as a Server-Timing header and as a structured log line.
+    The sample rate is given by SQL_INSTRUMENTATION_SAMPLE_RATE, requests
+    out of the sample only pay for one random number.
+    """
+
+    SLOWEST_SQL_MAX_LENGTH = 500
+
+    def __init__(self, get_response):
+        """Stores the next handler and the sample rate."""
+
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, 'SQL_INSTRUMENTATION_SAMPLE_RATE', 0)
+
+    def __call__(self, request):
+        """Instruments every connection while the request is handled."""
+
+        if not self.sample_rate or random.random() >= self.sample_rate:
+            return self.get_response(request)
+
+        collector = QueryCollector()
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            instrument_connections(stack, collector)
+            response = self.get_response(request)
+
+        elapsed = time.perf_counter() - start
+
+        response['Server-Timing'] = self.server_timing(collector, elapsed)
+        self.log(request, response, collector, elapsed)
+
+        return response
+
+    def server_timing(self, collector, elapsed):
+        """Returns the Server-Timing header value."""
+
+        timings = [
+            f'app;dur={elapsed * 1000:.2f}',
+            f'db;dur={collector.duration * 1000:.2f};desc="{collector.count} queries"',
+            f'db-slowest;dur={collector.slowest_duration * 1000:.2f}',
+            f'db-duplicates;desc="{sum(collector.duplicates.values())}"',
+        ]
+
+        return ', '.join(timings)
+
+    def log(self, request, response, collector, elapsed):
+        """Logs the request statistics as a single JSON line."""
+
+        match = request.resolver_match
+
+        record = {
+            'method': request.method,
+            'path': request.path,
+            'view': match.view_name if match else None,
+            'status': response.status_code,
+            'duration_ms': round(elapsed * 1000, 2),
+            'queries': collector.count,
+            'db_duration_ms': round(collector.duration * 1000, 2),
+            'duplicates': collector.duplicates,
+            'slowest_ms': round(collector.slowest_duration * 1000, 2),
+            'slowest_sql': collector.slowest_sql[:self.SLOWEST_SQL_MAX_LENGTH],
+        }
+
+        logger.info(json.dumps(record))
+
+
+class MetricsMiddleware:
+    """Metrics middleware
+
+    Observes the latency and the number of queries of every
+    request, labeled with the view and the viewset action.
+    """
+
+    def __init__(self, get_response):
+        """Stores the next handler."""
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Counts the queries of the request and records its metrics."""
+
+        counter = QueryCounter()
+        start = time.perf_counter()
+
+        with ExitStack() as stack:
+            instrument_connections(stack, counter)
+            response = self.get_response(request)
+
+        view, action = getattr(request, 'metrics_labels', ('unresolved', ''))
+        metrics.observe_request(
+            view,
+            action,
+            request.method,
+            response.status_code,
+            time.perf_counter() - start,
+            counter.count
+        )
+
+        return response
+
+    def process_view(self, request, view_func, view_args, view_kwargs):
+        """Stores the labels of the view that will handle the request."""
+
+        view = getattr(view_func, 'cls', None)
+
+        if view is None:
+            request.metrics_labels = (request.resolver_match.view_name, '')
+        else:
+            actions = getattr(view_func, 'actions', None) or {}
+            method = request.method.lower()
+            request.metrics_labels = (view.__name__, actions.get(method, method))
+
+
+class PrimaryPinningMiddleware:
+    """Primary pinning middleware
+
+    Pins the user to the primary database after every
+    successful write, see cride.utils.db.routers. Views
+    may set request.wrote when the method does not tell.
+    """
+
+    SAFE_METHODS = ('GET', 'HEAD', 'OPTIONS')
+
+    def __init__(self, get_response):
+        """Stores the next handler."""
+
+        self.get_response = get_response
+
+    def __call__(self, request):
+        """Pins the user if the request wrote something."""
+
+        response = self.get_response(request)
+
+        wrote = getattr(request, 'wrote', request.method not in self.SAFE_METHODS)
+
+        if wrote and response.status_code < 400:
+            user = getattr(request, 'user', None)
+
+            if user is not None and user.is_authenticated:
+                pin_to_primary(user)
+
+        return response
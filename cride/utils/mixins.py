@@ -1,6 +1,16 @@
 """Utils app mixins module."""
 
+# Django
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.http import HttpResponse, JsonResponse
+from django.utils import timezone
+
 # Django REST Framework
+from rest_framework.exceptions import Throttled
+from rest_framework.response import Response
+from rest_framework.throttling import BaseThrottle
 from rest_framework.viewsets import GenericViewSet
 
 # Models
@@ -9,6 +19,23 @@ from cride.circles.models import Circle
 # Django REST Framework
 from rest_framework.generics import get_object_or_404
 
+# Routers
+from cride.utils.db.routers import is_pinned, reading_from_replica
+
+# Batch
+from cride.utils.batch import memoize
+
+# Serializers
+from cride.utils.serializers import SparseFieldsMixin, prune_queryset
+
+# Throttling
+from cride.utils.throttling import get_buckets
+
+# Utilities
+import hashlib
+from contextlib import ExitStack
+from datetime import datetime
+
 
 class AddCircleMixin(GenericViewSet):
     """Add circle mixin
@@ -17,14 +44,283 @@ class AddCircleMixin(GenericViewSet):
     that require it.
     """
 
-    def dispatch(self, request, *args, **kwargs):
-        """Return the normal dispatch but adds the circle model."""
+    def initial(self, request, *args, **kwargs):
+        """Adds the circle model before the request is authenticated."""
 
         slug_name = self.kwargs['slug_name']
 
-        self.circle = get_object_or_404(
+        self.circle = memoize(request, ('circle', slug_name), lambda: get_object_or_404(
             Circle,
             slug_name=slug_name
-        )
+        ))
+
+        super(AddCircleMixin, self).initial(request, *args, **kwargs)
+
+
+def idempotency_cache_key(request, idempotency_key):
+    """Returns the cache key of a request sent with an Idempotency-Key."""
+
+    scope = '\n'.join([
+        request.META['HTTP_AUTHORIZATION'],
+        request.method,
+        request.path,
+        idempotency_key,
+    ])
+
+    return f'idempotency:{hashlib.sha256(scope.encode()).hexdigest()}'
+
+
+class IdempotencyMixin(GenericViewSet):
+    """Idempotency mixin
+
+    Requests of the actions in idempotent_actions sent with an
+    Idempotency-Key header run once, retries with the same key get the
+    stored response back for IDEMPOTENCY_KEY_SECONDS without being
+    authenticated, throttled or validated again. Keys are scoped to the
+    credentials, method and path, and locked while the first request
+    runs. Must come before the other mixins.
+    """
+
+    idempotent_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        """Replays the stored response of the key, or stores the new one."""
+
+        idempotency_key = request.META.get('HTTP_IDEMPOTENCY_KEY')
+        action = self.action_map.get(request.method.lower())
+
+        if not idempotency_key or action not in self.idempotent_actions or 'HTTP_AUTHORIZATION' not in request.META:
+            return super(IdempotencyMixin, self).dispatch(request, *args, **kwargs)
+
+        key = idempotency_cache_key(request, idempotency_key)
+        fingerprint = hashlib.sha256(request.body).hexdigest()
+        stored = cache.get(key)
+
+        if stored is not None:
+            return self.replay(stored, fingerprint)
+
+        # add() answers None when the cache is down, the request runs unlocked then.
+        if cache.add(f'{key}:lock', fingerprint, settings.IDEMPOTENCY_LOCK_SECONDS) is False:
+            return JsonResponse({'detail': 'A request with this Idempotency-Key is in progress.'}, status=409)
+
+        try:
+            response = super(IdempotencyMixin, self).dispatch(request, *args, **kwargs)
+
+            # Failures and rejections can be retried.
+            if response.status_code < 500 and response.status_code != 429:
+                response.render()
+                cache.set(key, {
+                    'fingerprint': fingerprint,
+                    'status': response.status_code,
+                    'content_type': response['Content-Type'],
+                    'content': response.content,
+                }, settings.IDEMPOTENCY_KEY_SECONDS)
+        finally:
+            cache.delete(f'{key}:lock')
+
+        return response
+
+    def replay(self, stored, fingerprint):
+        """Returns the stored response, if the key was used for the same body."""
+
+        if stored['fingerprint'] != fingerprint:
+            return JsonResponse({'detail': 'This Idempotency-Key was used for another request.'}, status=422)
+
+        response = HttpResponse(stored['content'], status=stored['status'], content_type=stored['content_type'])
+        response['Idempotent-Replayed'] = 'true'
+
+        return response
+
+
+class ThrottleMixin(GenericViewSet):
+    """Throttle mixin
+
+    Takes a token from every bucket of the action in THROTTLE_RATES,
+    keyed '<throttle_scope>.<action>' and mapping 'ip', 'circle' or
+    'user' to a rate. The IP and circle buckets are checked before
+    anything else, the user ones right after the authentication, so
+    the throttled requests never reach the permissions nor the action.
+    Must come before the other mixins.
+    """
+
+    throttle_scope = None
+
+    def initial(self, request, *args, **kwargs):
+        """Checks the buckets that don't need the user."""
+
+        self.throttle_buckets(request, ('ip', 'circle'))
+
+        super(ThrottleMixin, self).initial(request, *args, **kwargs)
+
+    def perform_authentication(self, request):
+        """Checks the user buckets once the user is known."""
+
+        super(ThrottleMixin, self).perform_authentication(request)
+
+        if request.user.is_authenticated:
+            self.throttle_buckets(request, ('user',))
+
+    def throttle_buckets(self, request, kinds):
+        """Takes a token from the buckets of the given kinds, raises Throttled if one is empty."""
+
+        scope = f'{self.throttle_scope}.{self.action}'
+        rates = settings.THROTTLE_RATES.get(scope, {})
+
+        for kind in kinds:
+            if kind not in rates:
+                continue
+
+            if kind == 'ip':
+                ident = BaseThrottle().get_ident(request)
+            elif kind == 'circle':
+                ident = self.kwargs['slug_name']
+            else:
+                ident = request.user.pk
+
+            taken, wait = get_buckets().take(f'{scope}:{kind}:{ident}', rates[kind])
+
+            if not taken:
+                raise Throttled(wait=wait)
+
+
+class ReplicaReadMixin(GenericViewSet):
+    """Replica read mixin
+
+    Serves the GET requests of the actions listed in replica_actions
+    from a read replica, unless the user wrote something recently
+    and has been pinned to the primary database.
+    """
+
+    replica_actions = ('list', 'retrieve')
+
+    def dispatch(self, request, *args, **kwargs):
+        """Keeps the replica selected until the response is ready."""
+
+        with ExitStack() as self.replica_stack:
+            return super(ReplicaReadMixin, self).dispatch(request, *args, **kwargs)
+
+    def initial(self, request, *args, **kwargs):
+        """Selects a replica once the action and the user are known."""
+
+        if self.should_read_from_replica(request):
+            self.replica_stack.enter_context(reading_from_replica())
+
+        super(ReplicaReadMixin, self).initial(request, *args, **kwargs)
+
+    def should_read_from_replica(self, request):
+        """Returns whether the request can be served from a replica."""
+
+        if request.method != 'GET' or self.action not in self.replica_actions:
+            return False
+
+        user = request.user
+
+        return not (user.is_authenticated and is_pinned(user))
+
+
+class TransactionPolicyMixin(GenericViewSet):
+    """Transaction policy mixin
+
+    Runs the actions listed in atomic_actions inside a transaction
+    that starts once the request is authenticated and allowed, the
+    rest of the actions run in autocommit mode so pure reads don't
+    pay for the BEGIN and COMMIT round trips.
+    """
+
+    atomic_actions = ()
+
+    def dispatch(self, request, *args, **kwargs):
+        """Commits the transaction of the action, unless it failed."""
+
+        self.in_transaction = False
+
+        with ExitStack() as self.transaction_stack:
+            response = super(TransactionPolicyMixin, self).dispatch(request, *args, **kwargs)
+
+            # Handled exceptions become responses, they must not be committed.
+            if self.in_transaction and getattr(response, 'exception', False):
+                transaction.set_rollback(True)
+
+            return response
+
+    def initial(self, request, *args, **kwargs):
+        """Opens the transaction once the request may run the action."""
+
+        super(TransactionPolicyMixin, self).initial(request, *args, **kwargs)
+
+        if self.action in self.atomic_actions:
+            self.transaction_stack.enter_context(transaction.atomic())
+            self.in_transaction = True
+
+
+def compact_value(value):
+    """Returns a projected value the way the serializers would render it."""
+
+    if isinstance(value, datetime):
+        value = timezone.localtime(value).isoformat()
+
+        if value.endswith('+00:00'):
+            value = value[:-6] + 'Z'
+
+    return value
+
+
+class CompactListMixin(GenericViewSet):
+    """Compact list mixin
+
+    Answers the list requests with ?view=compact (or every list request
+    when default_list_view is 'compact') from a .values() projection of
+    the columns in compact_fields, a mapping of output names to lookups.
+    No model instances nor serializer fields are built for them.
+    """
+
+    compact_fields = {}
+    default_list_view = 'full'
+
+    def list(self, request, *args, **kwargs):
+        """Returns the compact representation when it was requested."""
+
+        if request.query_params.get('view', self.default_list_view) != 'compact':
+            return super(CompactListMixin, self).list(request, *args, **kwargs)
+
+        queryset = self.filter_queryset(self.get_queryset())
+        queryset = queryset.prefetch_related(None).values(*self.compact_fields.values())
+
+        page = self.paginate_queryset(queryset)
+        data = self.get_compact_data(list(queryset) if page is None else page)
+
+        if page is None:
+            return Response(data)
+
+        return self.get_paginated_response(data)
+
+    def get_compact_data(self, rows):
+        """Returns the projected rows with the output names."""
+
+        fields = list(self.compact_fields.items())
+
+        return [{name: compact_value(row[lookup]) for name, lookup in fields} for row in rows]
+
+
+class SparseQuerysetMixin(GenericViewSet):
+    """Sparse queryset mixin
+
+    Joins and prefetches the relations the serializer of the
+    sparse_actions renders, so fields left out with ?fields= or
+    collapsed without ?expand= cost no queries.
+    """
+
+    sparse_actions = ('list', 'retrieve')
+
+    def filter_queryset(self, queryset):
+        """Prunes the relations loaded to the requested fields."""
+
+        queryset = super(SparseQuerysetMixin, self).filter_queryset(queryset)
+
+        if self.action in self.sparse_actions:
+            serializer = self.get_serializer()
+
+            if isinstance(serializer, SparseFieldsMixin):
+                queryset = prune_queryset(queryset, serializer)
 
-        return super(AddCircleMixin, self).dispatch(request, *args, **kwargs)
+        return queryset
@@ -0,0 +1,50 @@
+"""Utils app parsers module."""
+
+# Django REST Framework
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import BaseParser, JSONParser
+
+# Renderers
+from cride.utils.renderers import MessagePackRenderer, ORJSONRenderer, orjson
+
+# Encoders
+import msgpack
+
+
+class ORJSONParser(JSONParser):
+    """orjson parser
+
+    Parses UTF-8 JSON bodies with orjson, or
+    with the json module when it is not installed.
+    """
+
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Returns the decoded body."""
+
+        if orjson is None:
+            return super(ORJSONParser, self).parse(stream, media_type, parser_context)
+
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as error:
+            raise ParseError(f'JSON parse error - {error}')
+
+
+class MessagePackParser(BaseParser):
+    """MessagePack parser
+
+    Parses application/msgpack bodies.
+    """
+
+    media_type = 'application/msgpack'
+    renderer_class = MessagePackRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        """Returns the unpacked body."""
+
+        try:
+            return msgpack.unpackb(stream.read(), raw=False)
+        except ValueError as error:
+            raise ParseError(f'MessagePack parse error - {error}')
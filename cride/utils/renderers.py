@@ -0,0 +1,92 @@
+"""Utils app renderers module."""
+
+# Django REST Framework
+from rest_framework.utils.encoders import JSONEncoder
+from rest_framework.renderers import BaseRenderer, JSONRenderer
+
+# Events
+from cride.utils.events import format_event
+
+# Encoders
+import msgpack
+
+try:
+    import orjson
+except ImportError:
+    # Optional, see requirements/base.txt.
+    orjson = None
+
+
+def encode_default(value):
+    """Encodes what orjson and msgpack do not know the way DRF's encoder does.
+
+    Datetimes, decimals, durations, lazy strings and querysets end up
+    with the same representation the default JSON renderer gives them.
+    """
+
+    return JSONEncoder().default(value)
+
+
+class ORJSONRenderer(JSONRenderer):
+    """orjson renderer
+
+    Drop-in replacement of the JSON renderer built on orjson,
+    several times faster on large lists. Indented output,
+    asked for by the browsable API, and installs without
+    orjson still use the json module.
+    """
+
+    options = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME if orjson else None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Renders the data as compact JSON."""
+
+        if data is None:
+            return bytes()
+
+        if orjson is None or self.get_indent(accepted_media_type, renderer_context or {}) is not None:
+            return super(ORJSONRenderer, self).render(data, accepted_media_type, renderer_context)
+
+        content = orjson.dumps(data, default=encode_default, option=self.options)
+
+        # Keep the output a strict javascript subset, like the JSON renderer does.
+        return content.replace(b'\xe2\x80\xa8', b'\\u2028').replace(b'\xe2\x80\xa9', b'\\u2029')
+
+
+class MessagePackRenderer(BaseRenderer):
+    """MessagePack renderer
+
+    Answers the requests accepting application/msgpack,
+    with the same values the JSON renderers produce.
+    """
+
+    media_type = 'application/msgpack'
+    format = 'msgpack'
+    charset = None
+    render_style = 'binary'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Packs the data."""
+
+        if data is None:
+            return bytes()
+
+        return msgpack.packb(data, default=encode_default, use_bin_type=True)
+
+
+class EventStreamRenderer(BaseRenderer):
+    """Event stream renderer
+
+    Lets the views answer text/event-stream requests. Streams build
+    their own response, so only error payloads go through here and
+    they are sent as a single error event.
+    """
+
+    media_type = 'text/event-stream'
+    format = 'event-stream'
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        """Renders the payload as an error event."""
+
+        return format_event('error', data).encode(self.charset)
@@ -0,0 +1,294 @@
+"""Utils app serializers module.
+
+Sparse fieldsets and opt-in expansion. Read requests carrying
+?fields= or ?expand= only get the fields they asked for:
+
+    ?fields=id,offered_by,passengers&expand=offered_by.profile
+
+Nested serializers listed in expandable_fields are collapsed to
+their slug (e.g. the username) unless named in ?expand=, nested
+paths are separated by dots. Requests without either parameter
+get every field expanded, as always.
+
+constraint_errors turns the violations of the database constraints
+into the validation errors the serializers used to check for.
+
+DeferredPictureMixin hands the uploaded pictures to a task, see
+cride.utils.images. Their fields only read the picture header.
+
+The batch serializers validate the sub-requests of POST /batch/,
+see cride.utils.batch.
+"""
+
+# Django
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import IntegrityError, models, transaction
+
+# Django REST Framework
+from rest_framework import serializers
+
+# Pillow
+from PIL import Image
+
+# Images
+from cride.utils.images import store_pending
+
+# Utilities
+from contextlib import contextmanager
+
+
+def parse_fieldset(value):
+    """Returns the names of a comma separated parameter, None when it was not sent."""
+
+    if value is None:
+        return None
+
+    return {name.strip() for name in value.split(',') if name.strip()}
+
+
+def nested_fieldset(names, prefix):
+    """Returns the names under prefix without it, None when every name is."""
+
+    if names is None or prefix in names:
+        return None
+
+    prefix = f'{prefix}.'
+
+    return {name[len(prefix):] for name in names if name.startswith(prefix)}
+
+
+def requests(names, name):
+    """Returns whether name, or a path under it, is in names."""
+
+    return name in names or any(path.startswith(f'{name}.') for path in names)
+
+
+def serializer_of(field):
+    """Returns the serializer behind a field, if it is a nested one."""
+
+    field = getattr(field, 'child', field)
+
+    return field if isinstance(field, SparseFieldsMixin) else None
+
+
+class SparseFieldsMixin:
+    """Sparse fields serializer mixin
+
+    Reads ?fields= and ?expand= of safe requests, or the fields and
+    expand arguments, and keeps only the requested fields. Nested
+    serializers named in expandable_fields are replaced by their slug,
+    or dropped when it is None, unless they are expanded.
+    """
+
+    expandable_fields = {}
+
+    def __init__(self, *args, **kwargs):
+        """Drops the fields that were not requested."""
+
+        fields = kwargs.pop('fields', None)
+        expand = kwargs.pop('expand', None)
+
+        super(SparseFieldsMixin, self).__init__(*args, **kwargs)
+
+        request = self.context.get('request')
+
+        if fields is None and expand is None and request is not None and request.method in ('GET', 'HEAD'):
+            fields = parse_fieldset(request.query_params.get('fields'))
+            expand = parse_fieldset(request.query_params.get('expand'))
+
+        if fields is not None or expand is not None:
+            self.sparsify(fields, expand or set())
+
+    def sparsify(self, fields, expand):
+        """Keeps the requested fields and collapses the nested ones not expanded."""
+
+        for name in list(self.fields):
+            if fields is not None and not requests(fields, name):
+                self.fields.pop(name)
+                continue
+
+            field = self.fields[name]
+            nested = serializer_of(field)
+            expanded = requests(expand, name) or (fields is not None and requests(fields - {name}, name))
+
+            if name in self.expandable_fields and not expanded:
+                self.fields.pop(name)
+                slug = self.expandable_fields[name]
+
+                if slug is not None:
+                    self.fields[name] = serializers.SlugRelatedField(
+                        slug_field=slug,
+                        source=field.source if field.source != name else None,
+                        many=isinstance(field, serializers.ListSerializer),
+                        read_only=True
+                    )
+            elif nested is not None:
+                nested.sparsify(nested_fieldset(fields, name), nested_fieldset(expand, name) or set())
+
+
+@contextmanager
+def constraint_errors(errors, savepoint=True):
+    """Raises errors[constraint] as a ValidationError when a write violates a constraint.
+
+    The write runs in a savepoint, so the transaction around it is
+    still usable after the violation. Writes whose transaction is
+    rolled back with the error anyway can save its round trips.
+    """
+
+    try:
+        with transaction.atomic(savepoint=savepoint):
+            yield
+    except IntegrityError as error:
+        constraint = getattr(getattr(error.__cause__, 'diag', None), 'constraint_name', None)
+
+        if constraint not in errors:
+            raise
+
+        raise serializers.ValidationError(errors[constraint])
+
+
+class PictureField(serializers.ImageField):
+    """Picture field
+
+    Checks the format and the size of the picture from its header,
+    without decoding or verifying the rest of the file while the
+    request waits. The variants task decodes it.
+    """
+
+    default_error_messages = {
+        'too_many_pixels': 'Pictures can not have more than {max_pixels} pixels.',
+    }
+
+    def to_internal_value(self, data):
+        """Returns the uploaded file once its header was checked."""
+
+        file_object = serializers.FileField.to_internal_value(self, data)
+
+        try:
+            image = Image.open(file_object)
+        except (OSError, SyntaxError, Image.DecompressionBombError):
+            self.fail('invalid_image')
+
+        if image.format not in settings.PICTURES_FORMATS:
+            self.fail('invalid_image')
+
+        if image.width * image.height > settings.PICTURES_MAX_PIXELS:
+            self.fail('too_many_pixels', max_pixels=settings.PICTURES_MAX_PIXELS)
+
+        file_object.seek(0)
+
+        return file_object
+
+
+class DeferredPictureMixin:
+    """Deferred picture serializer mixin
+
+    Keeps the uploaded picture in the pending storage and lets
+    picture_task, called with the pk and the pending name once the
+    transaction commits, build its variants and swap them in.
+    """
+
+    picture_task = None
+
+    serializer_field_mapping = dict(serializers.ModelSerializer.serializer_field_mapping)
+    serializer_field_mapping[models.ImageField] = PictureField
+
+    def create(self, validated_data):
+        """Creates the instance without writing the picture."""
+
+        picture = self.pop_picture(validated_data)
+        instance = super(DeferredPictureMixin, self).create(validated_data)
+        self.defer_picture(instance, picture)
+
+        return instance
+
+    def update(self, instance, validated_data):
+        """Updates the instance without writing the picture."""
+
+        picture = self.pop_picture(validated_data)
+        instance = super(DeferredPictureMixin, self).update(instance, validated_data)
+        self.defer_picture(instance, picture)
+
+        return instance
+
+    def pop_picture(self, validated_data):
+        """Takes a new picture out of the data, removals are saved right away."""
+
+        if validated_data.get('picture') is None:
+            return None
+
+        return validated_data.pop('picture')
+
+    def defer_picture(self, instance, picture):
+        """Stores the picture as pending and schedules its processing.
+
+        Without PICTURES_DEFERRED the variants are built before answering.
+        """
+
+        if picture is None:
+            return
+
+        upload = store_pending(picture)
+        type(instance).objects.filter(pk=instance.pk).update(picture_upload=upload)
+        instance.picture_upload = upload
+
+        task = type(self).picture_task
+        if settings.PICTURES_DEFERRED:
+            transaction.on_commit(lambda: task.delay(instance.pk, upload))
+        else:
+            task(instance.pk, upload)
+            instance.refresh_from_db()
+
+
+def prune_queryset(queryset, serializer, prefix='', prefetching=False):
+    """Joins or prefetches the relations the serializer will render, and only those."""
+
+    model = serializer.Meta.model
+
+    for field in serializer.fields.values():
+        if field.source == '*' or '.' in field.source:
+            continue
+
+        try:
+            relation = model._meta.get_field(field.source)
+        except FieldDoesNotExist:
+            continue
+
+        if not relation.is_relation:
+            continue
+
+        lookup = prefix + field.source
+        many = relation.many_to_many or relation.one_to_many
+
+        if many or prefetching:
+            queryset = queryset.prefetch_related(lookup)
+        else:
+            queryset = queryset.select_related(lookup)
+
+        nested = serializer_of(field)
+
+        if nested is not None:
+            queryset = prune_queryset(queryset, nested, f'{lookup}__', prefetching or many)
+
+    return queryset
+
+
+class BatchRequestSerializer(serializers.Serializer):
+    """Sub-request of a batch."""
+
+    METHODS = ('GET', 'POST', 'PUT', 'PATCH', 'DELETE')
+
+    method = serializers.ChoiceField(choices=METHODS, default='GET')
+    path = serializers.RegexField(r'^/(?!batch/)', max_length=2000)
+    body = serializers.JSONField(required=False)
+
+
+class BatchSerializer(serializers.Serializer):
+    """Batch of sub-requests, run in order."""
+
+    requests = serializers.ListField(
+        child=BatchRequestSerializer(),
+        min_length=1,
+        max_length=settings.BATCH_MAX_REQUESTS
+    )
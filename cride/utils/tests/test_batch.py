@@ -0,0 +1,104 @@
+"""Utils app batch tests."""
+
+# Django
+from django.db import connection
+from django.shortcuts import reverse
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Views
+from cride.circles.views.circles import CircleModelViewSet
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle, Membership
+from rest_framework.authtoken.models import Token
+
+# Utilities
+from unittest import mock
+
+
+class BatchEndPointTestCase(APITestCase):
+    """Manages testing of the batch endpoint."""
+
+    def setUp(self):
+        """Creates a member of two circles."""
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True,
+            is_client=True
+        )
+        Profile.objects.create(user=self.user)
+
+        for slug_name in ('ciencias-unam', 'fciencias'):
+            circle = Circle.objects.create(name=slug_name, slug_name=slug_name, about='Circle.', is_public=True)
+            Membership.objects.create(user=self.user, circle=circle)
+
+        token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    def batch(self, *requests):
+        """Posts the sub-requests and returns the response."""
+
+        return self.client.post(reverse('batch'), {'requests': list(requests)}, format='json')
+
+    def test_sub_requests_are_answered_in_order(self):
+        """Every sub-request gets its status and body."""
+
+        response = self.batch(
+            {'path': '/users/cheke/'},
+            {'path': '/circles/?limit=1'},
+            {'path': '/circles/ciencias-unam/rides/'},
+            {'path': '/circles/unknown/rides/'},
+            {'method': 'POST', 'path': '/users/login/', 'body': {'email': 'c@a.com'}},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.data['responses']], [200, 200, 200, 404, 400])
+
+        user, circles, rides = [item['body'] for item in response.data['responses'][:3]]
+        self.assertEqual(user['user']['username'], 'cheke')
+        self.assertEqual(len(circles['results']), 1)
+        self.assertEqual(rides['count'], 0)
+
+    def test_token_and_memberships_are_resolved_once(self):
+        """The token is looked up by the batch only, memberships once per circle."""
+
+        with CaptureQueriesContext(connection) as queries:
+            self.batch(
+                {'path': '/circles/ciencias-unam/rides/'},
+                {'path': '/circles/ciencias-unam/members/'},
+                {'path': '/circles/fciencias/rides/'},
+            )
+
+        tables = [query['sql'].split(' FROM ')[1].split()[0] for query in queries if ' FROM ' in query['sql']]
+
+        self.assertEqual(tables.count('"authtoken_token"'), 1)
+        self.assertEqual(tables.count('"circles_circle"'), 2)
+
+    def test_failures_are_reported_per_sub_request(self):
+        """Non API views are not run, errors only fail their own sub-request."""
+
+        with mock.patch.object(CircleModelViewSet, 'list', side_effect=RuntimeError):
+            response = self.batch(
+                {'path': '/metrics/'},
+                {'path': '/admin/'},
+                {'path': '/circles/'},
+                {'path': '/users/cheke/'},
+            )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([item['status'] for item in response.data['responses']], [404, 404, 500, 200])
+
+    def test_batch_size_is_limited(self):
+        """Batches over BATCH_MAX_REQUESTS or calling themselves are rejected."""
+
+        self.assertEqual(self.batch(*[{'path': '/circles/'}] * 21).status_code, 400)
+        self.assertEqual(self.batch({'path': '/batch/'}).status_code, 400)
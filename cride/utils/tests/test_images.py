@@ -0,0 +1,131 @@
+"""Utils app images tests."""
+
+# Django
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.shortcuts import reverse
+from django.test import override_settings
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Pillow
+from PIL import Image
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+
+# Images
+from cride.utils.images import pending_storage, process_picture
+
+# Utilities
+import shutil
+import tempfile
+from io import BytesIO
+from unittest import mock
+
+
+class DeferredPicturesTestCase(APITestCase):
+    """Manages testing of the deferred picture variants."""
+
+    def setUp(self):
+        """Moves the storages to temporary directories and creates a user."""
+
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+
+        storages = override_settings(MEDIA_ROOT=f'{root}/media', PICTURES_PENDING_ROOT=f'{root}/pending')
+        storages.enable()
+        self.addCleanup(storages.disable)
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True,
+            is_client=True
+        )
+        Profile.objects.create(user=self.user)
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.url = reverse('users:users-profile', kwargs={'username': 'cheke'})
+
+    def upload(self):
+        """Uploads a 2000x1000 picture, returns the pending name."""
+
+        content = BytesIO()
+        Image.new('RGBA', (2000, 1000), (0, 128, 255, 255)).save(content, 'PNG')
+        picture = SimpleUploadedFile('picture.png', content.getvalue(), content_type='image/png')
+
+        response = self.client.put(self.url, {'picture': picture}, format='multipart')
+        self.assertEqual(response.status_code, 200)
+
+        return Profile.objects.get(user=self.user).picture_upload
+
+    def test_variants_are_built_after_the_request(self):
+        """The request only stores the upload, the task writes the variants."""
+
+        upload = self.upload()
+        profile = Profile.objects.get(user=self.user)
+        self.assertFalse(profile.picture)
+        self.assertTrue(pending_storage.exists(upload))
+
+        self.assertTrue(process_picture(Profile, profile.pk, upload))
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.picture_upload, '')
+        self.assertFalse(pending_storage.exists(upload))
+
+        with default_storage.open(profile.picture.name) as picture:
+            self.assertEqual(Image.open(picture).size, (1024, 512))
+        with default_storage.open(profile.picture_thumbnail.name) as thumbnail:
+            self.assertEqual(Image.open(thumbnail).size, (256, 128))
+        with default_storage.open(profile.picture_webp.name) as webp:
+            self.assertEqual(Image.open(webp).format, 'WEBP')
+
+    def test_superseded_uploads_are_discarded(self):
+        """Only the latest upload is swapped in, older ones leave no files behind."""
+
+        first, second = self.upload(), self.upload()
+        profile = Profile.objects.get(user=self.user)
+
+        self.assertFalse(process_picture(Profile, profile.pk, first))
+        self.assertFalse(pending_storage.exists(first))
+        self.assertTrue(process_picture(Profile, profile.pk, second))
+
+        profile.refresh_from_db()
+        _, pictures = default_storage.listdir('users/pictures/')
+        self.assertEqual(
+            sorted(pictures),
+            sorted(name.split('/')[-1] for name in (profile.picture.name, profile.picture_thumbnail.name,
+                                                    profile.picture_webp.name))
+        )
+
+    def test_failed_variants_leave_nothing_behind(self):
+        """A variant that can not be stored clears the upload and the stored variants."""
+
+        upload = self.upload()
+        profile = Profile.objects.get(user=self.user)
+        save = default_storage.save
+        saves = []
+
+        def save_once(name, content):
+            """Stores the first variant and fails with the next one."""
+
+            saves.append(name)
+            if len(saves) > 1:
+                raise OSError('Disk full.')
+
+            return save(name, content)
+
+        with mock.patch.object(default_storage, 'save', side_effect=save_once):
+            self.assertFalse(process_picture(Profile, profile.pk, upload))
+
+        profile.refresh_from_db()
+        self.assertEqual(profile.picture_upload, '')
+        self.assertFalse(profile.picture)
+        self.assertFalse(pending_storage.exists(upload))
+        self.assertEqual(default_storage.listdir('users/pictures/')[1], [])
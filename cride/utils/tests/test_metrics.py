@@ -0,0 +1,96 @@
+"""Utils app metrics tests."""
+
+# Django
+from django.test import SimpleTestCase, override_settings
+from django.shortcuts import reverse
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User
+from rest_framework.authtoken.models import Token
+
+# Prometheus
+from prometheus_client import generate_latest
+from prometheus_client.mmap_dict import MmapedDict
+
+# Metrics
+from cride.utils.metrics import get_registry
+
+# Utilities
+import json
+import os
+from tempfile import TemporaryDirectory
+from unittest import mock
+
+
+class MetricsEndPointTestCase(APITestCase):
+    """Manages testing of the metrics endpoint."""
+
+    def setUp(self):
+        """Creates an authenticated user."""
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    def test_requests_are_labeled_by_action(self):
+        """Request metrics are reported by viewset and action."""
+
+        self.client.get(reverse('circles:circles-list'))
+        response = self.client.get(reverse('metrics'))
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn(
+            'cride_request_latency_seconds_count{action="list",method="GET",view="CircleModelViewSet"}',
+            response.content.decode()
+        )
+
+    @override_settings(METRICS_TOKEN='secret')
+    def test_token_is_required_when_configured(self):
+        """Only requests with the metrics token can read the metrics."""
+
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 403)
+
+        self.client.credentials(HTTP_AUTHORIZATION='Bearer secret')
+        self.assertEqual(self.client.get(reverse('metrics')).status_code, 200)
+
+
+class MultiProcessDirsTestCase(SimpleTestCase):
+    """Manages testing of the samples merged from several services."""
+
+    def write(self, path, pid, value):
+        """Writes a task duration sample as the process pid would."""
+
+        samples = MmapedDict(os.path.join(path, f'histogram_{pid}.db'))
+        labels = {'task': 'cride.rides.tasks.reconcile_counters', 'state': 'SUCCESS'}
+        samples.write_value(json.dumps(
+            ['cride_celery_task_duration_seconds', 'cride_celery_task_duration_seconds_sum', labels],
+            sort_keys=True
+        ), value)
+        samples.close()
+
+    def test_worker_samples_are_exported_by_the_web(self):
+        """The directories of METRICS_MULTIPROC_DIRS are merged once each."""
+
+        with TemporaryDirectory() as web, TemporaryDirectory() as worker:
+            self.write(web, 1, 1.5)
+            self.write(worker, 1, 2.0)
+
+            with mock.patch.dict(os.environ, {'prometheus_multiproc_dir': web}), \
+                    override_settings(METRICS_MULTIPROC_DIRS=[worker, web, '/missing']):
+                content = generate_latest(get_registry()).decode()
+
+        self.assertIn(
+            'cride_celery_task_duration_seconds_sum'
+            '{state="SUCCESS",task="cride.rides.tasks.reconcile_counters"} 3.5',
+            content
+        )
@@ -0,0 +1,70 @@
+"""Utils app middleware tests."""
+
+# Django
+from django.test import TestCase, override_settings
+from django.shortcuts import reverse
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User
+from rest_framework.authtoken.models import Token
+
+# Middleware
+from cride.utils.middleware import QueryCollector
+
+
+class QueryCollectorTestCase(TestCase):
+    """Manages testing of the statement fingerprints."""
+
+    def test_fingerprint_ignores_literals(self):
+        """Statements that only differ on their literals share a fingerprint."""
+
+        first = QueryCollector.fingerprint("SELECT * FROM users_user WHERE id = 1 AND username = 'cheke'")
+        second = QueryCollector.fingerprint("SELECT *  FROM users_user WHERE id = 22 AND username = 'pablo'")
+
+        self.assertEqual(first, second)
+
+    def test_fingerprint_collapses_placeholder_lists(self):
+        """IN clauses of any length share a fingerprint."""
+
+        first = QueryCollector.fingerprint('SELECT * FROM users_user WHERE id IN (%s, %s)')
+        second = QueryCollector.fingerprint('SELECT * FROM users_user WHERE id IN (%s, %s, %s)')
+
+        self.assertEqual(first, second)
+
+
+class QueryInstrumentationMiddlewareTestCase(APITestCase):
+    """Manages testing of the query instrumentation middleware."""
+
+    def setUp(self):
+        """Creates an authenticated user."""
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    @override_settings(SQL_INSTRUMENTATION_SAMPLE_RATE=1.0)
+    def test_sampled_request_has_server_timing(self):
+        """Sampled requests report their database cost."""
+
+        with self.assertLogs('cride.sql', level='INFO'):
+            response = self.client.get(reverse('circles:circles-list'))
+
+        self.assertIn('db;dur=', response['Server-Timing'])
+
+    @override_settings(SQL_INSTRUMENTATION_SAMPLE_RATE=0)
+    def test_unsampled_request_is_untouched(self):
+        """Requests out of the sample are not instrumented."""
+
+        response = self.client.get(reverse('circles:circles-list'))
+
+        self.assertFalse(response.has_header('Server-Timing'))
@@ -0,0 +1,63 @@
+"""Utils app mixins tests."""
+
+# Django
+from django.db import connection
+from django.test import TransactionTestCase
+
+# Django REST Framework
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import AllowAny
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory
+
+# Models
+from cride.circles.models import Circle
+
+# Mixins
+from cride.utils.mixins import TransactionPolicyMixin
+
+
+class CircleViewSet(TransactionPolicyMixin):
+    """Records whether its actions ran inside a transaction."""
+
+    permission_classes = (AllowAny,)
+    atomic_actions = ('create',)
+
+    def list(self, request):
+        """Reads in autocommit mode."""
+
+        return Response({'atomic': connection.in_atomic_block})
+
+    def create(self, request):
+        """Writes a circle and fails if asked to."""
+
+        Circle.objects.create(name='Ciencias', slug_name='ciencias', about='Facultad de Ciencias.')
+
+        if request.data.get('fail'):
+            raise ValidationError('Failed on purpose.')
+
+        return Response({'atomic': connection.in_atomic_block})
+
+
+class TransactionPolicyMixinTestCase(TransactionTestCase):
+    """Manages testing of the per action transactions."""
+
+    def setUp(self):
+        """Builds the views."""
+
+        self.factory = APIRequestFactory()
+        self.view = CircleViewSet.as_view({'get': 'list', 'post': 'create'})
+
+    def test_only_atomic_actions_open_a_transaction(self):
+        """Reads run in autocommit mode, listed actions in a transaction."""
+
+        self.assertFalse(self.view(self.factory.get('/')).data['atomic'])
+        self.assertTrue(self.view(self.factory.post('/', {}, format='json')).data['atomic'])
+
+    def test_error_responses_are_rolled_back(self):
+        """An action that ends in an error response commits nothing."""
+
+        response = self.view(self.factory.post('/', {'fail': True}, format='json'))
+
+        self.assertEqual(response.status_code, 400)
+        self.assertFalse(Circle.objects.exists())
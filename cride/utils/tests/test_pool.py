@@ -0,0 +1,107 @@
+"""Utils app database pool tests."""
+
+# Django
+from django.test import SimpleTestCase
+
+# Pool
+from cride.utils.db.pool import ConnectionPool, PoolClosed, PoolTimeout
+
+
+class FakeCursor:
+    """Cursor of a fake connection."""
+
+    def __init__(self, connection):
+        """Stores the connection."""
+
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+    def execute(self, sql):
+        """Fails if the server went away."""
+
+        if self.connection.broken:
+            raise OSError('server closed the connection unexpectedly')
+
+
+class FakeConnection:
+    """DB-API like connection that records how it was used."""
+
+    def __init__(self):
+        """Starts open and healthy."""
+
+        self.closed = False
+        self.broken = False
+
+    def cursor(self):
+        return FakeCursor(self)
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+
+class ConnectionPoolTestCase(SimpleTestCase):
+    """Manages testing of the connection pool."""
+
+    def pool(self, **options):
+        """Returns a pool of fake connections."""
+
+        return ConnectionPool('test', FakeConnection, **options)
+
+    def test_released_connections_are_reused(self):
+        """A released connection is handed out again."""
+
+        pool = self.pool()
+        connection = pool.acquire()
+        pool.release(connection)
+
+        self.assertIs(pool.acquire(), connection)
+        self.assertEqual(pool.size, 1)
+
+    def test_full_pool_times_out(self):
+        """Once max_size connections are in use, acquiring times out."""
+
+        pool = self.pool(max_size=1, timeout=0.01)
+        pool.acquire()
+
+        with self.assertRaises(PoolTimeout):
+            pool.acquire()
+
+    def test_broken_and_expired_connections_are_replaced(self):
+        """Connections failing the ping or past their lifetime are closed."""
+
+        pool = self.pool()
+        broken = pool.acquire()
+        pool.release(broken)
+        broken.broken = True
+
+        self.assertIsNot(pool.acquire(), broken)
+        self.assertTrue(broken.closed)
+
+        expiring = self.pool(max_lifetime=0)
+        connection = expiring.acquire()
+        expiring.release(connection)
+
+        self.assertTrue(connection.closed)
+        self.assertEqual(expiring.size, 0)
+
+    def test_drain_closes_every_connection(self):
+        """Draining closes the idle connections and the ones released later."""
+
+        pool = self.pool()
+        idle, busy = pool.acquire(), pool.acquire()
+        pool.release(idle)
+
+        pool.drain(timeout=0)
+        pool.release(busy)
+
+        self.assertTrue(idle.closed and busy.closed)
+        with self.assertRaises(PoolClosed):
+            pool.acquire()
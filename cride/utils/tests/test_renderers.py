@@ -0,0 +1,74 @@
+"""Utils app renderers and parsers tests."""
+
+# Django
+from django.test import SimpleTestCase
+from django.utils import timezone
+from django.utils.translation import gettext_lazy
+
+# Django REST Framework
+from rest_framework.exceptions import ErrorDetail, ParseError
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+
+# Renderers and parsers
+from cride.utils.parsers import MessagePackParser, ORJSONParser
+from cride.utils.renderers import MessagePackRenderer, ORJSONRenderer
+
+# Utilities
+from datetime import timedelta
+from decimal import Decimal
+from io import BytesIO
+from unittest import mock
+from uuid import uuid4
+
+
+class RenderersTestCase(SimpleTestCase):
+    """Manages testing of the fast renderers and parsers."""
+
+    def setUp(self):
+        """Builds a payload with every type the API renders."""
+
+        self.data = ReturnDict({
+            'departure_date': timezone.now(),
+            'day': timezone.localdate(),
+            'duration': timedelta(minutes=90),
+            'reputation': Decimal('4.50'),
+            'code': uuid4(),
+            'message': gettext_lazy('Invalid Credentials.'),
+            'errors': [ErrorDetail('This ride is full.', code='invalid')],
+            'comments': 'Salimos de la entrada principal',
+        }, serializer=None)
+
+    def test_orjson_matches_the_json_renderer(self):
+        """Both renderers produce the same bytes."""
+
+        self.assertEqual(ORJSONRenderer().render(self.data), JSONRenderer().render(self.data))
+
+    def test_without_orjson(self):
+        """The json module takes over when orjson is not installed."""
+
+        with mock.patch('cride.utils.renderers.orjson', None), mock.patch('cride.utils.parsers.orjson', None):
+            content = ORJSONRenderer().render(self.data)
+            self.assertEqual(content, JSONRenderer().render(self.data))
+            self.assertEqual(ORJSONParser().parse(BytesIO(content))['comments'], self.data['comments'])
+
+            with self.assertRaises(ParseError):
+                ORJSONParser().parse(BytesIO(b'{"email": '))
+
+    def test_round_trips(self):
+        """MessagePack carries the same values as JSON."""
+
+        json_data = ORJSONParser().parse(BytesIO(ORJSONRenderer().render(self.data)))
+        msgpack_data = MessagePackParser().parse(BytesIO(MessagePackRenderer().render(self.data)))
+
+        self.assertEqual(msgpack_data, json_data)
+        self.assertEqual(json_data['reputation'], 4.5)
+
+    def test_invalid_bodies(self):
+        """Malformed bodies are parse errors."""
+
+        with self.assertRaises(ParseError):
+            ORJSONParser().parse(BytesIO(b'{"email": '))
+
+        with self.assertRaises(ParseError):
+            MessagePackParser().parse(BytesIO(b'\x81\xa5email'))
@@ -0,0 +1,81 @@
+"""Utils app database routers tests."""
+
+# Django
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.shortcuts import reverse
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User
+from cride.circles.models import Circle
+from rest_framework.authtoken.models import Token
+
+# Routers
+from cride.utils.db.routers import ReplicaRouter, is_pinned, reading_from_replica
+
+
+class ReplicaRouterTestCase(TestCase):
+    """Manages testing of the replica router."""
+
+    def test_reads_go_to_the_primary_by_default(self):
+        """Outside of a replica block the default database is used."""
+
+        self.assertIsNone(ReplicaRouter().db_for_read(Circle))
+
+    @override_settings(DATABASE_REPLICAS=['replica_0'])
+    def test_reads_go_to_the_replica_inside_the_block(self):
+        """Inside a replica block reads are routed and writes are not."""
+
+        router = ReplicaRouter()
+
+        with reading_from_replica():
+            self.assertEqual(router.db_for_read(Circle), 'replica_0')
+            self.assertEqual(router.db_for_write(Circle), 'default')
+
+        self.assertIsNone(router.db_for_read(Circle))
+
+    @override_settings(DATABASE_REPLICAS=['replica_0'])
+    def test_replicas_are_not_migrated(self):
+        """Migrations only run on the primary."""
+
+        router = ReplicaRouter()
+
+        self.assertFalse(router.allow_migrate('replica_0', 'rides'))
+        self.assertIsNone(router.allow_migrate('default', 'rides'))
+
+
+class PrimaryPinningTestCase(APITestCase):
+    """Manages testing of the read-your-writes pinning."""
+
+    def setUp(self):
+        """Creates an authenticated user."""
+
+        cache.clear()
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True
+        )
+        token = Token.objects.create(user=self.user).key
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {token}')
+
+    def test_writes_pin_the_user(self):
+        """Only a successful write pins the user to the primary."""
+
+        self.client.get(reverse('circles:circles-list'))
+        self.assertFalse(is_pinned(self.user))
+
+        response = self.client.post(reverse('circles:circles-list'), {
+            'name': 'Facultad de Ciencias',
+            'slug_name': 'ciencias-unam',
+            'about': 'Grupo oficial de la Facultad de Ciencias.',
+        })
+
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(is_pinned(self.user))
@@ -0,0 +1,89 @@
+"""Utils app throttling tests."""
+
+# Django
+from django.conf import settings
+from django.db import connection
+from django.shortcuts import reverse
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+
+# Django REST Framework
+from rest_framework.test import APITestCase
+
+# Models
+from cride.users.models import User, Profile
+from cride.circles.models import Circle
+from rest_framework.authtoken.models import Token
+
+# Throttling
+from cride.utils.throttling import get_buckets
+
+
+@override_settings(THROTTLE_RATES={
+    'users.login': {'ip': '2/minute'},
+    'members.create': {'user': '1/hour', 'ip': '3/hour'},
+})
+class ThrottleTestCase(APITestCase):
+    """Manages testing of the throttled actions."""
+
+    def setUp(self):
+        """Empties the buckets and creates a user."""
+
+        get_buckets().clear()
+
+        self.user = User.objects.create_user(
+            first_name='Francisco',
+            last_name='Ramirez',
+            username='cheke',
+            email='c@a.com',
+            password='cheke12345678cheke',
+            is_verified=True,
+            is_client=True
+        )
+        Profile.objects.create(user=self.user)
+
+    def test_exhausted_ip_is_rejected_before_the_database(self):
+        """Logins over the rate answer 429 without a query nor a password check."""
+
+        credentials = {'email': 'c@a.com', 'password': 'wrong12345678wrong'}
+
+        for attempt in range(2):
+            self.assertEqual(self.client.post(reverse('users:users-login'), credentials).status_code, 400)
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.post(reverse('users:users-login'), credentials)
+
+        self.assertEqual(response.status_code, 429)
+        self.assertGreater(int(response['Retry-After']), 0)
+        self.assertEqual(len(queries), 0)
+
+    @override_settings(REST_FRAMEWORK={**settings.REST_FRAMEWORK, 'NUM_PROXIES': 1})
+    def test_forwarded_addresses_set_by_clients_are_ignored(self):
+        """Behind the proxy only the address it appends identifies the client."""
+
+        credentials = {'email': 'c@a.com', 'password': 'wrong12345678wrong'}
+        statuses = [
+            self.client.post(
+                reverse('users:users-login'),
+                credentials,
+                HTTP_X_FORWARDED_FOR=f'10.0.0.{attempt}, 203.0.113.7'
+            ).status_code
+            for attempt in range(3)
+        ]
+
+        self.assertEqual(statuses, [400, 400, 429])
+
+    def test_invitation_codes_are_throttled_per_user(self):
+        """Every user gets their own bucket of invitation code attempts."""
+
+        Circle.objects.create(name='Facultad de Ciencias', slug_name='ciencias-unam', about='Circle.')
+        url = reverse('circles:membership-list', kwargs={'slug_name': 'ciencias-unam'})
+        data = {'invitation_code': 'x' * 50}
+
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=self.user).key}')
+        self.assertEqual(self.client.post(url, data).status_code, 400)
+        self.assertEqual(self.client.post(url, data).status_code, 429)
+
+        other = User.objects.create_user(username='other', email='o@a.com', password='other12345678other')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=other).key}')
+        self.assertEqual(self.client.post(url, data).status_code, 400)
@@ -0,0 +1,142 @@
+"""Utils app uploads tests."""
+
+# Django
+from django.core.handlers.wsgi import WSGIHandler
+from django.db import connection
+from django.test import TransactionTestCase, override_settings
+from django.test.client import RequestFactory
+
+# Pillow
+from PIL import Image
+
+# Models
+from cride.users.models import User, Profile
+from rest_framework.authtoken.models import Token
+
+# Utilities
+import json
+import os
+import shutil
+import tempfile
+import threading
+import tracemalloc
+from io import BytesIO
+
+
+BOUNDARY = 'UploadsTestBoundary'
+
+
+class UploadsTestCase(TransactionTestCase):
+    """Manages testing of the streamed and capped uploads."""
+
+    def setUp(self):
+        """Moves the storages to a temporary directory and creates the users."""
+
+        self.root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.root)
+
+        storages = override_settings(
+            MEDIA_ROOT=f'{self.root}/media',
+            PICTURES_PENDING_ROOT=f'{self.root}/pending',
+            FILE_UPLOAD_TEMP_DIR=self.root,
+        )
+        storages.enable()
+        self.addCleanup(storages.disable)
+
+        self.tokens = {}
+        for index in range(4):
+            user = User.objects.create_user(
+                first_name='Francisco',
+                last_name='Ramirez',
+                username=f'cheke{index}',
+                email=f'c{index}@a.com',
+                password='cheke12345678cheke',
+                is_verified=True,
+                is_client=True
+            )
+            Profile.objects.create(user=user)
+            self.tokens[user.username] = Token.objects.create(user=user).key
+
+    def body(self, size, image_size=(64, 64)):
+        """Writes to disk a multipart body with a JPEG padded to size bytes, returns its path."""
+
+        content = BytesIO()
+        Image.new('RGB', image_size, (0, 128, 255)).save(content, 'JPEG')
+        picture = content.getvalue()
+
+        path = tempfile.mktemp(dir=self.root)
+        with open(path, 'wb') as body:
+            body.write((
+                f'--{BOUNDARY}\r\n'
+                'Content-Disposition: form-data; name="picture"; filename="picture.jpg"\r\n'
+                'Content-Type: image/jpeg\r\n\r\n'
+            ).encode())
+            body.write(picture)
+
+            # Decoders stop at the end of the image, the rest is padding.
+            padding = size - len(picture)
+            while padding > 0:
+                body.write(b'\0' * min(padding, 2 ** 20))
+                padding -= 2 ** 20
+
+            body.write(f'\r\n--{BOUNDARY}--\r\n'.encode())
+
+        return path
+
+    def upload(self, username, path):
+        """Streams the body from disk through the WSGI handler, returns the status and data."""
+
+        responses = []
+        environ = RequestFactory()._base_environ(
+            PATH_INFO=f'/users/{username}/profile/',
+            REQUEST_METHOD='PUT',
+            CONTENT_TYPE=f'multipart/form-data; boundary={BOUNDARY}',
+            CONTENT_LENGTH=str(os.path.getsize(path)),
+            HTTP_AUTHORIZATION=f'Token {self.tokens[username]}',
+        )
+
+        with open(path, 'rb') as body:
+            environ['wsgi.input'] = body
+            response = WSGIHandler()(environ, lambda status, headers: responses.append(status))
+            content = b''.join(response)
+            response.close()
+
+        return int(responses[0].split()[0]), json.loads(content.decode())
+
+    def test_concurrent_uploads_keep_memory_bounded(self):
+        """Four concurrent 20 MB uploads take a fraction of one of them in memory."""
+
+        # Imports and caches of the first request are not uploads.
+        self.upload('cheke0', self.body(2 ** 10))
+
+        path = self.body(20 * 10 ** 6)
+        statuses = []
+
+        def upload(username):
+            statuses.append(self.upload(username, path)[0])
+            connection.close()
+
+        tracemalloc.start()
+        threads = [threading.Thread(target=upload, args=(username,)) for username in self.tokens]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        self.assertEqual(statuses, [200] * 4)
+        self.assertLess(peak, 5 * 10 ** 6)
+        self.assertEqual(Profile.objects.filter(picture__startswith='users/pictures/').count(), 4)
+
+    def test_limits_are_enforced_before_decoding(self):
+        """Oversized files are refused unread or while streaming, oversized pictures by their header."""
+
+        for size in (30 * 2 ** 20, 21 * 2 ** 20):
+            status, data = self.upload('cheke0', self.body(size))
+            self.assertEqual(status, 413)
+
+        with override_settings(PICTURES_MAX_PIXELS=100 * 100):
+            status, data = self.upload('cheke0', self.body(2 ** 20, image_size=(200, 100)))
+        self.assertEqual(status, 400)
+        self.assertIn('picture', data)
@@ -0,0 +1,160 @@
+"""Utils app throttling module.
+
+Token buckets behind ThrottleMixin. A bucket holds up to the number
+of requests of its rate and refills at that rate, so '10/minute'
+allows bursts of 10 requests and one more every 6 seconds. Taking a
+token is atomic: Redis runs the refill and the take in a Lua script,
+every process shares the buckets and no lock is held between calls.
+"""
+
+# Django
+from django.conf import settings
+from django.utils.module_loading import import_string
+
+# Redis
+import redis
+
+# Utilities
+import logging
+import threading
+import time
+
+
+logger = logging.getLogger('cride.throttling')
+
+PERIODS = {'s': 1, 'm': 60, 'h': 60 * 60, 'd': 24 * 60 * 60}
+
+# KEYS[1] bucket, ARGV capacity, refill rate per second, now.
+# Returns whether a token was taken and the seconds until the next one.
+TAKE_SCRIPT = """
+local capacity = tonumber(ARGV[1])
+local rate = tonumber(ARGV[2])
+local now = tonumber(ARGV[3])
+
+local bucket = redis.call('HMGET', KEYS[1], 'tokens', 'updated')
+local tokens = tonumber(bucket[1]) or capacity
+local updated = tonumber(bucket[2]) or now
+
+tokens = math.min(capacity, tokens + math.max(0, now - updated) * rate)
+
+local taken = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+    taken = 1
+end
+
+redis.call('HMSET', KEYS[1], 'tokens', tostring(tokens), 'updated', tostring(now))
+redis.call('EXPIRE', KEYS[1], math.ceil(capacity / rate))
+
+return {taken, tostring((1 - tokens) / rate)}
+"""
+
+
+def parse_rate(rate):
+    """Returns the capacity and the refill per second of a rate like '10/minute'."""
+
+    requests, period = rate.split('/')
+
+    return int(requests), int(requests) / PERIODS[period[0]]
+
+
+def refill(tokens, updated, capacity, rate, now):
+    """Returns the tokens of a bucket refilled until now."""
+
+    return min(capacity, tokens + max(0, now - updated) * rate)
+
+
+class Buckets:
+    """Buckets
+
+    Takes tokens from the buckets, subclasses decide where they live.
+    """
+
+    def take(self, key, rate):
+        """Takes a token, returns whether there was one and the seconds to wait if not."""
+
+        raise NotImplementedError
+
+
+class MemoryBuckets(Buckets):
+    """Memory buckets
+
+    Keeps the buckets within the process,
+    used by the tests and single process setups.
+    """
+
+    def __init__(self):
+        """Starts without buckets."""
+
+        self.lock = threading.Lock()
+        self.buckets = {}
+
+    def take(self, key, rate):
+        """Refills and takes under the lock."""
+
+        capacity, per_second = parse_rate(rate)
+        now = time.time()
+
+        with self.lock:
+            tokens, updated = self.buckets.get(key, (capacity, now))
+            tokens = refill(tokens, updated, capacity, per_second, now)
+
+            taken = tokens >= 1
+            if taken:
+                tokens -= 1
+
+            self.buckets[key] = (tokens, now)
+
+        return taken, (1 - tokens) / per_second
+
+    def clear(self):
+        """Drops every bucket."""
+
+        with self.lock:
+            self.buckets.clear()
+
+
+class RedisBuckets(Buckets):
+    """Redis buckets
+
+    Shares the buckets between processes through TAKE_SCRIPT. When
+    Redis can't be reached the requests are let through, throttling
+    is not worth an outage.
+    """
+
+    PREFIX = 'throttle:'
+
+    def __init__(self, url=None):
+        """Connects to Redis and registers the script."""
+
+        self.client = redis.StrictRedis.from_url(url or settings.THROTTLE_REDIS_URL)
+        self.script = self.client.register_script(TAKE_SCRIPT)
+
+    def take(self, key, rate):
+        """Runs the script on the bucket."""
+
+        capacity, per_second = parse_rate(rate)
+
+        try:
+            taken, wait = self.script(keys=[self.PREFIX + key], args=[capacity, per_second, time.time()])
+        except redis.RedisError:
+            logger.exception('Could not take a token from %s.', key)
+            return True, 0
+
+        return bool(taken), float(wait)
+
+
+_buckets = None
+_buckets_lock = threading.Lock()
+
+
+def get_buckets():
+    """Returns the buckets configured in THROTTLE_BUCKETS."""
+
+    global _buckets
+
+    with _buckets_lock:
+        if _buckets is None:
+            _buckets = import_string(settings.THROTTLE_BUCKETS)()
+
+        return _buckets
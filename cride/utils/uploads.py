@@ -0,0 +1,53 @@
+"""Utils app uploads module.
+
+Every uploaded file is streamed to a temporary file in chunks, so
+an upload never takes more memory than a chunk whatever its size.
+Requests announcing more than UPLOADS_MAX_FILE_SIZE are rejected
+before their body is read, and files growing past it are dropped
+while they arrive, before anything tries to decode them.
+"""
+
+# Django
+from django.conf import settings
+from django.core.files.uploadhandler import TemporaryFileUploadHandler
+from django.template.defaultfilters import filesizeformat
+
+# Django REST Framework
+from rest_framework import status
+from rest_framework.exceptions import APIException
+
+
+class UploadTooLarge(APIException):
+    """The request or one of its files is over UPLOADS_MAX_FILE_SIZE."""
+
+    status_code = status.HTTP_413_REQUEST_ENTITY_TOO_LARGE
+    default_detail = 'The upload is too large.'
+    default_code = 'upload_too_large'
+
+
+class LimitedUploadHandler(TemporaryFileUploadHandler):
+    """Streams the files to disk up to UPLOADS_MAX_FILE_SIZE each."""
+
+    def too_large(self):
+        """Returns the error of an upload over the limit."""
+
+        return UploadTooLarge(f'Files can not be larger than {filesizeformat(settings.UPLOADS_MAX_FILE_SIZE)}.')
+
+    def handle_raw_input(self, input_data, META, content_length, boundary, encoding=None):
+        """Rejects the request if its body can not fit under the limits."""
+
+        # Besides the file, the body carries the other fields.
+        limit = settings.UPLOADS_MAX_FILE_SIZE + (settings.DATA_UPLOAD_MAX_MEMORY_SIZE or 0)
+
+        if content_length > limit:
+            raise self.too_large()
+
+    def receive_data_chunk(self, raw_data, start):
+        """Writes the chunk, dropping the file once it is over the limit."""
+
+        if start + len(raw_data) > settings.UPLOADS_MAX_FILE_SIZE:
+            # Closing the temporary file deletes it.
+            self.file.close()
+            raise self.too_large()
+
+        return super(LimitedUploadHandler, self).receive_data_chunk(raw_data, start)